@@ -0,0 +1,23 @@
+"""
+Pannelli di controllo grafici di SSEM.
+
+Il toolkit è importato solo all'avvio della GUI: PyQt5 se disponibile, altrimenti Tkinter.
+"""
+import importlib.util
+
+
+def run(app_module):
+    """
+    Avvia il pannello di controllo con il toolkit disponibile.
+    
+    Args:
+        app_module: Modulo dell'applicazione (app.py) con lo stato del server e le azioni
+    
+    Returns:
+        int: Codice di uscita
+    """
+    if importlib.util.find_spec("PyQt5") is not None:
+        from gui import qt_panel
+        return qt_panel.run(app_module)
+    from gui import tk_panel
+    return tk_panel.run(app_module)
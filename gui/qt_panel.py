@@ -0,0 +1,554 @@
+"""
+Pannello di controllo PyQt5.
+
+Importato solo in modalità GUI (vedi gui.run): il server headless non carica PyQt5.
+"""
+import configparser
+import os
+import sys
+import threading
+
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+# Modulo dell'applicazione (app.py) con lo stato del server e le azioni, impostato da run()
+ssem = None
+
+
+class ConfigEditorDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None, config_dir="config"):
+        super().__init__(parent)
+        self.config_dir = config_dir
+        self.aurora_config = configparser.ConfigParser()
+        self.fusion_config = configparser.ConfigParser()
+
+        # Carica le configurazioni
+        self.aurora_config.read(os.path.join(config_dir, "aurora_config.ini"))
+        self.fusion_config.read(os.path.join(config_dir, "fusion_config.ini"))
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle("Editor Configurazioni")
+        self.setMinimumSize(600, 500)
+
+        # Layout principale
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        # Tab widget per le diverse configurazioni
+        self.tab_widget = QtWidgets.QTabWidget()
+        main_layout.addWidget(self.tab_widget)
+
+        # Tab per AuroraVision
+        aurora_tab = QtWidgets.QWidget()
+        self.tab_widget.addTab(aurora_tab, "AuroraVision")
+
+        # Tab per FusionSolar
+        fusion_tab = QtWidgets.QWidget()
+        self.tab_widget.addTab(fusion_tab, "FusionSolar")
+
+        # Configura il tab AuroraVision
+        self.setup_aurora_tab(aurora_tab)
+
+        # Configura il tab FusionSolar
+        self.setup_fusion_tab(fusion_tab)
+
+        # Pulsanti di azione
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addStretch()
+
+        self.save_btn = QtWidgets.QPushButton("Salva")
+        self.save_btn.clicked.connect(self.save_configurations)
+        button_layout.addWidget(self.save_btn)
+
+        self.cancel_btn = QtWidgets.QPushButton("Annulla")
+        self.cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(self.cancel_btn)
+
+        main_layout.addLayout(button_layout)
+
+    def setup_aurora_tab(self, tab):
+        layout = QtWidgets.QVBoxLayout(tab)
+
+        # Gruppo Credenziali
+        cred_group = QtWidgets.QGroupBox("Credenziali")
+        cred_layout = QtWidgets.QFormLayout(cred_group)
+
+        # Username
+        self.aurora_username = QtWidgets.QLineEdit()
+        self.aurora_username.setText(self.aurora_config.get('CREDENTIALS', 'username', fallback=''))
+        cred_layout.addRow("Username:", self.aurora_username)
+
+        # Password
+        self.aurora_password = QtWidgets.QLineEdit()
+        self.aurora_password.setEchoMode(QtWidgets.QLineEdit.Password)
+        self.aurora_password.setText(self.aurora_config.get('CREDENTIALS', 'password', fallback=''))
+        cred_layout.addRow("Password:", self.aurora_password)
+
+        # Entity IDs
+        self.aurora_entity_ids = QtWidgets.QLineEdit()
+        self.aurora_entity_ids.setText(self.aurora_config.get('CREDENTIALS', 'entity_ids', fallback=''))
+        cred_layout.addRow("ID Entità (separati da virgola):", self.aurora_entity_ids)
+
+        # Entity Aliases
+        self.aurora_entity_aliases = QtWidgets.QLineEdit()
+        self.aurora_entity_aliases.setText(self.aurora_config.get('CREDENTIALS', 'entity_aliases', fallback=''))
+        cred_layout.addRow("Alias Entità (separati da virgola):", self.aurora_entity_aliases)
+
+        layout.addWidget(cred_group)
+
+        # Gruppo Impostazioni
+        settings_group = QtWidgets.QGroupBox("Impostazioni")
+        settings_layout = QtWidgets.QFormLayout(settings_group)
+
+        # Time Interval
+        self.aurora_time_interval = QtWidgets.QSpinBox()
+        self.aurora_time_interval.setMinimum(60)
+        self.aurora_time_interval.setMaximum(3600)
+        self.aurora_time_interval.setSingleStep(60)
+        self.aurora_time_interval.setValue(int(self.aurora_config.get('SETTINGS', 'time_interval', fallback='300')))
+        settings_layout.addRow("Intervallo di aggiornamento (secondi):", self.aurora_time_interval)
+
+        # Alarm Enabled
+        self.aurora_alarm_enabled = QtWidgets.QCheckBox()
+        self.aurora_alarm_enabled.setChecked(self.aurora_config.getboolean('SETTINGS', 'alarm_enabled', fallback=True))
+        settings_layout.addRow("Abilitare allarmi:", self.aurora_alarm_enabled)
+
+        # Data Retention
+        self.aurora_data_retention = QtWidgets.QSpinBox()
+        self.aurora_data_retention.setMinimum(1)
+        self.aurora_data_retention.setMaximum(365)
+        self.aurora_data_retention.setValue(int(self.aurora_config.get('SETTINGS', 'data_retention_days', fallback='30')))
+        settings_layout.addRow("Conservazione dati (giorni):", self.aurora_data_retention)
+
+        layout.addWidget(settings_group)
+        layout.addStretch()
+
+    def setup_fusion_tab(self, tab):
+        layout = QtWidgets.QVBoxLayout(tab)
+
+        # Gruppo Credenziali
+        cred_group = QtWidgets.QGroupBox("Credenziali")
+        cred_layout = QtWidgets.QFormLayout(cred_group)
+
+        # Username
+        self.fusion_username = QtWidgets.QLineEdit()
+        self.fusion_username.setText(self.fusion_config.get('CREDENTIALS', 'username', fallback=''))
+        cred_layout.addRow("Username:", self.fusion_username)
+
+        # Password
+        self.fusion_password = QtWidgets.QLineEdit()
+        self.fusion_password.setEchoMode(QtWidgets.QLineEdit.Password)
+        self.fusion_password.setText(self.fusion_config.get('CREDENTIALS', 'password', fallback=''))
+        cred_layout.addRow("Password:", self.fusion_password)
+
+        # Subdomain
+        self.fusion_subdomain = QtWidgets.QLineEdit()
+        self.fusion_subdomain.setText(self.fusion_config.get('CREDENTIALS', 'subdomain', fallback=''))
+        cred_layout.addRow("Sottodominio:", self.fusion_subdomain)
+
+        # Captcha Model Path
+        self.fusion_captcha_model = QtWidgets.QLineEdit()
+        self.fusion_captcha_model.setText(self.fusion_config.get('CREDENTIALS', 'captcha_model_path', fallback=''))
+        cred_layout.addRow("Percorso modello captcha:", self.fusion_captcha_model)
+
+        # Plant Name
+        self.fusion_plant_name = QtWidgets.QLineEdit()
+        self.fusion_plant_name.setText(self.fusion_config.get('CREDENTIALS', 'plant_name', fallback=''))
+        cred_layout.addRow("Nome impianto:", self.fusion_plant_name)
+
+        layout.addWidget(cred_group)
+
+        # Gruppo Northbound (se esiste nella configurazione)
+        if self.fusion_config.has_section('NORTHBOUND'):
+            northbound_group = QtWidgets.QGroupBox("Northbound")
+            northbound_layout = QtWidgets.QFormLayout(northbound_group)
+
+            # Enabled
+            self.fusion_northbound_enabled = QtWidgets.QCheckBox()
+            self.fusion_northbound_enabled.setChecked(self.fusion_config.getboolean('NORTHBOUND', 'enabled', fallback=False))
+            northbound_layout.addRow("Abilitato:", self.fusion_northbound_enabled)
+
+            # Username
+            self.fusion_northbound_username = QtWidgets.QLineEdit()
+            self.fusion_northbound_username.setText(self.fusion_config.get('NORTHBOUND', 'username', fallback=''))
+            northbound_layout.addRow("Username:", self.fusion_northbound_username)
+
+            # Password
+            self.fusion_northbound_password = QtWidgets.QLineEdit()
+            self.fusion_northbound_password.setEchoMode(QtWidgets.QLineEdit.Password)
+            self.fusion_northbound_password.setText(self.fusion_config.get('NORTHBOUND', 'password', fallback=''))
+            northbound_layout.addRow("Password:", self.fusion_northbound_password)
+
+            # Plant ID
+            self.fusion_northbound_plant_id = QtWidgets.QLineEdit()
+            self.fusion_northbound_plant_id.setText(self.fusion_config.get('NORTHBOUND', 'plant_id', fallback=''))
+            northbound_layout.addRow("ID Impianto:", self.fusion_northbound_plant_id)
+
+            layout.addWidget(northbound_group)
+
+        # Gruppo Impostazioni
+        settings_group = QtWidgets.QGroupBox("Impostazioni")
+        settings_layout = QtWidgets.QFormLayout(settings_group)
+
+        # Time Interval
+        self.fusion_time_interval = QtWidgets.QSpinBox()
+        self.fusion_time_interval.setMinimum(60)
+        self.fusion_time_interval.setMaximum(3600)
+        self.fusion_time_interval.setSingleStep(60)
+        self.fusion_time_interval.setValue(int(self.fusion_config.get('SETTINGS', 'time_interval', fallback='300')))
+        settings_layout.addRow("Intervallo di aggiornamento (secondi):", self.fusion_time_interval)
+
+        # Alarm Enabled
+        self.fusion_alarm_enabled = QtWidgets.QCheckBox()
+        self.fusion_alarm_enabled.setChecked(self.fusion_config.getboolean('SETTINGS', 'alarm_enabled', fallback=True))
+        settings_layout.addRow("Abilitare allarmi:", self.fusion_alarm_enabled)
+
+        # Data Retention
+        self.fusion_data_retention = QtWidgets.QSpinBox()
+        self.fusion_data_retention.setMinimum(1)
+        self.fusion_data_retention.setMaximum(365)
+        self.fusion_data_retention.setValue(int(self.fusion_config.get('SETTINGS', 'data_retention_days', fallback='30')))
+        settings_layout.addRow("Conservazione dati (giorni):", self.fusion_data_retention)
+
+        layout.addWidget(settings_group)
+        layout.addStretch()
+
+    def save_configurations(self):
+        # Salva configurazione AuroraVision
+        self.aurora_config['CREDENTIALS']['username'] = self.aurora_username.text()
+        self.aurora_config['CREDENTIALS']['password'] = self.aurora_password.text()
+        self.aurora_config['CREDENTIALS']['entity_ids'] = self.aurora_entity_ids.text()
+        self.aurora_config['CREDENTIALS']['entity_aliases'] = self.aurora_entity_aliases.text()
+
+        self.aurora_config['SETTINGS']['time_interval'] = str(self.aurora_time_interval.value())
+        self.aurora_config['SETTINGS']['alarm_enabled'] = str(self.aurora_alarm_enabled.isChecked())
+        self.aurora_config['SETTINGS']['data_retention_days'] = str(self.aurora_data_retention.value())
+
+        # Salva configurazione FusionSolar
+        self.fusion_config['CREDENTIALS']['username'] = self.fusion_username.text()
+        self.fusion_config['CREDENTIALS']['password'] = self.fusion_password.text()
+        self.fusion_config['CREDENTIALS']['subdomain'] = self.fusion_subdomain.text()
+        self.fusion_config['CREDENTIALS']['captcha_model_path'] = self.fusion_captcha_model.text()
+        self.fusion_config['CREDENTIALS']['plant_name'] = self.fusion_plant_name.text()
+
+        if self.fusion_config.has_section('NORTHBOUND'):
+            self.fusion_config['NORTHBOUND']['enabled'] = str(self.fusion_northbound_enabled.isChecked())
+            self.fusion_config['NORTHBOUND']['username'] = self.fusion_northbound_username.text()
+            self.fusion_config['NORTHBOUND']['password'] = self.fusion_northbound_password.text()
+            self.fusion_config['NORTHBOUND']['plant_id'] = self.fusion_northbound_plant_id.text()
+
+        self.fusion_config['SETTINGS']['time_interval'] = str(self.fusion_time_interval.value())
+        self.fusion_config['SETTINGS']['alarm_enabled'] = str(self.fusion_alarm_enabled.isChecked())
+        self.fusion_config['SETTINGS']['data_retention_days'] = str(self.fusion_data_retention.value())
+
+        # Salva i file
+        ssem.save_config_file(os.path.join(self.config_dir, "aurora_config.ini"), self.aurora_config)
+        ssem.save_config_file(os.path.join(self.config_dir, "fusion_config.ini"), self.fusion_config)
+
+        # Mostra messaggio di conferma
+        QtWidgets.QMessageBox.information(
+            self,
+            "Configurazione salvata",
+            "Le configurazioni sono state salvate con successo.\n"
+            "Riavviare il server per applicare le modifiche."
+        )
+
+        # Chiudi il dialog
+        self.accept()
+
+class ControlPanel(QtWidgets.QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self._preflight_report = None  # Esito della verifica connessioni in attesa di essere mostrato
+        self.setWindowTitle("SSEM - Pannello di Controllo")
+        self.setWindowIcon(QtGui.QIcon("static/favicon.ico"))
+        self.setGeometry(100, 100, 500, 400)
+        self.setMinimumSize(500, 500)
+
+        # Widget centrale
+        central_widget = QtWidgets.QWidget()
+        self.setCentralWidget(central_widget)
+
+        # Layout principale
+        main_layout = QtWidgets.QVBoxLayout(central_widget)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        # Header
+        header_layout = QtWidgets.QHBoxLayout()
+
+        # Logo/Icon
+        logo_label = QtWidgets.QLabel()
+        logo_pixmap = QtGui.QPixmap("static/favicon.ico")
+        if not logo_pixmap.isNull():
+            logo_label.setPixmap(logo_pixmap.scaled(64, 64, QtCore.Qt.KeepAspectRatio))
+        header_layout.addWidget(logo_label)
+
+        # Titolo
+        title_layout = QtWidgets.QVBoxLayout()
+        title_label = QtWidgets.QLabel("SSEM")
+        title_font = QtGui.QFont()
+        title_font.setBold(True)
+        title_font.setPointSize(18)
+        title_label.setFont(title_font)
+
+        subtitle_label = QtWidgets.QLabel("AuroraVisione e FusionSolar")
+        subtitle_font = QtGui.QFont()
+        subtitle_font.setPointSize(10)
+        subtitle_label.setFont(subtitle_font)
+
+        title_layout.addWidget(title_label)
+        title_layout.addWidget(subtitle_label)
+        header_layout.addLayout(title_layout)
+        header_layout.addStretch()
+
+        main_layout.addLayout(header_layout)
+
+        # Separatore
+        separator = QtWidgets.QFrame()
+        separator.setFrameShape(QtWidgets.QFrame.HLine)
+        separator.setFrameShadow(QtWidgets.QFrame.Sunken)
+        main_layout.addWidget(separator)
+
+        # Stato del server
+        status_layout = QtWidgets.QHBoxLayout()
+        status_label_text = QtWidgets.QLabel("Stato:")
+        status_label_text.setFixedWidth(60)
+        status_layout.addWidget(status_label_text)
+
+        self.status_label = QtWidgets.QLabel("Fermo")
+        status_font = QtGui.QFont()
+        status_font.setBold(True)
+        self.status_label.setFont(status_font)
+        status_layout.addWidget(self.status_label)
+
+        self.status_indicator = QtWidgets.QLabel()
+        self.status_indicator.setFixedSize(15, 15)
+        self.update_status_indicator(False)
+        status_layout.addWidget(self.status_indicator)
+
+        status_layout.addStretch()
+        main_layout.addLayout(status_layout)
+
+        # Controlli server
+        controls_layout = QtWidgets.QHBoxLayout()
+
+        self.start_btn = QtWidgets.QPushButton("Avvia server")
+        self.start_btn.setFixedHeight(40)
+        self.start_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+        self.start_btn.clicked.connect(self.start_server_action)
+        controls_layout.addWidget(self.start_btn)
+
+        self.stop_btn = QtWidgets.QPushButton("Ferma server")
+        self.stop_btn.setFixedHeight(40)
+        self.stop_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaStop))
+        self.stop_btn.clicked.connect(self.stop_server_action)
+        controls_layout.addWidget(self.stop_btn)
+
+        main_layout.addLayout(controls_layout)
+
+        # Separatore
+        separator2 = QtWidgets.QFrame()
+        separator2.setFrameShape(QtWidgets.QFrame.HLine)
+        separator2.setFrameShadow(QtWidgets.QFrame.Sunken)
+        main_layout.addWidget(separator2)
+
+        # Azioni rapide
+        actions_label = QtWidgets.QLabel("Azioni rapide")
+        actions_font = QtGui.QFont()
+        actions_font.setBold(True)
+        actions_font.setPointSize(12)
+        actions_label.setFont(actions_font)
+        main_layout.addWidget(actions_label)
+
+        # Griglia di azioni
+        actions_grid = QtWidgets.QGridLayout()
+        actions_grid.setSpacing(10)
+
+        # Pulsante Apri Browser
+        browser_btn = QtWidgets.QPushButton("Apri nel browser")
+        browser_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon))
+        browser_btn.clicked.connect(ssem.open_browser)
+        browser_btn.setFixedHeight(50)
+        actions_grid.addWidget(browser_btn, 0, 0)
+
+        # Pulsante Configurazione
+        config_btn = QtWidgets.QPushButton("Configurazione")
+        config_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogDetailedView))
+        config_btn.clicked.connect(ssem.open_config_folder)
+        config_btn.setFixedHeight(50)
+        actions_grid.addWidget(config_btn, 0, 1)
+
+        # Pulsante Log
+        logs_btn = QtWidgets.QPushButton("Visualizza log")
+        logs_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogContentsView))
+        logs_btn.clicked.connect(ssem.open_logs)
+        logs_btn.setFixedHeight(50)
+        actions_grid.addWidget(logs_btn, 1, 0)
+
+        # Pulsante Info
+        info_btn = QtWidgets.QPushButton("Informazioni")
+        info_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MessageBoxInformation))
+        info_btn.clicked.connect(self.show_info)
+        info_btn.setFixedHeight(50)
+        actions_grid.addWidget(info_btn, 1, 1)
+
+        # NUOVO PULSANTE: Editor Configurazioni
+        config_editor_btn = QtWidgets.QPushButton("Editor Configurazioni")
+        config_editor_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogListView))
+        config_editor_btn.clicked.connect(self.open_config_editor)
+        config_editor_btn.setFixedHeight(50)
+        actions_grid.addWidget(config_editor_btn, 2, 0, 1, 2)  # Span 2 colonne
+
+        # Pulsante Verifica connessioni
+        self.preflight_btn = QtWidgets.QPushButton("Verifica connessioni")
+        self.preflight_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_BrowserReload))
+        self.preflight_btn.clicked.connect(self.preflight_action)
+        self.preflight_btn.setFixedHeight(50)
+        actions_grid.addWidget(self.preflight_btn, 3, 0, 1, 2)
+
+        main_layout.addLayout(actions_grid)
+
+        # Spazio di espansione
+        main_layout.addStretch()
+
+        # Footer
+        footer_layout = QtWidgets.QHBoxLayout()
+        footer_layout.addStretch()
+
+        version_label = QtWidgets.QLabel("Versione 2.4.0")
+        version_font = QtGui.QFont()
+        version_font.setItalic(True)
+        version_label.setFont(version_font)
+        footer_layout.addWidget(version_label)
+
+        main_layout.addLayout(footer_layout)
+
+        # Aggiorna lo stato iniziale dell'UI
+        self.update_ui()
+
+        # Timer per aggiornare l'interfaccia
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.update_ui)
+        self.timer.start(1000)  # Aggiorna ogni secondo
+
+    # NUOVA FUNZIONE: Apri editor configurazioni
+    def open_config_editor(self):
+        config_editor = ConfigEditorDialog(self, config_dir="config")
+        config_editor.exec_()
+
+    def start_server_action(self):
+        ssem.start_server()
+        self.update_ui()
+
+    def stop_server_action(self):
+        ssem.stop_server()
+        self.update_ui()
+
+    def preflight_action(self):
+        # La verifica gira in background; l'esito è mostrato da update_ui
+        self.preflight_btn.setEnabled(False)
+        self.preflight_btn.setText("Verifica in corso...")
+
+        def worker():
+            try:
+                self._preflight_report = ssem.run_connection_check()
+            except Exception as e:
+                self._preflight_report = f"Errore durante la verifica: {e}"
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_preflight_report(self, report):
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Verifica connessioni")
+        dialog.resize(900, 400)
+        layout = QtWidgets.QVBoxLayout(dialog)
+
+        text = QtWidgets.QPlainTextEdit()
+        text.setReadOnly(True)
+        text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        text.setPlainText(report)
+        layout.addWidget(text)
+
+        close_btn = QtWidgets.QPushButton("Chiudi")
+        close_btn.clicked.connect(dialog.accept)
+        layout.addWidget(close_btn)
+        dialog.exec_()
+
+    def update_status_indicator(self, running):
+        if running:
+            self.status_indicator.setStyleSheet("background-color: #4CAF50; border-radius: 7px;")
+        else:
+            self.status_indicator.setStyleSheet("background-color: #F44336; border-radius: 7px;")
+
+    def update_ui(self):
+        if ssem.server_running:
+            self.status_label.setText("In esecuzione")
+            self.status_label.setStyleSheet("color: #4CAF50;")
+        else:
+            self.status_label.setText("Fermo")
+            self.status_label.setStyleSheet("color: #F44336;")
+
+        self.update_status_indicator(ssem.server_running)
+        self.start_btn.setEnabled(not ssem.server_running)
+        self.stop_btn.setEnabled(ssem.server_running)
+
+        if self._preflight_report is not None:
+            report, self._preflight_report = self._preflight_report, None
+            self.preflight_btn.setEnabled(True)
+            self.preflight_btn.setText("Verifica connessioni")
+            self.show_preflight_report(report)
+
+    def show_info(self):
+        QtWidgets.QMessageBox.information(
+            self,
+            "Informazioni su SSEM",
+            "Stefano Solidoro\n\n"
+            "Versione 2.4.0\n\n"
+            "Applicazione per il monitoraggio di impianti fotovoltaici\n"
+            "FusionSolar e AuroraVision"
+        )
+
+    def closeEvent(self, event):
+        # Chiudere veramente l'app e fermare il server
+        if ssem.server_running:
+            reply = QtWidgets.QMessageBox.question(
+                self, 
+                'Chiusura applicazione',
+                'Il server è in esecuzione. Vuoi fermarlo e chiudere l\'applicazione?',
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+
+            if reply == QtWidgets.QMessageBox.Yes:
+                ssem.stop_server()
+                event.accept()
+            else:
+                event.ignore()
+        else:
+            event.accept()
+
+
+def run(app_module):
+    """
+    Avvia il pannello di controllo PyQt5.
+    
+    Args:
+        app_module: Modulo dell'applicazione (app.py)
+    
+    Returns:
+        int: Codice di uscita dell'applicazione Qt
+    """
+    global ssem
+    ssem = app_module
+    
+    app = QtWidgets.QApplication(sys.argv)
+    app.setStyle("Fusion")  # Use Fusion style for a modern look
+    
+    # Create and show the control panel
+    control_panel = ControlPanel()
+    control_panel.show()
+    
+    return app.exec_()
@@ -0,0 +1,507 @@
+"""
+Pannello di controllo Tkinter, usato quando PyQt5 non è disponibile.
+
+Importato solo in modalità GUI (vedi gui.run): il server headless non carica tkinter.
+"""
+import configparser
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+# Modulo dell'applicazione (app.py) con lo stato del server e le azioni, impostato da run()
+ssem = None
+
+
+class TkConfigEditor:
+    def __init__(self, parent, config_dir="config"):
+        self.parent = parent
+        self.config_dir = config_dir
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Editor Configurazioni")
+        self.dialog.geometry("600x500")
+        self.dialog.minsize(600, 500)
+
+        self.aurora_config = configparser.ConfigParser()
+        self.fusion_config = configparser.ConfigParser()
+
+        # Carica le configurazioni
+        self.aurora_config.read(os.path.join(config_dir, "aurora_config.ini"))
+        self.fusion_config.read(os.path.join(config_dir, "fusion_config.ini"))
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        # Notebook (Tab widget)
+        self.notebook = ttk.Notebook(self.dialog)
+        self.notebook.pack(fill="both", expand=True, padx=20, pady=20)
+
+        # Tab per AuroraVision
+        aurora_tab = ttk.Frame(self.notebook)
+        self.notebook.add(aurora_tab, text="AuroraVision")
+
+        # Tab per FusionSolar
+        fusion_tab = ttk.Frame(self.notebook)
+        self.notebook.add(fusion_tab, text="FusionSolar")
+
+        # Configura il tab AuroraVision
+        self.setup_aurora_tab(aurora_tab)
+
+        # Configura il tab FusionSolar
+        self.setup_fusion_tab(fusion_tab)
+
+        # Pulsanti di azione
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill="x", padx=20, pady=10)
+
+        ttk.Button(button_frame, text="Annulla", command=self.dialog.destroy).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Salva", command=self.save_configurations).pack(side="right", padx=5)
+
+    def setup_aurora_tab(self, tab):
+        # Frame con scrollbar per il contenuto
+        canvas = tk.Canvas(tab)
+        scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Frame contenitore
+        content_frame = ttk.Frame(scrollable_frame)
+        content_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Gruppo Credenziali
+        cred_frame = ttk.LabelFrame(content_frame, text="Credenziali")
+        cred_frame.pack(fill="x", padx=5, pady=5)
+
+        # Username
+        ttk.Label(cred_frame, text="Username:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_username = ttk.Entry(cred_frame)
+        self.aurora_username.insert(0, self.aurora_config.get('CREDENTIALS', 'username', fallback=''))
+        self.aurora_username.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        # Password
+        ttk.Label(cred_frame, text="Password:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_password = ttk.Entry(cred_frame, show="*")
+        self.aurora_password.insert(0, self.aurora_config.get('CREDENTIALS', 'password', fallback=''))
+        self.aurora_password.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+
+        # Entity IDs
+        ttk.Label(cred_frame, text="ID Entità (separati da virgola):").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_entity_ids = ttk.Entry(cred_frame)
+        self.aurora_entity_ids.insert(0, self.aurora_config.get('CREDENTIALS', 'entity_ids', fallback=''))
+        self.aurora_entity_ids.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+
+        # Entity Aliases
+        ttk.Label(cred_frame, text="Alias Entità (separati da virgola):").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_entity_aliases = ttk.Entry(cred_frame)
+        self.aurora_entity_aliases.insert(0, self.aurora_config.get('CREDENTIALS', 'entity_aliases', fallback=''))
+        self.aurora_entity_aliases.grid(row=3, column=1, sticky="ew", padx=5, pady=5)
+
+        # Configurare le colonne per adattarsi
+        cred_frame.columnconfigure(1, weight=1)
+
+        # Gruppo Impostazioni
+        settings_frame = ttk.LabelFrame(content_frame, text="Impostazioni")
+        settings_frame.pack(fill="x", padx=5, pady=5)
+
+        # Time Interval
+        ttk.Label(settings_frame, text="Intervallo di aggiornamento (secondi):").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_time_interval = ttk.Spinbox(settings_frame, from_=60, to=3600, increment=60)
+        self.aurora_time_interval.insert(0, self.aurora_config.get('SETTINGS', 'time_interval', fallback='300'))
+        self.aurora_time_interval.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        # Alarm Enabled
+        ttk.Label(settings_frame, text="Abilitare allarmi:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_alarm_enabled = tk.BooleanVar()
+        self.aurora_alarm_enabled.set(self.aurora_config.getboolean('SETTINGS', 'alarm_enabled', fallback=True))
+        ttk.Checkbutton(settings_frame, variable=self.aurora_alarm_enabled).grid(row=1, column=1, sticky="w", padx=5, pady=5)
+
+        # Data Retention
+        ttk.Label(settings_frame, text="Conservazione dati (giorni):").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.aurora_data_retention = ttk.Spinbox(settings_frame, from_=1, to=365, increment=1)
+        self.aurora_data_retention.insert(0, self.aurora_config.get('SETTINGS', 'data_retention_days', fallback='30'))
+        self.aurora_data_retention.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+
+        # Configurare le colonne per adattarsi
+        settings_frame.columnconfigure(1, weight=1)
+
+    def setup_fusion_tab(self, tab):
+        # Frame con scrollbar per il contenuto
+        canvas = tk.Canvas(tab)
+        scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Frame contenitore
+        content_frame = ttk.Frame(scrollable_frame)
+        content_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Gruppo Credenziali
+        cred_frame = ttk.LabelFrame(content_frame, text="Credenziali")
+        cred_frame.pack(fill="x", padx=5, pady=5)
+
+        # Username
+        ttk.Label(cred_frame, text="Username:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_username = ttk.Entry(cred_frame)
+        self.fusion_username.insert(0, self.fusion_config.get('CREDENTIALS', 'username', fallback=''))
+        self.fusion_username.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        # Password
+        ttk.Label(cred_frame, text="Password:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_password = ttk.Entry(cred_frame, show="*")
+        self.fusion_password.insert(0, self.fusion_config.get('CREDENTIALS', 'password', fallback=''))
+        self.fusion_password.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+
+        # Subdomain
+        ttk.Label(cred_frame, text="Sottodominio:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_subdomain = ttk.Entry(cred_frame)
+        self.fusion_subdomain.insert(0, self.fusion_config.get('CREDENTIALS', 'subdomain', fallback=''))
+        self.fusion_subdomain.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+
+        # Captcha Model Path
+        ttk.Label(cred_frame, text="Percorso modello captcha:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_captcha_model = ttk.Entry(cred_frame)
+        self.fusion_captcha_model.insert(0, self.fusion_config.get('CREDENTIALS', 'captcha_model_path', fallback=''))
+        self.fusion_captcha_model.grid(row=3, column=1, sticky="ew", padx=5, pady=5)
+
+        # Plant Name
+        ttk.Label(cred_frame, text="Nome impianto:").grid(row=4, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_plant_name = ttk.Entry(cred_frame)
+        self.fusion_plant_name.insert(0, self.fusion_config.get('CREDENTIALS', 'plant_name', fallback=''))
+        self.fusion_plant_name.grid(row=4, column=1, sticky="ew", padx=5, pady=5)
+
+        # Configurare le colonne per adattarsi
+        cred_frame.columnconfigure(1, weight=1)
+
+        # Gruppo Northbound (se esiste nella configurazione)
+        if self.fusion_config.has_section('NORTHBOUND'):
+            northbound_frame = ttk.LabelFrame(content_frame, text="Northbound")
+            northbound_frame.pack(fill="x", padx=5, pady=5)
+
+            # Enabled
+            ttk.Label(northbound_frame, text="Abilitato:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+            self.fusion_northbound_enabled = tk.BooleanVar()
+            self.fusion_northbound_enabled.set(self.fusion_config.getboolean('NORTHBOUND', 'enabled', fallback=False))
+            ttk.Checkbutton(northbound_frame, variable=self.fusion_northbound_enabled).grid(row=0, column=1, sticky="w", padx=5, pady=5)
+
+            # Username
+            ttk.Label(northbound_frame, text="Username:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+            self.fusion_northbound_username = ttk.Entry(northbound_frame)
+            self.fusion_northbound_username.insert(0, self.fusion_config.get('NORTHBOUND', 'username', fallback=''))
+            self.fusion_northbound_username.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+
+            # Password
+            ttk.Label(northbound_frame, text="Password:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+            self.fusion_northbound_password = ttk.Entry(northbound_frame, show="*")
+            self.fusion_northbound_password.insert(0, self.fusion_config.get('NORTHBOUND', 'password', fallback=''))
+            self.fusion_northbound_password.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+
+            # Plant ID
+            ttk.Label(northbound_frame, text="ID Impianto:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+            self.fusion_northbound_plant_id = ttk.Entry(northbound_frame)
+            self.fusion_northbound_plant_id.insert(0, self.fusion_config.get('NORTHBOUND', 'plant_id', fallback=''))
+            self.fusion_northbound_plant_id.grid(row=3, column=1, sticky="ew", padx=5, pady=5)
+
+            # Configurare le colonne per adattarsi
+            northbound_frame.columnconfigure(1, weight=1)
+
+        # Gruppo Impostazioni
+        settings_frame = ttk.LabelFrame(content_frame, text="Impostazioni")
+        settings_frame.pack(fill="x", padx=5, pady=5)
+
+        # Time Interval
+        ttk.Label(settings_frame, text="Intervallo di aggiornamento (secondi):").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_time_interval = ttk.Spinbox(settings_frame, from_=60, to=3600, increment=60)
+        self.fusion_time_interval.insert(0, self.fusion_config.get('SETTINGS', 'time_interval', fallback='300'))
+        self.fusion_time_interval.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        # Alarm Enabled
+        ttk.Label(settings_frame, text="Abilitare allarmi:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_alarm_enabled = tk.BooleanVar()
+        self.fusion_alarm_enabled.set(self.fusion_config.getboolean('SETTINGS', 'alarm_enabled', fallback=True))
+        ttk.Checkbutton(settings_frame, variable=self.fusion_alarm_enabled).grid(row=1, column=1, sticky="w", padx=5, pady=5)
+
+        # Data Retention
+        ttk.Label(settings_frame, text="Conservazione dati (giorni):").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.fusion_data_retention = ttk.Spinbox(settings_frame, from_=1, to=365, increment=1)
+        self.fusion_data_retention.insert(0, self.fusion_config.get('SETTINGS', 'data_retention_days', fallback='30'))
+        self.fusion_data_retention.grid(row=2, column=1, sticky="ew", padx=5, pady=5)
+
+        # Configurare le colonne per adattarsi
+        settings_frame.columnconfigure(1, weight=1)
+
+    def save_configurations(self):
+        # Salva configurazione AuroraVision
+        self.aurora_config['CREDENTIALS']['username'] = self.aurora_username.get()
+        self.aurora_config['CREDENTIALS']['password'] = self.aurora_password.get()
+        self.aurora_config['CREDENTIALS']['entity_ids'] = self.aurora_entity_ids.get()
+        self.aurora_config['CREDENTIALS']['entity_aliases'] = self.aurora_entity_aliases.get()
+
+        self.aurora_config['SETTINGS']['time_interval'] = self.aurora_time_interval.get()
+        self.aurora_config['SETTINGS']['alarm_enabled'] = str(self.aurora_alarm_enabled.get())
+        self.aurora_config['SETTINGS']['data_retention_days'] = self.aurora_data_retention.get()
+
+        # Salva configurazione FusionSolar
+        self.fusion_config['CREDENTIALS']['username'] = self.fusion_username.get()
+        self.fusion_config['CREDENTIALS']['password'] = self.fusion_password.get()
+        self.fusion_config['CREDENTIALS']['subdomain'] = self.fusion_subdomain.get()
+        self.fusion_config['CREDENTIALS']['captcha_model_path'] = self.fusion_captcha_model.get()
+        self.fusion_config['CREDENTIALS']['plant_name'] = self.fusion_plant_name.get()
+
+        if self.fusion_config.has_section('NORTHBOUND'):
+            self.fusion_config['NORTHBOUND']['enabled'] = str(self.fusion_northbound_enabled.get())
+            self.fusion_config['NORTHBOUND']['username'] = self.fusion_northbound_username.get()
+            self.fusion_config['NORTHBOUND']['password'] = self.fusion_northbound_password.get()
+            self.fusion_config['NORTHBOUND']['plant_id'] = self.fusion_northbound_plant_id.get()
+
+        self.fusion_config['SETTINGS']['time_interval'] = self.fusion_time_interval.get()
+        self.fusion_config['SETTINGS']['alarm_enabled'] = str(self.fusion_alarm_enabled.get())
+        self.fusion_config['SETTINGS']['data_retention_days'] = self.fusion_data_retention.get()
+
+        # Salva i file
+        ssem.save_config_file(os.path.join(self.config_dir, "aurora_config.ini"), self.aurora_config)
+        ssem.save_config_file(os.path.join(self.config_dir, "fusion_config.ini"), self.fusion_config)
+
+        # Mostra messaggio di conferma
+        import tkinter.messagebox as messagebox
+        messagebox.showinfo(
+            "Configurazione salvata",
+            "Le configurazioni sono state salvate con successo.\n"
+            "Riavviare il server per applicare le modifiche."
+        )
+
+        # Chiudi il dialog
+        self.dialog.destroy()
+
+class TkApp:
+    def __init__(self, root):
+        self.root = root
+        self._preflight_report = None  # Esito della verifica connessioni in attesa di essere mostrato
+        root.title("SSEM - Pannello di Controllo")
+        root.geometry("500x400")
+        root.minsize(500, 400)
+
+        # Stile
+        style = ttk.Style()
+        style.configure("TButton", padding=6, relief="flat", font=('Helvetica', 10))
+        style.configure("TLabel", font=('Helvetica', 10))
+        style.configure("Header.TLabel", font=('Helvetica', 14, 'bold'))
+        style.configure("Subheader.TLabel", font=('Helvetica', 12))
+        style.configure("Title.TLabel", font=('Helvetica', 18, 'bold'))
+        style.configure("Footer.TLabel", font=('Helvetica', 9, 'italic'))
+
+        # Frame principale
+        main_frame = ttk.Frame(root, padding="20 20 20 20")
+        main_frame.pack(fill="both", expand=True)
+
+        # Header
+        header_frame = ttk.Frame(main_frame)
+        header_frame.pack(fill="x", pady=(0, 15))
+
+        title_label = ttk.Label(header_frame, text="SSEM", style="Title.TLabel")
+        title_label.pack(anchor="w")
+
+        subtitle_label = ttk.Label(header_frame, text="Sistema di Sorveglianza Energetica Monitorata")
+        subtitle_label.pack(anchor="w")
+
+        # Separator
+        separator1 = ttk.Separator(main_frame, orient="horizontal")
+        separator1.pack(fill="x", pady=(0, 15))
+
+        # Stato del server
+        status_frame = ttk.Frame(main_frame)
+        status_frame.pack(fill="x", pady=(0, 10))
+
+        status_text = ttk.Label(status_frame, text="Stato:")
+        status_text.pack(side="left")
+
+        self.status_label = ttk.Label(status_frame, text="Fermo", foreground="red", font=('Helvetica', 10, 'bold'))
+        self.status_label.pack(side="left", padx=(5, 0))
+
+        # Controlli server
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.pack(fill="x", pady=(0, 15))
+
+        self.start_btn = ttk.Button(controls_frame, text="Avvia server", command=self.start_server_action)
+        self.start_btn.pack(side="left", fill="x", expand=True, padx=(0, 5))
+
+        self.stop_btn = ttk.Button(controls_frame, text="Ferma server", command=self.stop_server_action)
+        self.stop_btn.pack(side="left", fill="x", expand=True, padx=(5, 0))
+
+        # Separator
+        separator2 = ttk.Separator(main_frame, orient="horizontal")
+        separator2.pack(fill="x", pady=(0, 15))
+
+        # Azioni rapide
+        actions_label = ttk.Label(main_frame, text="Azioni rapide", style="Subheader.TLabel")
+        actions_label.pack(anchor="w", pady=(0, 10))
+
+        # Frame per le azioni
+        actions_frame = ttk.Frame(main_frame)
+        actions_frame.pack(fill="both", expand=True)
+
+        # Configura le colonne e righe per essere responsive
+        actions_frame.columnconfigure(0, weight=1)
+        actions_frame.columnconfigure(1, weight=1)
+        actions_frame.rowconfigure(0, weight=1)
+        actions_frame.rowconfigure(1, weight=1)
+        actions_frame.rowconfigure(2, weight=1)  # Aggiunta una riga per il nuovo pulsante
+        actions_frame.rowconfigure(3, weight=1)
+
+        # Pulsante Apri Browser
+        browser_btn = ttk.Button(actions_frame, text="Apri nel browser", command=ssem.open_browser)
+        browser_btn.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+
+        # Pulsante Configurazione
+        config_btn = ttk.Button(actions_frame, text="Configurazione", command=ssem.open_config_folder)
+        config_btn.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
+
+        # Pulsante Log
+        logs_btn = ttk.Button(actions_frame, text="Visualizza log", command=ssem.open_logs)
+        logs_btn.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+
+        # Pulsante Info
+        info_btn = ttk.Button(actions_frame, text="Informazioni", command=self.show_info)
+        info_btn.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+
+        # NUOVO PULSANTE: Editor Configurazioni
+        config_editor_btn = ttk.Button(actions_frame, text="Editor Configurazioni", command=self.open_config_editor)
+        config_editor_btn.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+
+        # Pulsante Verifica connessioni
+        self.preflight_btn = ttk.Button(actions_frame, text="Verifica connessioni", command=self.preflight_action)
+        self.preflight_btn.grid(row=3, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+
+        # Footer
+        footer_frame = ttk.Frame(main_frame)
+        footer_frame.pack(fill="x", pady=(15, 0))
+
+        version_label = ttk.Label(footer_frame, text="Versione 2.4.0", style="Footer.TLabel")
+        version_label.pack(side="right")
+
+        # Aggiorna lo stato iniziale dell'UI
+        self.update_ui()
+
+        # Aggiorna l'UI periodicamente
+        self.update_timer()
+
+        # Gestione della chiusura
+        root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    # NUOVA FUNZIONE: Apri editor configurazioni
+    def open_config_editor(self):
+        config_editor = TkConfigEditor(self.root, config_dir="config")
+
+    def start_server_action(self):
+        ssem.start_server()
+        self.update_ui()
+
+    def stop_server_action(self):
+        ssem.stop_server()
+        self.update_ui()
+
+    def preflight_action(self):
+        # La verifica gira in background; l'esito è mostrato da update_ui
+        self.preflight_btn.config(state="disabled", text="Verifica in corso...")
+
+        def worker():
+            try:
+                self._preflight_report = ssem.run_connection_check()
+            except Exception as e:
+                self._preflight_report = f"Errore durante la verifica: {e}"
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_preflight_report(self, report):
+        window = tk.Toplevel(self.root)
+        window.title("Verifica connessioni")
+        window.geometry("900x400")
+
+        text = tk.Text(window, font=("Courier", 9), wrap="none")
+        text.insert("1.0", report)
+        text.config(state="disabled")
+        text.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+        ttk.Button(window, text="Chiudi", command=window.destroy).pack(pady=(0, 10))
+
+    def update_ui(self):
+        if ssem.server_running:
+            self.status_label.config(text="In esecuzione", foreground="green")
+            self.start_btn.config(state="disabled")
+            self.stop_btn.config(state="normal")
+        else:
+            self.status_label.config(text="Fermo", foreground="red")
+            self.start_btn.config(state="normal")
+            self.stop_btn.config(state="disabled")
+
+        if self._preflight_report is not None:
+            report, self._preflight_report = self._preflight_report, None
+            self.preflight_btn.config(state="normal", text="Verifica connessioni")
+            self.show_preflight_report(report)
+
+    def update_timer(self):
+        self.update_ui()
+        self.root.after(1000, self.update_timer)  # Aggiorna ogni secondo
+
+    def show_info(self):
+        import tkinter.messagebox as messagebox
+        messagebox.showinfo(
+            "Informazioni su SSEM",
+            "SSEM \n\n"
+            "Versione 2.4.0\n\n"
+            "Applicazione per il monitoraggio di impianti fotovoltaici\n"
+            "FusionSolar e AuroraVision"
+        )
+
+    def on_closing(self):
+        import tkinter.messagebox as messagebox
+
+        if ssem.server_running:
+            result = messagebox.askyesno(
+                "Chiusura applicazione",
+                "Il server è in esecuzione. Vuoi fermarlo e chiudere l'applicazione?"
+            )
+
+            if result:
+                ssem.stop_server()
+                self.root.destroy()
+        else:
+            self.root.destroy()
+
+
+def run(app_module):
+    """
+    Avvia il pannello di controllo Tkinter.
+    
+    Args:
+        app_module: Modulo dell'applicazione (app.py)
+    
+    Returns:
+        int: Codice di uscita
+    """
+    global ssem
+    ssem = app_module
+    
+    root = tk.Tk()
+    TkApp(root)
+    root.mainloop()
+    return 0
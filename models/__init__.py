@@ -1,9 +1,18 @@
 """
 Package per i modelli di dati del sistema di monitoraggio fotovoltaico.
 """
-# Utilizziamo import assoluti invece di relativi
-from models.plant import Plant
-from models.aurora_plant import AuroraVisionPlant
-from models.fusion_plant import FusionSolarPlant
+# Gli import sono risolti al primo accesso: i modelli di un fornitore (e le sue
+# librerie) sono caricati solo se il fornitore è configurato
+__all__ = ['Plant', 'PlantStatus', 'AuroraVisionPlant', 'FusionSolarPlant']
 
-__all__ = ['Plant', 'AuroraVisionPlant', 'FusionSolarPlant']
\ No newline at end of file
+def __getattr__(name):
+    if name in ('Plant', 'PlantStatus'):
+        from models import plant
+        return getattr(plant, name)
+    if name == 'AuroraVisionPlant':
+        from models.aurora_plant import AuroraVisionPlant
+        return AuroraVisionPlant
+    if name == 'FusionSolarPlant':
+        from models.fusion_plant import FusionSolarPlant
+        return FusionSolarPlant
+    raise AttributeError(f"module 'models' has no attribute '{name}'")
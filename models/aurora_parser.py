@@ -0,0 +1,126 @@
+"""
+Parser delle risposte PlantEnergy.json di AuroraVision.
+
+Usa il decoder JSON più veloce disponibile (orjson, poi ujson, altrimenti json della
+libreria standard), estrae solo i campi GenerationEnergy/GenerationPower tramite una
+tabella precalcolata e calcola la data odierna una sola volta al giorno invece che
+a ogni impianto.
+"""
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    JSON_DECODER = "orjson"
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        JSON_DECODER = "ujson"
+        _loads = ujson.loads
+    except ImportError:
+        JSON_DECODER = "json"
+        _loads = json.loads
+
+# Campi estratti: nome del campo -> (chiave da confrontare, valore atteso, attributo di AuroraReading)
+FIELD_LOOKUP = {
+    "GenerationEnergy": ("label", "today", "energy_today"),
+    "GenerationPower": ("type", "instant", "power")
+}
+
+_today = (0.0, "")  # (fine del giorno in epoch, data odierna "%Y-%m-%d")
+
+
+class AuroraReading:
+    """Valori estratti da una risposta per una singola entità."""
+
+    __slots__ = ("power", "energy_today", "power_stale")
+
+    def __init__(self):
+        self.power = 0.0
+        self.energy_today = 0.0
+        self.power_stale = False  # True se il valore istantaneo non è di oggi (potenza impostata a zero)
+
+
+class AuroraResponseError(ValueError):
+    """Risposta AuroraVision non valida (status diverso da SUCCESS o JSON non leggibile)."""
+
+
+def today_label():
+    """
+    Restituisce la data odierna nel formato usato da startLabel, ricalcolandola solo
+    al cambio di giorno.
+
+    Returns:
+        str: Data odierna (es. 2024-05-01)
+    """
+    global _today
+    end_of_day, label = _today
+    now = time.time()
+    if now >= end_of_day:
+        today = date.today()
+        label = today.strftime("%Y-%m-%d")
+        end_of_day = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        _today = (end_of_day, label)
+    return label
+
+
+def _decode(content):
+    """Decodifica il corpo della risposta (bytes o str) e ne verifica lo status."""
+    try:
+        data = _loads(content)
+    except ValueError as e:
+        raise AuroraResponseError(f"JSON non valido: {e}")
+    if not isinstance(data, dict) or data.get("status") != "SUCCESS":
+        status = data.get("status") if isinstance(data, dict) else None
+        raise AuroraResponseError(f"Risposta API non valida: {status}")
+    return data
+
+
+def _apply(reading, field, today):
+    """Applica un campo della risposta a una lettura, se è tra quelli estratti."""
+    lookup = FIELD_LOOKUP.get(field.get("field"))
+    if lookup is None:
+        return
+    key, expected, attribute = lookup
+    if field.get(key) != expected:
+        return
+    value = float(field.get("value", 0))
+    if attribute == "power":
+        # La potenza istantanea vale solo se la data di startLabel è di oggi
+        start_label = field.get("startLabel", "")
+        if start_label and today in start_label:
+            reading.power = value
+            reading.power_stale = False
+        else:
+            reading.power = 0.0
+            reading.power_stale = True
+    else:
+        reading.energy_today = value
+
+
+def parse_plant_energy(content, today=None):
+    """
+    Estrae potenza istantanea ed energia odierna da una risposta a entità singola.
+
+    Args:
+        content (bytes): Corpo della risposta
+        today (str, optional): Data odierna. Default today_label().
+
+    Returns:
+        AuroraReading: Valori estratti
+
+    Raises:
+        AuroraResponseError: Se la risposta non è valida
+    """
+    data = _decode(content)
+    today = today or today_label()
+    reading = AuroraReading()
+    for field in data.get("fields", ()):
+        _apply(reading, field, today)
+    return reading
+
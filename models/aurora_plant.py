@@ -1,16 +1,23 @@
 import logging
-from datetime import datetime
 from models.plant import Plant
+from models.aurora_parser import parse_plant_energy, AuroraResponseError
+from services.tracing import tracer, SPAN_KIND_CLIENT
 
 logger = logging.getLogger(__name__)
 
+# Endpoint dei dati di produzione (api_url lo sostituisce, es. con tool/mock_server.py)
+PLANT_ENERGY_URL = "https://easyview.auroravision.net"
+PLANT_ENERGY_PATH = "/easyview/services/gmi/summary/PlantEnergy.json"
+
 class AuroraVisionPlant(Plant):
     """
     Classe per rappresentare un impianto AuroraVision.
     Utilizza l'API PlantEnergy.json per ottenere dati in tempo reale.
     """
     
-    def __init__(self, name, entity_id, session_manager):
+    __slots__ = ("session_manager", "base_url", "request_timeout")
+    
+    def __init__(self, name, entity_id, session_manager, group=None, account=None, api_url=None):
         """
         Inizializza un impianto AuroraVision.
         
@@ -18,10 +25,13 @@ class AuroraVisionPlant(Plant):
             name (str): Nome dell'impianto
             entity_id (str): ID dell'entità AuroraVision
             session_manager: Gestore della sessione condivisa
+            group (str, optional): Gruppo logico dell'impianto. Default None.
+            account (str, optional): Account del fornitore a cui appartiene l'impianto. Default None.
+            api_url (str, optional): Indirizzo alternativo dell'API (es. un server di prova locale)
         """
-        super().__init__(name, entity_id, "AuroraVision")
+        super().__init__(name, entity_id, "AuroraVision", group=group, account=account)
         self.session_manager = session_manager
-        self.base_url = "https://easyview.auroravision.net/easyview/services/gmi/summary/PlantEnergy.json"
+        self.base_url = (api_url or PLANT_ENERGY_URL).rstrip("/") + PLANT_ENERGY_PATH
         self.request_timeout = 30  # Timeout in secondi
     
     def check_connection(self):
@@ -46,40 +56,26 @@ class AuroraVisionPlant(Plant):
             }
             
             # Esegui la richiesta
-            response = session.get(self.base_url, params=params, timeout=self.request_timeout)
+            with tracer.span("aurora.http_request", kind=SPAN_KIND_CLIENT, attributes={"http.url": self.base_url}) as span:
+                response = session.get(self.base_url, params=params, timeout=self.request_timeout)
+                span.set_attribute("http.status_code", response.status_code)
             
             if response.status_code == 200:
-                data = response.json()
+                # Salva eventuali cookie rinnovati dal server
+                self.session_manager.persist_session()
+                
+                try:
+                    with tracer.span("aurora.parse_response"):
+                        reading = parse_plant_energy(response.content)
+                except AuroraResponseError as e:
+                    logger.warning(f"Risposta API non valida per {self.name}: {e}")
+                    return self.update_status(0.0, 0.0, False, str(e))
+                
+                if reading.power_stale:
+                    logger.info(f"Impianto {self.name}: valore 'instant' non aggiornato a oggi. Impostato a zero.")
                 
-                if data.get("status") == "SUCCESS":
-                    current_power = 0.0
-                    energy_today = 0.0
-                    
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    
-                    # Estrai la potenza attuale
-                    for field in data.get("fields", []):
-                        # Per l'energia giornaliera
-                        if field.get("label") == "today" and field.get("field") == "GenerationEnergy":
-                            energy_today = float(field.get("value", 0))
-                        
-                        # Per la potenza istantanea, verifica che la data sia di oggi
-                        if field.get("type") == "instant" and field.get("field") == "GenerationPower":
-                            # Estrai la data dal campo startLabel
-                            start_label = field.get("startLabel", "")
-                            if start_label and today in start_label:
-                                # La data è di oggi, possiamo usare il valore
-                                current_power = float(field.get("value", 0))
-                            else:
-                                # La data non è di oggi, imposta a zero
-                                current_power = 0.0
-                                logger.info(f"Impianto {self.name}: valore 'instant' non aggiornato a oggi. Impostato a zero.")
-                    
-                    # Aggiorna lo stato dell'impianto
-                    return self.update_status(current_power, energy_today, True)
-                else:
-                    logger.warning(f"Risposta API non valida per {self.name}: {data.get('status')}")
-                    return self.update_status(0.0, 0.0, False, f"Risposta API non valida: {data.get('status')}")
+                # Aggiorna lo stato dell'impianto
+                return self.update_status(reading.power, reading.energy_today, True)
             elif response.status_code in [401, 403]:
                 # Sessione scaduta, invalidala
                 self.session_manager.invalidate_session()
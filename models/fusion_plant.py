@@ -1,17 +1,14 @@
 """
 Implementazione della classe Plant per gli impianti FusionSolar.
 """
+import importlib.util
 import logging
 from datetime import datetime
 from models.plant import Plant
 
 # Verifica se la libreria FusionSolar è disponibile
-try:
-    from fusion_solar_py.client import FusionSolarClient
-    FUSION_SOLAR_AVAILABLE = True
-except ImportError:
-    FUSION_SOLAR_AVAILABLE = False
-    logging.warning("Libreria fusion_solar_py non disponibile. Il supporto per FusionSolar è disabilitato.")
+# (senza importarla: il client è creato dal gestore di sessione)
+FUSION_SOLAR_AVAILABLE = importlib.util.find_spec("fusion_solar_py") is not None
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +18,9 @@ class FusionSolarPlant(Plant):
     Utilizza il client FusionSolar per ottenere dati in tempo reale.
     """
     
-    def __init__(self, name, plant_id, client_manager):
+    __slots__ = ("client_manager", "available")
+    
+    def __init__(self, name, plant_id, client_manager, group=None, account=None):
         """
         Inizializza un impianto FusionSolar.
         
@@ -29,8 +28,10 @@ class FusionSolarPlant(Plant):
             name (str): Nome dell'impianto
             plant_id (str): ID dell'impianto (può essere arbitrario)
             client_manager: Gestore del client FusionSolar
+            group (str, optional): Gruppo logico dell'impianto. Default None.
+            account (str, optional): Account del fornitore a cui appartiene l'impianto. Default None.
         """
-        super().__init__(name, plant_id, "FusionSolar")
+        super().__init__(name, plant_id, "FusionSolar", group=group, account=account)
         self.client_manager = client_manager
         self.available = FUSION_SOLAR_AVAILABLE
     
@@ -1,28 +1,77 @@
 """
 Modifica per correggere l'interpretazione dei dati dall'API Northbound di FusionSolar.
 """
+import importlib.util
 import logging
 import threading
+import time
 from datetime import datetime
 from models.plant import Plant
+from services.metrics import registry
+from services.session_managers import SESSION_LOGINS, SESSION_LOGIN_DURATION
+from services.tracing import tracer, traced_lock, SPAN_KIND_CLIENT
+from services.http_pool import mount_pooled_adapters
+from services.session_store import account_fingerprint
+from services.storage import atomic_write_json, load_json
 
-# Verifica se la libreria pyhfs è disponibile
-try:
-    import pyhfs
-    PYHFS_AVAILABLE = True
-except ImportError:
-    PYHFS_AVAILABLE = False
+# Verifica se la libreria pyhfs è disponibile senza importarla: viene caricata
+# alla creazione del primo PyHFSManager (vedi _load_pyhfs)
+PYHFS_AVAILABLE = importlib.util.find_spec("pyhfs") is not None
+if not PYHFS_AVAILABLE:
     logging.warning("Libreria pyhfs non disponibile. Il supporto per FusionSolar Northbound API è disabilitato.")
+pyhfs = None
+
+
+def _load_pyhfs():
+    """Importa pyhfs al primo utilizzo e lo rende disponibile al modulo."""
+    global pyhfs
+    if pyhfs is None and PYHFS_AVAILABLE:
+        import pyhfs as module
+        pyhfs = module
+    return pyhfs
 
 logger = logging.getLogger(__name__)
 
+# Metriche delle chiamate all'API Northbound
+NORTHBOUND_REQUESTS = registry.counter(
+    "ssem_northbound_requests_total",
+    "Numero di chiamate all'API Northbound per metodo ed esito",
+    ["method", "result"]
+)
+NORTHBOUND_REQUEST_DURATION = registry.histogram(
+    "ssem_northbound_request_duration_seconds",
+    "Durata delle chiamate all'API Northbound per metodo",
+    ["method"]
+)
+NORTHBOUND_FREQUENCY_LIMIT = registry.counter(
+    "ssem_northbound_frequency_limit_total",
+    "Numero di risposte FrequencyLimit ricevute dall'API Northbound",
+    ["method"]
+)
+NORTHBOUND_INFLIGHT = registry.gauge(
+    "ssem_northbound_requests_in_flight",
+    "Chiamate all'API Northbound in corso"
+)
+NORTHBOUND_METADATA_CACHE = registry.counter(
+    "ssem_northbound_metadata_cache_total",
+    "Accessi alla cache dei metadati delle stazioni Northbound per esito",
+    ["result"]
+)
+
+# Campi delle stazioni conservati nella cache dei metadati
+STATION_METADATA_FIELDS = ("plantCode", "plantName", "capacity", "latitude", "longitude", "plantAddress")
+STATION_CACHE_VERSION = 1
+METADATA_RETRY_INTERVAL = 300  # Secondi prima di riprovare dopo una rilettura fallita
+
 class FusionSolarNorthboundPlant(Plant):
     """
     Classe per rappresentare un impianto FusionSolar utilizzando la libreria pyhfs.
     Utilizza l'API Northbound per ottenere dati in tempo reale.
     """
     
-    def __init__(self, name, plant_id, northbound_manager):
+    __slots__ = ("northbound_manager", "available", "_actual_plant_id")
+    
+    def __init__(self, name, plant_id, northbound_manager, group=None, account=None):
         """
         Inizializza un impianto FusionSolar con accesso tramite pyhfs.
         
@@ -30,12 +79,34 @@ class FusionSolarNorthboundPlant(Plant):
             name (str): Nome dell'impianto
             plant_id (str): ID della stazione o "main" per usare il primo trovato
             northbound_manager: Gestore della sessione pyhfs
+            group (str, optional): Gruppo logico dell'impianto. Default None.
+            account (str, optional): Account del fornitore a cui appartiene l'impianto. Default None.
         """
-        super().__init__(name, plant_id, "FusionSolar-Northbound")
+        super().__init__(name, plant_id, "FusionSolar-Northbound", provider="FusionSolar", group=group, account=account)
         self.northbound_manager = northbound_manager
         self.available = PYHFS_AVAILABLE
         self._actual_plant_id = None  # Verrà impostato al primo controllo
     
+    def station_code(self):
+        """
+        Restituisce il codice della stazione da interrogare ("main" è risolto nel primo
+        impianto dell'account al primo utilizzo).
+        
+        Returns:
+            str: Codice della stazione
+        """
+        # Se l'ID dell'impianto è "main", ottieni il primo impianto disponibile
+        if self.id == "main" and self._actual_plant_id is None:
+            plants = self.northbound_manager.get_plant_list()
+            if plants and len(plants) > 0:
+                # Usa 'plantCode' come identificatore dell'impianto
+                self._actual_plant_id = plants[0].get("plantCode")
+                plant_name = plants[0].get("plantName")
+                logger.info(f"Impianto {self.name}: utilizzando impianto '{plant_name}' con ID '{self._actual_plant_id}'")
+        
+        # Usa l'ID effettivo dell'impianto se disponibile, altrimenti usa l'ID originale
+        return self._actual_plant_id if self._actual_plant_id else self.id
+    
     def check_connection(self):
         """
         Verifica la connessione e aggiorna lo stato dell'impianto.
@@ -43,205 +114,223 @@ class FusionSolarNorthboundPlant(Plant):
         Returns:
             bool: True se l'aggiornamento ha avuto successo, False altrimenti
         """
-        if not self.available:
-            return self.update_status(0.0, 0.0, False, "Libreria pyhfs non disponibile")
+        return self.check_batch([self])[0]
+    
+    @classmethod
+    def check_batch(cls, plants):
+        """
+        Aggiorna un gruppo di impianti dello stesso gestore Northbound con una sola richiesta
+        dei dati in tempo reale (getStationRealKpi accetta più stazioni). Per le stazioni senza
+        dati in tempo reale ripiega, sempre con una richiesta per tutto il gruppo, sui dati
+        orari e poi su quelli giornalieri.
+        
+        Args:
+            plants (list): Impianti (FusionSolarNorthboundPlant) con lo stesso northbound_manager
         
+        Returns:
+            list: Esito dell'aggiornamento per impianto, nello stesso ordine
+        """
+        if not all(plant.available for plant in plants):
+            return [plant.update_status(0.0, 0.0, False, "Libreria pyhfs non disponibile") for plant in plants]
+        
+        manager = plants[0].northbound_manager
+        results = [None] * len(plants)
         try:
-            # Se l'ID dell'impianto è "main", ottieni il primo impianto disponibile
-            if self.id == "main" and self._actual_plant_id is None:
-                plants = self.northbound_manager.get_plant_list()
-                if plants and len(plants) > 0:
-                    # Usa 'plantCode' come identificatore dell'impianto
-                    self._actual_plant_id = plants[0].get("plantCode")
-                    plant_name = plants[0].get("plantName")
-                    logger.info(f"Impianto {self.name}: utilizzando impianto '{plant_name}' con ID '{self._actual_plant_id}'")
-            
-            # Usa l'ID effettivo dell'impianto se disponibile, altrimenti usa l'ID originale
-            plant_id = self._actual_plant_id if self._actual_plant_id else self.id
+            codes = [plant.station_code() for plant in plants]
             
             # Ottieni i dati in tempo reale (seguendo l'implementazione originale di pyhfs)
             # Nota: il metodo si aspetta una lista di ID impianti
-            realtime_data = self.northbound_manager.get_plant_realtime_data([plant_id])
+            realtime_data = manager.get_plant_realtime_data(list(dict.fromkeys(codes)))
+            
+            realtime = {}
+            for item in realtime_data or []:
+                realtime.setdefault(item.get("stationCode"), item)
+            for index, (plant, code) in enumerate(zip(plants, codes)):
+                if code in realtime:
+                    results[index] = plant._update_from_realtime(code, realtime[code])
             
-            if realtime_data and len(realtime_data) > 0:
+            # Se non ci sono dati in tempo reale, prova con i dati orari
+            missing = [index for index, result in enumerate(results) if result is None]
+            if missing:
+                if realtime_data:
+                    for index in missing:
+                        logger.warning(f"Nessun dato in tempo reale per l'impianto {plants[index].name} (ID: {codes[index]})")
+                now = datetime.now()
                 try:
-                    # Estrai i dati dall'elemento corrispondente al nostro impianto
-                    station_data = None
-                    for item in realtime_data:
-                        if item.get("stationCode") == plant_id:
-                            station_data = item
-                            break
-                    
-                    if not station_data:
-                        logger.warning(f"Nessun dato trovato per l'impianto {self.name} (ID: {plant_id})")
-                        return self.update_status(0.0, 0.0, False, "Dati non disponibili")
-                    
-                    logger.info(f"Dati in tempo reale per {self.name}: {station_data}")
+                    hourly_data = manager.get_plant_hourly_data(list(dict.fromkeys(codes[index] for index in missing)), now)
                     
-                    # I dati sono nel campo dataItemMap
-                    data_item_map = station_data.get("dataItemMap", {})
+                    # Trova i dati più recenti per ogni impianto
+                    latest = {}
+                    for item in hourly_data or []:
+                        code = item.get("stationCode")
+                        if code not in latest or item.get("collectTime", 0) > latest[code].get("collectTime", 0):
+                            latest[code] = item
                     
-                    # *** IMPORTANTE: Correzione potenza attuale ***
-                    # 'day_power' è la produzione cumulativa del giorno, non la potenza attuale
-                    # Molti impianti FusionSolar non forniscono la potenza attuale tramite API Northbound
-                    # Usiamo una stima basata sulle immagini dell'interfaccia
-                    
-                    # Se disponibile, usa first_power_station (potenza attuale)
-                    current_power = 0
-                    day_power = 0
-                    
-                    # Energia giornaliera - questo è corretto ed è in kWh
-                    for key in ["day_power", "dailyEnergy", "dayPower"]:
-                        if key in data_item_map and data_item_map[key] is not None:
-                            try:
-                                day_power = float(data_item_map[key])
-                                break
-                            except (ValueError, TypeError):
-                                pass
-                    
-                    # CORREZIONE: Usiamo un valore più realistico per la potenza attuale
-                    # Dallo screenshot vediamo che il valore è 804.620 kW
-                    # Questo potrebbe essere disponibile in installazioni più recenti
-                    # che hanno monitor in tempo reale (non tutte le implementazioni lo hanno)
-                    
-                    # Cerca in modo più flessibile un valore di potenza attuale
-                    for key in ["first_power_station", "power_now", "activePower", "currentPower", "real_power"]:
-                        if key in data_item_map and data_item_map[key] is not None:
-                            try:
-                                current_power = float(data_item_map[key])
-                                logger.info(f"Potenza attuale trovata nel campo '{key}': {current_power} kW")
-                                break
-                            except (ValueError, TypeError):
-                                pass
-                    
-                    # Se non troviamo la potenza attuale, imposta un valore stimato 
-                    # In base all'orario del giorno (0 di notte, circa 1/2 capacità installata a mezzogiorno)
-                    if current_power == 0:
-                        # Utilizziamo il valore from interfaccia web
-                        logger.info(f"Potenza attuale non trovata nei dati API, usando valore stimato")
-                        
-                        # Ottieni il valore di capacità installata se disponibile
-                        installed_capacity = 0
-                        for plant in self.northbound_manager.get_plant_list():
-                            if plant.get("plantCode") == plant_id:
-                                installed_capacity = plant.get("capacity", 0)
-                                break
-                        
-                        # Se abbiamo la potenza giornaliera, facciamo una stima
-                        # basata sull'ora del giorno (curva a campana)
-                        hour_now = datetime.now().hour
-                        if hour_now >= 8 and hour_now <= 19:  # Ore di luce
-                            # Semplice stima della produzione attuale
-                            # Capacità installata è spesso un buon riferimento
-                            if installed_capacity > 0:
-                                # Stima basata su una curva a campana semplificata
-                                # Picco alle 13, minimo alle 8 e 19
-                                hour_factor = 1 - abs(hour_now - 13) / 5  # Fattore tra 0 e 1
-                                current_power = installed_capacity * max(0.1, hour_factor)
-                                logger.info(f"Potenza stimata in base all'ora del giorno: {current_power:.2f} kW")
-                            else:
-                                # Se abbiamo l'energia giornaliera, facciamo una stima grezza
-                                if day_power > 0:
-                                    # Approssimazione: l'energia giornaliera divisa per le ore di produzione
-                                    # e moltiplicata per un fattore che dipende dall'ora del giorno
-                                    hour_factor = 1 - abs(hour_now - 13) / 5  # Fattore tra 0 e 1
-                                    current_power = day_power * max(0.1, hour_factor) / 10
-                                    logger.info(f"Potenza stimata in base all'energia giornaliera: {current_power:.2f} kW")
-                    
-                    # Aggiorna lo stato dell'impianto
-                    logger.info(f"Impianto {self.name}: potenza attuale = {current_power} kW, energia giornaliera = {day_power} kWh")
-                    return self.update_status(current_power, day_power, True)
-                    
-                except Exception as e:
-                    logger.error(f"Errore nell'elaborazione dei dati per {self.name}: {str(e)}")
-                    return self.update_status(0.0, 0.0, False, f"Errore nell'elaborazione dei dati: {str(e)}")
-            else:
-                # Se non ci sono dati in tempo reale, prova con i dati orari
-                try:
-                    # Ottieni la data corrente
-                    now = datetime.now()
-                    hourly_data = self.northbound_manager.get_plant_hourly_data([plant_id], now)
-                    
-                    if hourly_data and len(hourly_data) > 0:
-                        # Trova i dati più recenti per il nostro impianto
-                        latest_data = None
-                        latest_time = 0
-                        
-                        for item in hourly_data:
-                            if item.get("stationCode") == plant_id:
-                                collect_time = item.get("collectTime", 0)
-                                if collect_time > latest_time:
-                                    latest_time = collect_time
-                                    latest_data = item
-                        
+                    for index in missing:
+                        latest_data = latest.get(codes[index])
                         if latest_data:
-                            logger.info(f"Dati orari per {self.name}: {latest_data}")
-                            
-                            # Estrai i dati dal campo dataItemMap
-                            data_item_map = latest_data.get("dataItemMap", {})
+                            plant = plants[index]
+                            logger.debug("Dati orari per %s: %s", plant.name, latest_data)
                             
                             # Potenza inverter (valore più probabile per i dati orari)
-                            inverter_power = data_item_map.get("inverter_power", 0)
-                            if inverter_power is None:
-                                inverter_power = 0
-                            elif isinstance(inverter_power, str):
-                                try:
-                                    inverter_power = float(inverter_power)
-                                except (ValueError, TypeError):
-                                    inverter_power = 0
+                            inverter_power = _inverter_power(latest_data)
                             
                             # Non abbiamo l'energia giornaliera nei dati orari, usiamo 0
-                            logger.info(f"Impianto {self.name}: potenza oraria = {inverter_power} kW")
-                            return self.update_status(inverter_power, 0, True)
-                    
-                    # Se arriviamo qui, non abbiamo trovato dati orari validi
-                    logger.warning(f"Nessun dato orario valido per {self.name} (ID: {plant_id})")
+                            logger.debug(f"Impianto {plant.name}: potenza oraria = {inverter_power} kW")
+                            results[index] = plant.update_status(inverter_power, 0, True)
+                        else:
+                            logger.warning(f"Nessun dato orario valido per {plants[index].name} (ID: {codes[index]})")
                 except Exception as e:
                     logger.warning(f"Errore nell'ottenimento dei dati orari: {e}")
                 
                 # Ultimo tentativo: dati giornalieri
-                try:
-                    daily_data = self.northbound_manager.get_plant_daily_data([plant_id], now)
-                    
-                    if daily_data and len(daily_data) > 0:
-                        # Trova i dati per il nostro impianto
-                        for item in daily_data:
-                            if item.get("stationCode") == plant_id:
-                                logger.info(f"Dati giornalieri per {self.name}: {item}")
-                                
-                                # Estrai i dati dal campo dataItemMap
-                                data_item_map = item.get("dataItemMap", {})
+                missing = [index for index in missing if results[index] is None]
+                if missing:
+                    try:
+                        daily_data = manager.get_plant_daily_data(list(dict.fromkeys(codes[index] for index in missing)), now)
+                        
+                        daily = {}
+                        for item in daily_data or []:
+                            daily.setdefault(item.get("stationCode"), item)
+                        
+                        for index in missing:
+                            item = daily.get(codes[index])
+                            if item:
+                                plant = plants[index]
+                                logger.debug("Dati giornalieri per %s: %s", plant.name, item)
                                 
                                 # Potenza inverter (valore più probabile per i dati giornalieri)
-                                inverter_power = data_item_map.get("inverter_power", 0)
-                                if inverter_power is None:
-                                    inverter_power = 0
-                                elif isinstance(inverter_power, str):
-                                    try:
-                                        inverter_power = float(inverter_power)
-                                    except (ValueError, TypeError):
-                                        inverter_power = 0
+                                inverter_power = _inverter_power(item)
                                 
-                                logger.info(f"Impianto {self.name}: potenza giornaliera = {inverter_power} kW")
-                                return self.update_status(inverter_power, 0, True)
-                    
-                    # Se arriviamo qui, non abbiamo trovato dati giornalieri validi
-                    logger.warning(f"Nessun dato giornaliero valido per {self.name} (ID: {plant_id})")
-                except Exception as e:
-                    logger.warning(f"Errore nell'ottenimento dei dati giornalieri: {e}")
+                                logger.debug(f"Impianto {plant.name}: potenza giornaliera = {inverter_power} kW")
+                                results[index] = plant.update_status(inverter_power, 0, True)
+                            else:
+                                logger.warning(f"Nessun dato giornaliero valido per {plants[index].name} (ID: {codes[index]})")
+                    except Exception as e:
+                        logger.warning(f"Errore nell'ottenimento dei dati giornalieri: {e}")
                 
                 # Se arriviamo qui, non siamo riusciti a ottenere dati validi
-                logger.warning(f"Nessun dato disponibile per {self.name} (ID: {plant_id})")
-                return self.update_status(0.0, 0.0, False, "Dati non disponibili")
-                
+                for index in missing:
+                    if results[index] is None:
+                        logger.warning(f"Nessun dato disponibile per {plants[index].name} (ID: {codes[index]})")
+                        results[index] = plants[index].update_status(0.0, 0.0, False, "Dati non disponibili")
+            
+            return results
+        
         except pyhfs.FrequencyLimit as e:
-            logger.warning(f"Limite di frequenza dell'API superato per {self.name}: {str(e)}")
-            return self.update_status(0.0, 0.0, False, "Limite di frequenza dell'API superato")
+            logger.warning(f"Limite di frequenza dell'API superato per {', '.join(plant.name for plant in plants)}: {str(e)}")
+            message = "Limite di frequenza dell'API superato"
         except Exception as e:
-            logger.error(f"Errore durante l'aggiornamento di {self.name}: {str(e)}")
-            # Invalida la sessione per forzare un nuovo login
-            self.northbound_manager.invalidate_session()
-            return self.update_status(0.0, 0.0, False, f"Errore: {str(e)}")
+            # Non invalida la sessione condivisa: gli errori di autenticazione delle chiamate
+            # l'hanno già invalidata (solo per la generazione usata, vedi PyHFSManager._call_client)
+            logger.error(f"Errore durante l'aggiornamento di {', '.join(plant.name for plant in plants)}: {str(e)}")
+            message = f"Errore: {str(e)}"
+        return [
+            result if result is not None else plant.update_status(0.0, 0.0, False, message)
+            for plant, result in zip(plants, results)
+        ]
+    
+    def _update_from_realtime(self, plant_id, station_data):
+        """
+        Aggiorna lo stato dell'impianto dai dati in tempo reale della sua stazione.
+        
+        Args:
+            plant_id (str): Codice della stazione
+            station_data (dict): Elemento della risposta di getStationRealKpi
+        
+        Returns:
+            bool: True se l'aggiornamento ha avuto successo, False altrimenti
+        """
+        try:
+            logger.debug("Dati in tempo reale per %s: %s", self.name, station_data)  # Formattato solo se il debug è attivo
+            
+            # I dati sono nel campo dataItemMap
+            data_item_map = station_data.get("dataItemMap", {})
+            
+            # *** IMPORTANTE: Correzione potenza attuale ***
+            # 'day_power' è la produzione cumulativa del giorno, non la potenza attuale
+            # Molti impianti FusionSolar non forniscono la potenza attuale tramite API Northbound
+            # Usiamo una stima basata sulle immagini dell'interfaccia
+            
+            # Se disponibile, usa first_power_station (potenza attuale)
+            current_power = 0
+            day_power = 0
+            
+            # Energia giornaliera - questo è corretto ed è in kWh
+            for key in ["day_power", "dailyEnergy", "dayPower"]:
+                if key in data_item_map and data_item_map[key] is not None:
+                    try:
+                        day_power = float(data_item_map[key])
+                        break
+                    except (ValueError, TypeError):
+                        pass
+            
+            # CORREZIONE: Usiamo un valore più realistico per la potenza attuale
+            # Dallo screenshot vediamo che il valore è 804.620 kW
+            # Questo potrebbe essere disponibile in installazioni più recenti
+            # che hanno monitor in tempo reale (non tutte le implementazioni lo hanno)
+            
+            # Cerca in modo più flessibile un valore di potenza attuale
+            for key in ["first_power_station", "power_now", "activePower", "currentPower", "real_power"]:
+                if key in data_item_map and data_item_map[key] is not None:
+                    try:
+                        current_power = float(data_item_map[key])
+                        logger.debug(f"Potenza attuale trovata nel campo '{key}': {current_power} kW")
+                        break
+                    except (ValueError, TypeError):
+                        pass
+            
+            # Se non troviamo la potenza attuale, imposta un valore stimato
+            # In base all'orario del giorno (0 di notte, circa 1/2 capacità installata a mezzogiorno)
+            if current_power == 0:
+                # Utilizziamo il valore from interfaccia web
+                logger.debug(f"Potenza attuale non trovata nei dati API, usando valore stimato")
+                
+                # Ottieni il valore di capacità installata se disponibile
+                station = self.northbound_manager.get_station(plant_id)
+                installed_capacity = (station.get("capacity") or 0) if station else 0
+                
+                # Se abbiamo la potenza giornaliera, facciamo una stima
+                # basata sull'ora del giorno (curva a campana)
+                hour_now = datetime.now().hour
+                if hour_now >= 8 and hour_now <= 19:  # Ore di luce
+                    # Semplice stima della produzione attuale
+                    # Capacità installata è spesso un buon riferimento
+                    if installed_capacity > 0:
+                        # Stima basata su una curva a campana semplificata
+                        # Picco alle 13, minimo alle 8 e 19
+                        hour_factor = 1 - abs(hour_now - 13) / 5  # Fattore tra 0 e 1
+                        current_power = installed_capacity * max(0.1, hour_factor)
+                        logger.debug(f"Potenza stimata in base all'ora del giorno: {current_power:.2f} kW")
+                    else:
+                        # Se abbiamo l'energia giornaliera, facciamo una stima grezza
+                        if day_power > 0:
+                            # Approssimazione: l'energia giornaliera divisa per le ore di produzione
+                            # e moltiplicata per un fattore che dipende dall'ora del giorno
+                            hour_factor = 1 - abs(hour_now - 13) / 5  # Fattore tra 0 e 1
+                            current_power = day_power * max(0.1, hour_factor) / 10
+                            logger.debug(f"Potenza stimata in base all'energia giornaliera: {current_power:.2f} kW")
+            
+            # Aggiorna lo stato dell'impianto
+            logger.debug(f"Impianto {self.name}: potenza attuale = {current_power} kW, energia giornaliera = {day_power} kWh")
+            return self.update_status(current_power, day_power, True)
+        
+        except Exception as e:
+            logger.error(f"Errore nell'elaborazione dei dati per {self.name}: {str(e)}")
+            return self.update_status(0.0, 0.0, False, f"Errore nell'elaborazione dei dati: {str(e)}")
+
+
+def _inverter_power(item):
+    """Potenza inverter di un elemento dei dati orari o giornalieri (0 se assente o non valida)."""
+    inverter_power = item.get("dataItemMap", {}).get("inverter_power", 0)
+    if inverter_power is None:
+        inverter_power = 0
+    elif isinstance(inverter_power, str):
+        try:
+            inverter_power = float(inverter_power)
+        except (ValueError, TypeError):
+            inverter_power = 0
+    return inverter_power
 
 
 class PyHFSManager:
@@ -250,25 +339,50 @@ class PyHFSManager:
     Implementa una versione modificata del pattern context manager per funzionare in un'applicazione persistente.
     """
     
-    def __init__(self, credentials):
+    def __init__(self, credentials, max_concurrent_requests=4, metadata_file=None, metadata_ttl=86400,
+                 api_url=None):
         """
         Inizializza il gestore pyhfs.
         
         Args:
             credentials (dict): Credenziali per l'accesso all'API Northbound
+            max_concurrent_requests (int): Numero massimo di chiamate Northbound contemporanee
+            metadata_file (str, optional): File in cui conservare i metadati delle stazioni tra i riavvii
+            metadata_ttl (int): Validità in secondi dei metadati delle stazioni
+            api_url (str, optional): Indirizzo alternativo dell'API Northbound (es. un server di prova locale)
         """
         self.credentials = credentials
+        self.api_url = api_url
         self.username = credentials.get("username", "")
         self.password = credentials.get("password", "")
-        self.available = PYHFS_AVAILABLE
-        self.lock = threading.RLock()
+        self.available = _load_pyhfs() is not None
+        self.lock = threading.RLock()  # Protegge solo lo stato della sessione (mai durante le chiamate di rete)
+        self.login_lock = threading.RLock()  # Un solo login alla volta
+        self.request_slots = threading.BoundedSemaphore(max(1, max_concurrent_requests))
         self.client = None
+        
+        # Ogni nuovo client ha una generazione: gli errori di una generazione superata non
+        # invalidano la sessione nuova, e i client sostituiti sono chiusi quando non più in uso
+        self.generation = 0
+        self._in_flight = {}  # generazione -> chiamate in corso
+        self._retired = {}  # generazione -> client sostituito in attesa di chiusura
         self.session_valid = False
         self.last_exception = None
         
         # Intervallo di tempo per considerare valida una sessione (secondi)
         self.session_validity_period = 3600  # 1 ora
+        self.refresh_margin = 300  # Secondi prima della scadenza in cui il rinnovo avviene in background
         self.last_login_time = None
+        
+        # Cache dei metadati delle stazioni (elenco, nomi, capacità, coordinate):
+        # cambiano di rado e non devono consumare la quota Northbound a ogni ciclo
+        self.metadata_ttl = metadata_ttl
+        self.metadata_file = metadata_file
+        self.metadata_lock = threading.Lock()  # Una sola richiesta della lista impianti alla volta
+        self._stations = None
+        self._stations_fetched_at = 0.0
+        self._metadata_retry_at = 0.0
+        self._load_station_cache()
     
     def _create_client(self):
         """
@@ -277,32 +391,186 @@ class PyHFSManager:
         Returns:
             object: Client pyhfs o None in caso di errore
         """
+        start = time.perf_counter()
+        span = tracer.start_span("northbound.login")
         try:
             # Crea un nuovo client con ClientSession e lo conserva
             # NOTA: Non usiamo il contesto 'with' perché vogliamo mantenere il client attivo
             session = pyhfs.ClientSession(user=self.username, password=self.password)
+            if self.api_url:
+                session.session.base_url = self.api_url.rstrip("/") + "/thirdData/"
+            
+            # Monta il pool di connessioni sulla sessione HTTP di pyhfs prima del login
+            http_session = getattr(getattr(session, "session", None), "session", None)
+            if http_session is not None:
+                mount_pooled_adapters(http_session, "FusionSolar-Northbound")
+            
             client = session.__enter__()
-            self.last_login_time = datetime.now()
+            SESSION_LOGINS.labels("FusionSolar-Northbound", "success").inc()
             return client
         except Exception as e:
             self.last_exception = e
+            SESSION_LOGINS.labels("FusionSolar-Northbound", "failure").inc()
+            span.record_exception(e)
             logger.error(f"Errore nella creazione del client pyhfs: {e}")
             return None
+        finally:
+            SESSION_LOGIN_DURATION.labels("FusionSolar-Northbound").observe(time.perf_counter() - start)
+            span.end()
     
-    def invalidate_session(self):
-        """Invalida la sessione corrente."""
+    def _checkout_client(self):
+        """
+        Prende in uso il client corrente registrandone la generazione.
+        
+        Returns:
+            tuple: (client, generazione) o (None, None) se non c'è sessione
+        """
         with self.lock:
-            if self.client:
-                try:
-                    # Per eliminare la sessione, dobbiamo chiamare __exit__ sulla sessione
-                    if hasattr(self.client, '__exit__'):
-                        self.client.__exit__(None, None, None)
-                except Exception as e:
-                    logger.warning(f"Errore durante la chiusura della sessione pyhfs: {e}")
+            if not self.client:
+                return None, None
+            generation = self.generation
+            self._in_flight[generation] = self._in_flight.get(generation, 0) + 1
+            return self.client, generation
+    
+    def _checkin_client(self, generation):
+        """
+        Rilascia un client preso con _checkout_client e chiude il client sostituito
+        se questa era la sua ultima chiamata in corso.
+        
+        Args:
+            generation (int): Generazione del client rilasciato
+        """
+        with self.lock:
+            remaining = self._in_flight.get(generation, 1) - 1
+            if remaining > 0:
+                self._in_flight[generation] = remaining
+                return
+            self._in_flight.pop(generation, None)
+            retired = self._retired.pop(generation, None)
+        if retired is not None:
+            self._close_client(retired)
+    
+    def _call_client(self, method, *args):
+        """
+        Esegue un metodo del client pyhfs registrando durata ed esito della chiamata.
+        Le chiamate avvengono senza lock, fino a max_concurrent_requests in parallelo.
+        Solo un errore di autenticazione (LoginFailed, sollevato da pyhfs anche quando il
+        nuovo login dopo una sessione scaduta fallisce) invalida la sessione, e solo se è
+        ancora della generazione usata: errori di rete o dei dati non toccano la sessione
+        condivisa, così non si consumano login contro il limite di frequenza.
+        
+        Args:
+            method (str): Nome del metodo del client
+            *args: Argomenti del metodo
             
+        Returns:
+            Risultato del metodo del client
+        """
+        client, generation = self._checkout_client()
+        if client is None:
+            raise RuntimeError("Sessione Northbound non disponibile")
+        
+        start = time.perf_counter()
+        result = "error"
+        try:
+            with tracer.span(f"northbound.{method}", kind=SPAN_KIND_CLIENT) as span, self.request_slots:
+                NORTHBOUND_INFLIGHT.inc()
+                try:
+                    response = getattr(client, method)(*args)
+                    result = "success"
+                    return response
+                except pyhfs.FrequencyLimit:
+                    result = "frequency_limit"
+                    NORTHBOUND_FREQUENCY_LIMIT.labels(method).inc()
+                    raise
+                except pyhfs.LoginFailed:
+                    result = "login_failed"
+                    self.invalidate_session(generation)
+                    raise
+                finally:
+                    NORTHBOUND_INFLIGHT.dec()
+                    span.set_attribute("northbound.result", result)
+                    span.set_attribute("northbound.generation", generation)
+        finally:
+            NORTHBOUND_REQUEST_DURATION.labels(method).observe(time.perf_counter() - start)
+            NORTHBOUND_REQUESTS.labels(method, result).inc()
+            self._checkin_client(generation)
+    
+    @staticmethod
+    def _close_client(client):
+        """Chiude la sessione di un client pyhfs non più in uso."""
+        try:
+            # Per eliminare la sessione, dobbiamo chiamare __exit__ sulla sessione
+            if hasattr(client, '__exit__'):
+                client.__exit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Errore durante la chiusura della sessione pyhfs: {e}")
+    
+    def _retire_client(self):
+        """
+        Toglie di servizio il client corrente (con self.lock acquisito).
+        
+        Returns:
+            object: Client da chiudere subito, o None se ha chiamate in corso
+                (sarà chiuso dall'ultima di esse)
+        """
+        client = self.client
+        if client is None:
+            return None
+        if self._in_flight.get(self.generation):
+            self._retired[self.generation] = client
+            return None
+        return client
+    
+    def invalidate_session(self, generation=None):
+        """
+        Invalida la sessione corrente.
+        
+        Args:
+            generation (int, optional): Invalida solo se la sessione è ancora di questa
+                generazione (un errore su un client già sostituito non tocca quello nuovo)
+        """
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            to_close = self._retire_client()
             self.client = None
             self.session_valid = False
             self.last_login_time = None
+            self.generation += 1
+        if to_close is not None:
+            self._close_client(to_close)
+    
+    def _session_is_valid(self):
+        """Indica se la sessione corrente esiste e non è scaduta."""
+        login_time = self.last_login_time
+        if not self.session_valid or not self.client or not login_time:
+            return False
+        return (datetime.now() - login_time).total_seconds() <= self.session_validity_period
+    
+    def _login(self):
+        """
+        Effettua il login con un nuovo client e lo sostituisce a quello corrente
+        solo a login riuscito: fino ad allora le chiamate usano la sessione precedente.
+        
+        Returns:
+            bool: True se il login ha avuto successo, False altrimenti
+        """
+        logger.info("Inizializzazione sessione pyhfs...")
+        client = self._create_client()
+        if not client:
+            return False
+        
+        with self.lock:
+            to_close = self._retire_client()
+            self.generation += 1
+            self.client = client
+            self.session_valid = True
+            self.last_login_time = datetime.now()
+        if to_close is not None:
+            self._close_client(to_close)
+        logger.info("Sessione pyhfs inizializzata con successo")
+        return True
     
     def ensure_session(self):
         """
@@ -311,60 +579,171 @@ class PyHFSManager:
         Returns:
             bool: True se la sessione è valida, False altrimenti
         """
-        with self.lock:
-            # Verifica se la sessione è scaduta
-            if self.last_login_time:
-                elapsed = (datetime.now() - self.last_login_time).total_seconds()
-                if elapsed > self.session_validity_period:
-                    logger.info(f"Sessione scaduta (durata: {elapsed} secondi), richiesto nuovo login")
-                    self.invalidate_session()
-            
-            # Se la sessione non è valida, effettua un nuovo login
-            if not self.session_valid or not self.client:
-                logger.info("Inizializzazione sessione pyhfs...")
-                self.client = self._create_client()
-                if self.client:
-                    self.session_valid = True
-                    logger.info("Sessione pyhfs inizializzata con successo")
-                    return True
-                else:
-                    self.session_valid = False
-                    return False
+        # Percorso normale: la sessione è rinnovata in background prima della scadenza
+        if self._session_is_valid():
             return True
+        
+        # Nessuna sessione valida (primo avvio, scadenza o errore): login sincrono
+        with traced_lock(self.login_lock, "northbound.session"):
+            if self._session_is_valid():
+                return True
+            return self._login()
+    
+    def needs_refresh(self):
+        """
+        Indica se la sessione scade entro refresh_margin e va rinnovata in background.
+        
+        Returns:
+            bool: True se il rinnovo è dovuto
+        """
+        login_time = self.last_login_time
+        if not self.session_valid or not self.client or not login_time:
+            return False
+        age = (datetime.now() - login_time).total_seconds()
+        return age >= self.session_validity_period - self.refresh_margin
+    
+    def refresh(self):
+        """
+        Rinnova la sessione in anticipo; le chiamate continuano a usare quella
+        corrente finché la nuova non è pronta.
+        
+        Returns:
+            bool: True se la sessione è valida al termine del rinnovo
+        """
+        if not self.login_lock.acquire(blocking=False):
+            return True  # Login già in corso in un altro thread
+        try:
+            if not self.needs_refresh():
+                return True
+            logger.info("Rinnovo anticipato della sessione Northbound")
+            return self._login()
+        finally:
+            self.login_lock.release()
+    
+    def _load_station_cache(self):
+        """Carica i metadati delle stazioni salvati, se appartengono allo stesso account."""
+        if not self.metadata_file:
+            return
+        stored = load_json(self.metadata_file)
+        if not isinstance(stored, dict) or stored.get("version") != STATION_CACHE_VERSION:
+            return
+        if stored.get("account") != account_fingerprint(self.username):
+            logger.info("Metadati delle stazioni salvati appartenenti a un altro account, ignorati")
+            return
+        self._stations = stored.get("stations") or []
+        self._stations_fetched_at = stored.get("fetched_at", 0.0)
+        logger.info(f"Caricati dalla cache i metadati di {len(self._stations)} stazioni Northbound")
+    
+    def _save_station_cache(self):
+        """Salva i metadati delle stazioni su disco."""
+        if not self.metadata_file:
+            return
+        try:
+            atomic_write_json(self.metadata_file, {
+                "version": STATION_CACHE_VERSION,
+                "account": account_fingerprint(self.username),
+                "fetched_at": self._stations_fetched_at,
+                "stations": self._stations
+            })
+        except Exception as e:
+            logger.warning(f"Impossibile salvare i metadati delle stazioni: {e}")
+    
+    def _station_cache_valid(self):
+        """Indica se i metadati in cache esistono e non sono scaduti."""
+        if self._stations is None:
+            return False
+        now = time.time()
+        return now - self._stations_fetched_at < self.metadata_ttl or now < self._metadata_retry_at
     
-    def get_plant_list(self):
+    def invalidate_metadata(self):
         """
-        Ottiene la lista degli impianti.
+        Invalida la cache dei metadati delle stazioni: la prossima richiesta li rilegge
+        dall'API. I dati precedenti restano disponibili se la rilettura fallisce.
+        """
+        with self.metadata_lock:
+            self._stations_fetched_at = 0.0
+            self._metadata_retry_at = 0.0
+            self._save_station_cache()
+    
+    def _fetch_plant_list(self):
+        """
+        Richiede la lista degli impianti all'API Northbound.
         
         Returns:
-            list: Lista degli impianti o lista vuota in caso di errore
+            list: Lista degli impianti o None in caso di errore o lista vuota
         """
         if not self.ensure_session():
-            return []
+            return None
         
         try:
-            with self.lock:
-                plants = self.client.get_plant_list()
+            plants = self._call_client("get_plant_list")
             
-            if plants:
-                logger.info(f"Trovati {len(plants)} impianti")
-                for plant in plants:
-                    plant_id = plant.get("plantCode", "")
-                    plant_name = plant.get("plantName", "")
-                    capacity = plant.get("capacity", 0)
-                    logger.info(f"Impianto: {plant_name} (ID: {plant_id}, Capacità: {capacity} kWp)")
-            else:
+            if not plants:
                 logger.warning("Nessun impianto trovato")
+                return None
             
+            logger.info(f"Trovati {len(plants)} impianti")
+            for plant in plants:
+                logger.debug(f"Impianto: {plant.get('plantName', '')} (ID: {plant.get('plantCode', '')}, "
+                             f"Capacità: {plant.get('capacity', 0)} kWp)")
             return plants
         except pyhfs.FrequencyLimit as e:
             logger.warning(f"Limite di frequenza dell'API superato: {e}")
             # Non invalidiamo la sessione in questo caso
-            return []
+            return None
         except Exception as e:
             logger.error(f"Errore durante la richiesta della lista impianti: {e}")
-            self.invalidate_session()
-            return []
+            # Solo un errore di autenticazione invalida la sessione (vedi _call_client)
+            return None
+    
+    def get_plant_list(self, force_refresh=False):
+        """
+        Ottiene la lista degli impianti con i loro metadati, dalla cache se ancora valida.
+        
+        Args:
+            force_refresh (bool): Ignora la cache e rilegge la lista dall'API
+        
+        Returns:
+            list: Lista degli impianti (campi in STATION_METADATA_FIELDS) o lista vuota
+                se non disponibile
+        """
+        with self.metadata_lock:
+            if not force_refresh and self._station_cache_valid():
+                NORTHBOUND_METADATA_CACHE.labels("hit").inc()
+                return list(self._stations)
+            
+            plants = self._fetch_plant_list()
+            if plants is None:
+                # In caso di errore meglio i metadati scaduti che nessun dato
+                if self._stations:
+                    NORTHBOUND_METADATA_CACHE.labels("stale").inc()
+                    self._metadata_retry_at = time.time() + METADATA_RETRY_INTERVAL
+                    return list(self._stations)
+                return []
+            
+            NORTHBOUND_METADATA_CACHE.labels("refresh").inc()
+            self._stations = [
+                {field: plant.get(field) for field in STATION_METADATA_FIELDS}
+                for plant in plants
+            ]
+            self._stations_fetched_at = time.time()
+            self._save_station_cache()
+            return list(self._stations)
+    
+    def get_station(self, plant_code):
+        """
+        Restituisce i metadati di una stazione.
+        
+        Args:
+            plant_code (str): Codice della stazione
+        
+        Returns:
+            dict: Metadati della stazione o None se non trovata
+        """
+        for station in self.get_plant_list():
+            if station.get("plantCode") == plant_code:
+                return station
+        return None
     
     def get_plant_realtime_data(self, plant_ids):
         """
@@ -384,12 +763,11 @@ class PyHFSManager:
             return []
         
         try:
-            with self.lock:
-                logger.info(f"Richiesta dati in tempo reale per impianti: {plant_ids}")
-                realtime_data = self.client.get_plant_realtime_data(plant_ids)
+            logger.debug(f"Richiesta dati in tempo reale per impianti: {plant_ids}")
+            realtime_data = self._call_client("get_plant_realtime_data", plant_ids)
             
             if realtime_data:
-                logger.info(f"Dati in tempo reale ottenuti per {len(realtime_data)} impianti")
+                logger.debug(f"Dati in tempo reale ottenuti per {len(realtime_data)} impianti")
             else:
                 logger.warning(f"Nessun dato in tempo reale ricevuto")
             
@@ -400,7 +778,7 @@ class PyHFSManager:
             return []
         except Exception as e:
             logger.error(f"Errore durante la richiesta dei dati in tempo reale: {e}")
-            self.invalidate_session()
+            # Solo un errore di autenticazione invalida la sessione (vedi _call_client)
             return []
     
     def get_plant_hourly_data(self, plant_ids, date=None):
@@ -426,12 +804,11 @@ class PyHFSManager:
             if date is None:
                 date = datetime.now()
             
-            with self.lock:
-                logger.info(f"Richiesta dati orari per impianti: {plant_ids}, data: {date}")
-                hourly_data = self.client.get_plant_hourly_data(plant_ids, date)
+            logger.debug(f"Richiesta dati orari per impianti: {plant_ids}, data: {date}")
+            hourly_data = self._call_client("get_plant_hourly_data", plant_ids, date)
             
             if hourly_data:
-                logger.info(f"Dati orari ottenuti per {len(hourly_data)} elementi")
+                logger.debug(f"Dati orari ottenuti per {len(hourly_data)} elementi")
             else:
                 logger.warning(f"Nessun dato orario ricevuto")
             
@@ -442,7 +819,7 @@ class PyHFSManager:
             return []
         except Exception as e:
             logger.error(f"Errore durante la richiesta dei dati orari: {e}")
-            self.invalidate_session()
+            # Solo un errore di autenticazione invalida la sessione (vedi _call_client)
             return []
     
     def get_plant_daily_data(self, plant_ids, date=None):
@@ -468,12 +845,11 @@ class PyHFSManager:
             if date is None:
                 date = datetime.now()
             
-            with self.lock:
-                logger.info(f"Richiesta dati giornalieri per impianti: {plant_ids}, data: {date}")
-                daily_data = self.client.get_plant_daily_data(plant_ids, date)
+            logger.debug(f"Richiesta dati giornalieri per impianti: {plant_ids}, data: {date}")
+            daily_data = self._call_client("get_plant_daily_data", plant_ids, date)
             
             if daily_data:
-                logger.info(f"Dati giornalieri ottenuti per {len(daily_data)} elementi")
+                logger.debug(f"Dati giornalieri ottenuti per {len(daily_data)} elementi")
             else:
                 logger.warning(f"Nessun dato giornaliero ricevuto")
             
@@ -484,5 +860,5 @@ class PyHFSManager:
             return []
         except Exception as e:
             logger.error(f"Errore durante la richiesta dei dati giornalieri: {e}")
-            self.invalidate_session()
+            # Solo un errore di autenticazione invalida la sessione (vedi _call_client)
             return []
\ No newline at end of file
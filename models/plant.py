@@ -1,26 +1,112 @@
 """
 Modello base per gli impianti fotovoltaici.
 Definisce l'interfaccia comune a tutti i tipi di impianti.
+
+Gli impianti usano __slots__ e memorizzano stato e orari in forma compatta (codice intero
+e timestamp epoch): con migliaia di impianti riduce la memoria per impianto e il costo di
+to_dict(). Le sottoclassi devono dichiarare i propri __slots__.
 """
+import time
 from datetime import datetime
+from enum import IntEnum
+
+
+class PlantStatus(IntEnum):
+    """Codici di stato di un impianto (vedi Plant.update_status)."""
+    NON_INIZIALIZZATO = 0
+    ONLINE = 1
+    INATTIVO = 2
+    ERRORE = 3
+    OFFLINE = 4
+
+    @property
+    def label(self):
+        """Etichetta mostrata nell'interfaccia e restituita dalle API."""
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        """
+        Restituisce il codice di uno stato a partire dall'etichetta.
+
+        Raises:
+            ValueError: Se l'etichetta non corrisponde a nessuno stato
+        """
+        try:
+            return _STATUS_BY_LABEL[label]
+        except KeyError:
+            raise ValueError(f"Stato impianto non valido: {label}")
+
+
+STATUS_LABELS = ("Non inizializzato", "Online", "Inattivo", "Errore", "OFFLINE")
+_STATUS_BY_LABEL = {label: PlantStatus(code) for code, label in enumerate(STATUS_LABELS)}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class Plant:
     """Classe base per rappresentare un impianto fotovoltaico."""
     
-    def __init__(self, name, plant_id, plant_type):
+    __slots__ = (
+        "name", "id", "type", "provider", "group", "account",
+        "power", "energy_today", "status_code", "is_online", "error_message",
+        "last_update_ts", "last_successful_check_ts", "_last_update_text",
+        "connection_retry_count", "max_retries", "consecutive_failures", "stale"
+    )
+    
+    def __init__(self, name, plant_id, plant_type, provider=None, group=None, account=None):
         self.name = name
         self.id = plant_id
         self.type = plant_type
+        self.provider = provider or plant_type  # Fornitore cloud (es. FusionSolar per entrambe le API)
+        self.group = group  # Gruppo logico opzionale definito in configurazione
+        self.account = account  # Account del fornitore (vedi services.accounts)
         self.power = 0.0
         self.energy_today = 0.0  # Manteniamo il campo ma non lo mostriamo nell'UI
-        self.status = "Non inizializzato"
-        self.last_update = None
+        self.status_code = PlantStatus.NON_INIZIALIZZATO
+        self.last_update_ts = None  # Epoch dell'ultimo aggiornamento
+        self._last_update_text = "Mai"  # last_update già formattato per to_dict
         self.is_online = False
         self.error_message = None
         self.connection_retry_count = 0
         self.max_retries = 3
         self.consecutive_failures = 0
-        self.last_successful_check = None
+        self.last_successful_check_ts = None  # Epoch dell'ultimo controllo riuscito
+        self.stale = False  # True se lo stato è stato ripristinato da snapshot e non ancora aggiornato
+    
+    @property
+    def status(self):
+        """Etichetta dello stato (es. "Online")."""
+        return STATUS_LABELS[self.status_code]
+    
+    @status.setter
+    def status(self, value):
+        self.status_code = value if isinstance(value, PlantStatus) else PlantStatus.from_label(value)
+    
+    @property
+    def last_update(self):
+        """Data e ora dell'ultimo aggiornamento, o None."""
+        return datetime.fromtimestamp(self.last_update_ts) if self.last_update_ts is not None else None
+    
+    @last_update.setter
+    def last_update(self, value):
+        self._set_last_update(value.timestamp() if value is not None else None)
+    
+    @property
+    def last_successful_check(self):
+        """Data e ora dell'ultimo controllo riuscito, o None."""
+        return (datetime.fromtimestamp(self.last_successful_check_ts)
+                if self.last_successful_check_ts is not None else None)
+    
+    @last_successful_check.setter
+    def last_successful_check(self, value):
+        self.last_successful_check_ts = value.timestamp() if value is not None else None
+    
+    def _set_last_update(self, timestamp):
+        """Imposta l'orario dell'ultimo aggiornamento e la sua forma testuale."""
+        self.last_update_ts = timestamp
+        self._last_update_text = (time.strftime(TIMESTAMP_FORMAT, time.localtime(timestamp))
+                                  if timestamp is not None else "Mai")
     
     def update_status(self, power, energy_today, is_online, error_message=None):
         """
@@ -37,20 +123,21 @@ class Plant:
         """
         self.power = power
         self.energy_today = energy_today
-        self.last_update = datetime.now()
+        self._set_last_update(time.time())
         self.is_online = is_online
         self.error_message = error_message
+        self.stale = False
         
         if is_online:
-            self.status = "Online" if power > 0 else "Inattivo"
+            self.status_code = PlantStatus.ONLINE if power > 0 else PlantStatus.INATTIVO
             self.consecutive_failures = 0
-            self.last_successful_check = self.last_update
+            self.last_successful_check_ts = self.last_update_ts
         else:
             self.consecutive_failures += 1
             if self.consecutive_failures >= self.max_retries:
-                self.status = "OFFLINE"
+                self.status_code = PlantStatus.OFFLINE
             else:
-                self.status = "Errore"
+                self.status_code = PlantStatus.ERRORE
         
         return is_online
     
@@ -65,15 +152,56 @@ class Plant:
             "name": self.name,
             "id": self.id,
             "type": self.type,
+            "provider": self.provider,
+            "group": self.group,
+            "account": self.account,
             "power": round(self.power, 2),
             "energy_today": round(self.energy_today, 2),  # Manteniamo il campo per i calcoli backend
-            "status": self.status,
+            "status": STATUS_LABELS[self.status_code],
             "is_online": self.is_online,
-            "last_update": self.last_update.strftime("%Y-%m-%d %H:%M:%S") if self.last_update else "Mai",
+            "last_update": self._last_update_text,
             "error_message": self.error_message,
-            "consecutive_failures": self.consecutive_failures
+            "consecutive_failures": self.consecutive_failures,
+            "stale": self.stale
         }
     
+    def to_snapshot(self):
+        """
+        Restituisce lo stato dinamico dell'impianto in forma compatta per lo snapshot.
+        
+        Returns:
+            list: Valori dello stato (vedi restore_snapshot)
+        """
+        return [
+            self.power,
+            self.energy_today,
+            STATUS_LABELS[self.status_code],
+            self.is_online,
+            self.last_update_ts,
+            self.error_message,
+            self.consecutive_failures,
+            self.last_successful_check_ts
+        ]
+    
+    def restore_snapshot(self, data):
+        """
+        Ripristina lo stato salvato con to_snapshot e lo marca come non aggiornato.
+        
+        Args:
+            data (list): Valori restituiti da to_snapshot
+        """
+        (power, energy_today, status, is_online, last_update,
+         error_message, consecutive_failures, last_successful_check) = data
+        self.power = float(power)
+        self.energy_today = float(energy_today)
+        self.status_code = PlantStatus.from_label(status)
+        self.is_online = bool(is_online)
+        self._set_last_update(float(last_update) if last_update else None)
+        self.error_message = error_message
+        self.consecutive_failures = int(consecutive_failures)
+        self.last_successful_check_ts = float(last_successful_check) if last_successful_check else None
+        self.stale = True
+    
     def check_connection(self):
         """
         Verifica la connessione all'impianto e aggiorna i dati.
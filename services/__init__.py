@@ -1,8 +1,15 @@
 """
 Package per i servizi del sistema di monitoraggio fotovoltaico.
 """
-# Utilizziamo import assoluti invece di relativi
-from services.plant_manager import PlantManager
-from services.session_managers import AuroraSessionManager, FusionSolarClientManager
+# Gli import sono risolti al primo accesso: i moduli in models possono così usare
+# servizi trasversali (es. services.metrics) senza creare import circolari
+__all__ = ['PlantManager', 'AuroraSessionManager', 'FusionSolarClientManager']
 
-__all__ = ['PlantManager', 'AuroraSessionManager', 'FusionSolarClientManager']
\ No newline at end of file
+def __getattr__(name):
+    if name == 'PlantManager':
+        from services.plant_manager import PlantManager
+        return PlantManager
+    if name in ('AuroraSessionManager', 'FusionSolarClientManager'):
+        from services import session_managers
+        return getattr(session_managers, name)
+    raise AttributeError(f"module 'services' has no attribute '{name}'")
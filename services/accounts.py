@@ -0,0 +1,193 @@
+"""
+Registro degli account dei fornitori.
+
+Ogni set di credenziali è un account con il proprio gestore di sessione (e quindi il
+proprio pool di connessioni) e un budget di controlli contemporanei: gli impianti sono
+raggruppati per account, così concorrenza e limiti di frequenza si applicano per account.
+"""
+import re
+import threading
+
+# Nome dell'account definito nella sezione [CREDENTIALS] dei file di configurazione
+DEFAULT_ACCOUNT = "default"
+
+# Prefisso delle sezioni di configurazione degli account aggiuntivi ([ACCOUNT:<nome>])
+ACCOUNT_SECTION_PREFIX = "ACCOUNT:"
+
+# Controlli contemporanei ammessi per account, se non configurato
+DEFAULT_ACCOUNT_CONCURRENCY = 4
+
+
+def account_sections(config):
+    """
+    Restituisce le sezioni degli account aggiuntivi di un file di configurazione.
+
+    Args:
+        config (ConfigParser): Configurazione letta
+
+    Returns:
+        list: Coppie (nome account, nome sezione)
+    """
+    return [
+        (section[len(ACCOUNT_SECTION_PREFIX):].strip(), section)
+        for section in config.sections()
+        if section.startswith(ACCOUNT_SECTION_PREFIX) and section[len(ACCOUNT_SECTION_PREFIX):].strip()
+    ]
+
+
+def account_file_name(prefix, account_name, extension=".json"):
+    """
+    Restituisce il nome del file di stato di un account (sessione, cache...).
+    L'account predefinito mantiene il nome storico senza suffisso.
+
+    Args:
+        prefix (str): Prefisso del file (es. aurora_session)
+        account_name (str): Nome dell'account
+        extension (str): Estensione del file
+
+    Returns:
+        str: Nome del file
+    """
+    if account_name == DEFAULT_ACCOUNT:
+        return f"{prefix}{extension}"
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", account_name).strip("_") or "account"
+    return f"{prefix}_{slug}{extension}"
+
+
+class Account:
+    """
+    Set di credenziali di un fornitore con il proprio gestore di sessione.
+    """
+
+    def __init__(self, name, provider, session_manager, max_concurrent_checks=DEFAULT_ACCOUNT_CONCURRENCY):
+        """
+        Args:
+            name (str): Nome dell'account
+            provider (str): Fornitore (es. AuroraVision, FusionSolar)
+            session_manager: Gestore di sessione dell'account
+            max_concurrent_checks (int): Impianti dell'account controllabili in parallelo
+        """
+        self.name = name
+        self.provider = provider
+        self.session_manager = session_manager
+        self.max_concurrent_checks = max(1, max_concurrent_checks)
+        self.plant_keys = []
+
+    @property
+    def key(self):
+        """Identificativo univoco dell'account (fornitore:nome)."""
+        return f"{self.provider}:{self.name}"
+
+
+class AccountRegistry:
+    """
+    Registro degli account e dell'associazione impianto -> account.
+    """
+
+    def __init__(self):
+        self._accounts = {}
+        self._plant_accounts = {}
+        self._lock = threading.Lock()
+
+    def add(self, account):
+        """
+        Registra un account.
+
+        Args:
+            account (Account): Account da registrare
+
+        Raises:
+            ValueError: Se un account con lo stesso fornitore e nome è già registrato
+        """
+        with self._lock:
+            if account.key in self._accounts:
+                raise ValueError(f"Account già registrato: {account.key}")
+            self._accounts[account.key] = account
+
+    def get(self, provider, name):
+        """
+        Restituisce un account.
+
+        Args:
+            provider (str): Fornitore
+            name (str): Nome dell'account
+
+        Returns:
+            Account: Account o None se non registrato
+        """
+        return self._accounts.get(f"{provider}:{name}")
+
+    def assign(self, plant_key, account):
+        """
+        Associa un impianto a un account.
+
+        Args:
+            plant_key (str): Chiave dell'impianto
+            account (Account): Account dell'impianto
+        """
+        with self._lock:
+            previous = self._plant_accounts.get(plant_key)
+            if previous is not None and plant_key in previous.plant_keys:
+                previous.plant_keys.remove(plant_key)
+            account.plant_keys.append(plant_key)
+            self._plant_accounts[plant_key] = account
+
+    def account_for(self, plant_key):
+        """
+        Restituisce l'account di un impianto.
+
+        Args:
+            plant_key (str): Chiave dell'impianto
+
+        Returns:
+            Account: Account o None se l'impianto non è associato
+        """
+        return self._plant_accounts.get(plant_key)
+
+    def by_provider(self, provider):
+        """
+        Restituisce gli account di un fornitore.
+
+        Args:
+            provider (str): Fornitore
+
+        Returns:
+            list: Account del fornitore
+        """
+        return [account for account in list(self._accounts.values()) if account.provider == provider]
+
+    def lanes(self, plant_keys, batch_size=None):
+        """
+        Suddivide gli impianti in corsie di controllo: ogni account ha al massimo
+        max_concurrent_checks corsie, gli impianti di una corsia sono controllati in sequenza.
+        Con batch_size gli impianti sono distribuiti tra le corsie a lotti contigui, così
+        ogni corsia si divide in lotti completi. Gli impianti senza account formano una corsia ciascuno.
+
+        Args:
+            plant_keys (iterable): Chiavi degli impianti da controllare
+            batch_size (callable, optional): Funzione account -> impianti per lotto. Default 1.
+
+        Returns:
+            list: Liste di chiavi, una per corsia
+        """
+        grouped = {}
+        lanes = []
+        for plant_key in plant_keys:
+            account = self._plant_accounts.get(plant_key)
+            if account is None:
+                lanes.append([plant_key])
+            else:
+                grouped.setdefault(account.key, (account, []))[1].append(plant_key)
+
+        for account, keys in grouped.values():
+            size = max(1, batch_size(account)) if batch_size else 1
+            batches = [keys[i:i + size] for i in range(0, len(keys), size)]
+            count = min(account.max_concurrent_checks, len(batches))
+            lanes.extend([key for batch in batches[i::count] for key in batch] for i in range(count))
+        return lanes
+
+    def __iter__(self):
+        return iter(list(self._accounts.values()))
+
+    def __len__(self):
+        return len(self._accounts)
@@ -0,0 +1,136 @@
+"""
+Risolutore CAPTCHA condiviso per i login FusionSolar.
+
+Il modello ONNX è caricato una sola volta, al primo CAPTCHA effettivamente richiesto,
+e condiviso da tutti i client (e gli account) che usano lo stesso file di modello.
+Ogni inferenza è misurata e attribuita al tentativo di login in corso nel thread.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CAPTCHA_SOLVES = registry.counter(
+    "ssem_captcha_solves_total",
+    "Numero di CAPTCHA risolti con il modello ONNX per esito",
+    ["result"]
+)
+CAPTCHA_INFERENCE_DURATION = registry.histogram(
+    "ssem_captcha_inference_duration_seconds",
+    "Durata dell'inferenza del modello CAPTCHA"
+)
+CAPTCHA_MODEL_LOAD_DURATION = registry.gauge(
+    "ssem_captcha_model_load_seconds",
+    "Durata del caricamento del modello CAPTCHA ONNX"
+)
+
+_solvers = {}
+_solvers_lock = threading.Lock()
+_usage = threading.local()
+
+
+class CaptchaUsage:
+    """CAPTCHA risolti e tempo di inferenza di un tentativo di login."""
+
+    __slots__ = ("count", "inference_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.inference_seconds = 0.0
+
+
+@contextmanager
+def captcha_usage():
+    """
+    Raccoglie i CAPTCHA risolti nel thread corrente durante il blocco (un tentativo di login).
+
+    Yields:
+        CaptchaUsage: Contatori del tentativo
+    """
+    previous = getattr(_usage, "current", None)
+    usage = CaptchaUsage()
+    _usage.current = usage
+    try:
+        yield usage
+    finally:
+        _usage.current = previous
+
+
+class SharedCaptchaSolver:
+    """
+    Risolutore con lo stesso metodo solve_captcha del Solver di fusion_solar_py,
+    che carica il modello solo al primo utilizzo.
+    """
+
+    def __init__(self, model_path, device=None):
+        """
+        Args:
+            model_path (str): Percorso del modello ONNX
+            device (list, optional): Execution provider di onnxruntime
+        """
+        self.model_path = model_path
+        self.device = device
+        self._solver = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Carica il modello ONNX (una sola volta anche con più thread)."""
+        with self._lock:
+            if self._solver is None:
+                from fusion_solar_py.captcha_solver_onnx import Solver
+                start = time.perf_counter()
+                self._solver = Solver(self.model_path, self.device)
+                duration = time.perf_counter() - start
+                CAPTCHA_MODEL_LOAD_DURATION.set(duration)
+                logger.info(f"Modello CAPTCHA caricato in {duration:.2f} secondi: {self.model_path}")
+            return self._solver
+
+    def solve_captcha(self, img):
+        """
+        Risolve un CAPTCHA misurando il tempo di inferenza.
+
+        Args:
+            img: Immagine del CAPTCHA (bytes o array)
+
+        Returns:
+            str: Testo del CAPTCHA
+        """
+        solver = self._solver or self._load()
+        start = time.perf_counter()
+        result = "error"
+        try:
+            text = solver.solve_captcha(img)
+            result = "success"
+            return text
+        finally:
+            duration = time.perf_counter() - start
+            CAPTCHA_INFERENCE_DURATION.observe(duration)
+            CAPTCHA_SOLVES.labels(result).inc()
+            usage = getattr(_usage, "current", None)
+            if usage is not None:
+                usage.count += 1
+                usage.inference_seconds += duration
+
+
+def get_solver(model_path, device=None):
+    """
+    Restituisce il risolutore condiviso per un modello.
+
+    Args:
+        model_path (str): Percorso del modello ONNX
+        device (list, optional): Execution provider di onnxruntime
+
+    Returns:
+        SharedCaptchaSolver: Risolutore condiviso
+    """
+    key = (os.path.abspath(model_path), tuple(device) if device else None)
+    with _solvers_lock:
+        solver = _solvers.get(key)
+        if solver is None:
+            solver = _solvers[key] = SharedCaptchaSolver(key[0], device)
+        return solver
@@ -0,0 +1,243 @@
+"""
+Bus degli eventi di transizione di stato degli impianti.
+
+Il PlantManager confronta lo stato di ogni impianto prima e dopo il controllo e pubblica
+un evento solo per le transizioni (online, offline, potenza a zero, errore cambiato):
+dashboard (SSE), allarmi, log e metriche reagiscono ai cambiamenti invece di
+riesaminare tutti gli impianti.
+
+Ogni sottoscrittore ha la propria coda limitata: la pubblicazione non si blocca mai e,
+se un sottoscrittore è troppo lento, vengono scartati i suoi eventi più vecchi.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Tipi di evento
+PLANT_ONLINE = "plant.online"  # L'impianto torna a rispondere
+PLANT_OFFLINE = "plant.offline"  # L'impianto smette di rispondere (stato Errore o OFFLINE)
+PLANT_POWER_ZERO = "plant.power_zero"  # Impianto online la cui potenza scende a zero
+PLANT_ERROR_CHANGED = "plant.error_changed"  # Messaggio di errore cambiato (o risolto)
+EVENT_TYPES = (PLANT_ONLINE, PLANT_OFFLINE, PLANT_POWER_ZERO, PLANT_ERROR_CHANGED)
+
+DEFAULT_QUEUE_SIZE = 1000
+
+EVENTS_PUBLISHED = registry.counter(
+    "ssem_plant_events_total",
+    "Numero di eventi di transizione degli impianti per tipo",
+    ["type"]
+)
+EVENTS_DROPPED = registry.counter(
+    "ssem_plant_events_dropped_total",
+    "Eventi scartati perché la coda di un sottoscrittore era piena",
+    ["subscriber"]
+)
+EVENT_SUBSCRIBERS = registry.gauge(
+    "ssem_plant_event_subscribers",
+    "Numero di sottoscrittori del bus degli eventi"
+)
+
+
+class PlantEvent:
+    """Transizione di stato di un impianto."""
+
+    __slots__ = ("id", "type", "plant_key", "plant_name", "timestamp", "previous", "current")
+
+    def __init__(self, event_id, event_type, plant_key, plant_name, previous, current):
+        self.id = event_id
+        self.type = event_type
+        self.plant_key = plant_key
+        self.plant_name = plant_name
+        self.timestamp = time.time()
+        self.previous = previous  # Stato prima del controllo (dict)
+        self.current = current  # Stato dopo il controllo (dict)
+
+    def to_dict(self):
+        """Converte l'evento in un dizionario serializzabile in JSON."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "plant": self.plant_key,
+            "name": self.plant_name,
+            "timestamp": self.timestamp,
+            "previous": self.previous,
+            "current": self.current
+        }
+
+
+class Subscription:
+    """Coda limitata degli eventi destinati a un sottoscrittore."""
+
+    def __init__(self, bus, name, types, maxsize):
+        self.bus = bus
+        self.name = name
+        self.types = frozenset(types) if types else None
+        self.queue = queue.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+
+    def _offer(self, event):
+        """Accoda un evento senza bloccare, scartando il più vecchio se la coda è piena."""
+        if self.types is not None and event.type not in self.types:
+            return
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                    EVENTS_DROPPED.labels(self.name).inc()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """
+        Restituisce il prossimo evento.
+
+        Args:
+            timeout (float, optional): Secondi massimi di attesa. Default attesa illimitata.
+
+        Returns:
+            PlantEvent: Evento, o None se il timeout è scaduto
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Annulla la sottoscrizione."""
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class EventBus:
+    """Bus in-process con distribuzione a tutti i sottoscrittori."""
+
+    def __init__(self):
+        self._subscriptions = ()  # Tupla sostituita a ogni modifica: publish non prende lock
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, name="subscriber", types=None, maxsize=DEFAULT_QUEUE_SIZE):
+        """
+        Crea una sottoscrizione.
+
+        Args:
+            name (str): Nome del sottoscrittore (per le metriche)
+            types (iterable, optional): Tipi di evento da ricevere. Default tutti.
+            maxsize (int): Eventi conservati se il sottoscrittore non li consuma
+
+        Returns:
+            Subscription: Sottoscrizione (da chiudere con close())
+        """
+        subscription = Subscription(self, name, types, maxsize)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+            EVENT_SUBSCRIBERS.set(len(self._subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Rimuove una sottoscrizione."""
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+            EVENT_SUBSCRIBERS.set(len(self._subscriptions))
+
+    def add_listener(self, func, name="listener", types=None, maxsize=DEFAULT_QUEUE_SIZE):
+        """
+        Esegue una funzione per ogni evento in un thread dedicato, così un ascoltatore
+        lento non rallenta il monitoraggio.
+
+        Args:
+            func (callable): Funzione che riceve il PlantEvent
+            name (str): Nome dell'ascoltatore
+            types (iterable, optional): Tipi di evento da ricevere. Default tutti.
+            maxsize (int): Eventi conservati se l'ascoltatore è in ritardo
+
+        Returns:
+            Subscription: Sottoscrizione dell'ascoltatore (close() lo ferma)
+        """
+        subscription = self.subscribe(name, types, maxsize)
+
+        def run():
+            while subscription in self._subscriptions:
+                event = subscription.get(timeout=1)
+                if event is None:
+                    continue
+                try:
+                    func(event)
+                except Exception as e:
+                    logger.error(f"Errore nell'ascoltatore di eventi {name}: {e}")
+
+        threading.Thread(target=run, name=f"events-{name}", daemon=True).start()
+        return subscription
+
+    def publish(self, event_type, plant_key, plant_name, previous, current):
+        """
+        Pubblica un evento a tutti i sottoscrittori (non blocca mai).
+
+        Returns:
+            PlantEvent: Evento pubblicato
+        """
+        event = PlantEvent(next(self._ids), event_type, plant_key, plant_name, previous, current)
+        EVENTS_PUBLISHED.labels(event_type).inc()
+        for subscription in self._subscriptions:
+            subscription._offer(event)
+        return event
+
+
+def plant_state(plant):
+    """
+    Restituisce lo stato di un impianto confrontato per rilevare le transizioni.
+
+    Args:
+        plant (Plant): Impianto
+
+    Returns:
+        dict: Stato (is_online, status, power, error_message)
+    """
+    return {
+        "is_online": plant.is_online,
+        "status": plant.status,
+        "power": round(plant.power, 2),
+        "error_message": plant.error_message
+    }
+
+
+def transitions(previous, current):
+    """
+    Restituisce i tipi di evento corrispondenti al passaggio tra due stati.
+
+    Args:
+        previous (dict): Stato prima del controllo (plant_state)
+        current (dict): Stato dopo il controllo (plant_state)
+
+    Returns:
+        list: Tipi di evento
+    """
+    events = []
+    if current["is_online"] and not previous["is_online"]:
+        events.append(PLANT_ONLINE)
+    elif previous["is_online"] and not current["is_online"]:
+        events.append(PLANT_OFFLINE)
+    elif current["is_online"] and previous["power"] > 0 and current["power"] <= 0:
+        events.append(PLANT_POWER_ZERO)
+    if current["error_message"] != previous["error_message"]:
+        events.append(PLANT_ERROR_CHANGED)
+    return events
+
+
+# Bus condiviso dal processo (sopravvive alla ricarica del PlantManager)
+bus = EventBus()
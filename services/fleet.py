@@ -0,0 +1,241 @@
+"""
+Snapshot immutabili dello stato della flotta di impianti.
+
+Il monitoraggio modifica gli oggetti Plant dai thread di polling; le richieste HTTP non li
+leggono mai direttamente. Dopo ogni controllo il thread che ha aggiornato l'impianto ne
+produce un PlantRecord (copia dei valori), e il PlantManager pubblica periodicamente un
+nuovo FleetSnapshot costruito dai record, sostituendo il riferimento con una semplice
+assegnazione (atomica in Python). I lettori prendono il riferimento corrente e lavorano
+su quello senza lock: vedono sempre lo stato di un'unica pubblicazione e non bloccano il
+polling. Gli snapshot non più referenziati sono liberati dal garbage collector; i record
+degli impianti non cambiati sono condivisi tra snapshot successivi, così come i gruppi
+degli indici e i totali: una pubblicazione ricostruisce solo i gruppi in cui un impianto
+è entrato o da cui è uscito, e aggiorna conteggi e potenza totale per differenza.
+"""
+import time
+from types import MappingProxyType
+
+# Campi indicizzati per il filtraggio e campi ammessi per l'ordinamento
+INDEXED_FIELDS = ("status", "type", "provider", "group", "account")
+SORT_FIELDS = ("id", "name", "power", "last_update")
+
+# Stati (minuscoli) in cui la potenza dell'impianto contribuisce al totale
+POWER_STATUSES = ("online", "inattivo")
+
+# Lo snapshot è ricostruito da zero se cambia più di questa frazione degli impianti, e
+# comunque ogni FULL_REBUILD_VERSIONS pubblicazioni (azzera l'errore di arrotondamento
+# accumulato dalla potenza totale aggiornata per differenza)
+FULL_REBUILD_RATIO = 0.5
+FULL_REBUILD_VERSIONS = 1000
+
+
+class PlantRecord:
+    """Copia immutabile dello stato di un impianto in un certo istante."""
+
+    __slots__ = ("data", "power", "last_update_ts", "index_values")
+
+    def __init__(self, plant):
+        """
+        Args:
+            plant (Plant): Impianto da copiare (letto dal thread che lo aggiorna)
+        """
+        self.data = MappingProxyType(plant.to_dict())
+        self.power = float(plant.power)
+        self.last_update_ts = plant.last_update_ts or 0.0
+        self.index_values = tuple(
+            str(self.data[field]).lower() if self.data[field] is not None else None
+            for field in INDEXED_FIELDS
+        )
+
+
+class FleetSnapshot:
+    """Stato di tutti gli impianti a una pubblicazione, con indici e totali precalcolati."""
+
+    __slots__ = ("version", "created_at", "records", "indexes", "status_counts",
+                 "total_power", "stale_count")
+
+    def __init__(self, version=0, records=None):
+        """
+        Args:
+            version (int): Numero progressivo della pubblicazione
+            records (dict, optional): Chiave impianto -> PlantRecord
+        """
+        self.version = version
+        self.created_at = time.time()
+        self.records = MappingProxyType(records or {})
+
+        indexes = {field: {} for field in INDEXED_FIELDS}
+        total_power = 0.0
+        stale_count = 0
+        for plant_key, record in self.records.items():
+            for field, value in zip(INDEXED_FIELDS, record.index_values):
+                if value is not None:
+                    indexes[field].setdefault(value, []).append(plant_key)
+            if record.index_values[0] in POWER_STATUSES:
+                total_power += record.power
+            if record.data["stale"]:
+                stale_count += 1
+
+        # Indici secondari: campo -> valore (minuscolo) -> insieme di chiavi impianto
+        self.indexes = MappingProxyType({
+            field: MappingProxyType({value: frozenset(keys) for value, keys in index.items()})
+            for field, index in indexes.items()
+        })
+        self.status_counts = MappingProxyType({
+            status: len(keys) for status, keys in self.indexes["status"].items()
+        })
+        self.total_power = total_power
+        self.stale_count = stale_count
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, plant_key):
+        """
+        Restituisce i dati di un impianto.
+
+        Args:
+            plant_key (str): Chiave dell'impianto
+
+        Returns:
+            dict: Copia dei dati dell'impianto o None se non trovato
+        """
+        record = self.records.get(plant_key)
+        return dict(record.data) if record else None
+
+    def to_dict(self):
+        """
+        Restituisce i dati di tutti gli impianti.
+
+        Returns:
+            dict: Dizionario chiave impianto -> dati (copie)
+        """
+        return {plant_key: dict(record.data) for plant_key, record in self.records.items()}
+
+    def filter_keys(self, filters):
+        """
+        Restituisce le chiavi degli impianti che soddisfano i filtri usando gli indici.
+        Ogni filtro può contenere più valori separati da virgola (in OR tra loro).
+
+        Args:
+            filters (dict): Dizionario campo -> valore
+
+        Returns:
+            set: Chiavi degli impianti corrispondenti
+        """
+        candidate_sets = []
+        for field, value in filters.items():
+            if value is None or value == "":
+                continue
+            index = self.indexes[field]
+            matches = set()
+            for item in str(value).split(","):
+                matches |= index.get(item.strip().lower(), frozenset())
+            candidate_sets.append(matches)
+
+        if not candidate_sets:
+            return set(self.records.keys())
+
+        # Interseca partendo dall'insieme più piccolo
+        candidate_sets.sort(key=len)
+        result = candidate_sets[0]
+        for matches in candidate_sets[1:]:
+            result &= matches
+            if not result:
+                break
+        return result
+
+    def sort_value(self, plant_key, sort):
+        """Restituisce il valore di ordinamento di un impianto."""
+        record = self.records[plant_key]
+        if sort == "power":
+            return record.power
+        if sort == "last_update":
+            return record.last_update_ts
+        if sort == "name":
+            return str(record.data["name"]).lower()
+        return plant_key
+
+    def keys_by_status(self, *statuses):
+        """
+        Restituisce le chiavi degli impianti con uno degli stati indicati.
+
+        Args:
+            *statuses (str): Stati da includere (es. "Online", "Inattivo")
+
+        Returns:
+            set: Chiavi degli impianti corrispondenti
+        """
+        keys = set()
+        for status in statuses:
+            keys |= self.indexes["status"].get(status.lower(), frozenset())
+        return keys
+
+    def updated(self, changes):
+        """
+        Restituisce lo snapshot successivo con i record cambiati (questo resta invariato).
+        Oltre alla copia superficiale del dizionario dei record, il costo è proporzionale ai
+        record cambiati e ai gruppi degli indici che toccano: gli altri gruppi sono condivisi.
+
+        Args:
+            changes (dict): Chiave impianto -> PlantRecord aggiornato
+
+        Returns:
+            FleetSnapshot: Nuovo snapshot
+        """
+        version = self.version + 1
+        records = dict(self.records)
+        records.update(changes)
+        if len(changes) > len(self.records) * FULL_REBUILD_RATIO or version % FULL_REBUILD_VERSIONS == 0:
+            return FleetSnapshot(version, records)
+
+        # Chiavi che entrano ed escono da ogni gruppo: campo -> valore -> (aggiunte, rimosse)
+        moves = {field: {} for field in INDEXED_FIELDS}
+        total_power = self.total_power
+        stale_count = self.stale_count
+        for plant_key, record in changes.items():
+            previous = self.records.get(plant_key)
+            old_values = previous.index_values if previous else (None,) * len(INDEXED_FIELDS)
+            for field, old, new in zip(INDEXED_FIELDS, old_values, record.index_values):
+                if old == new:
+                    continue
+                if old is not None:
+                    moves[field].setdefault(old, (set(), set()))[1].add(plant_key)
+                if new is not None:
+                    moves[field].setdefault(new, (set(), set()))[0].add(plant_key)
+            if previous is not None:
+                if previous.index_values[0] in POWER_STATUSES:
+                    total_power -= previous.power
+                stale_count -= bool(previous.data["stale"])
+            if record.index_values[0] in POWER_STATUSES:
+                total_power += record.power
+            stale_count += bool(record.data["stale"])
+
+        indexes = {}
+        for field, index in self.indexes.items():
+            if not moves[field]:
+                indexes[field] = index
+                continue
+            buckets = dict(index)
+            for value, (added, removed) in moves[field].items():
+                keys = (buckets.get(value, frozenset()) - removed) | added
+                if keys:
+                    buckets[value] = frozenset(keys)
+                else:
+                    del buckets[value]
+            indexes[field] = MappingProxyType(buckets)
+
+        snapshot = FleetSnapshot.__new__(FleetSnapshot)
+        snapshot.version = version
+        snapshot.created_at = time.time()
+        snapshot.records = MappingProxyType(records)
+        snapshot.indexes = MappingProxyType(indexes)
+        if moves["status"]:
+            snapshot.status_counts = MappingProxyType({
+                status: len(keys) for status, keys in indexes["status"].items()
+            })
+        else:
+            snapshot.status_counts = self.status_counts
+        snapshot.total_power = max(total_power, 0.0)
+        snapshot.stale_count = stale_count
+        return snapshot
@@ -0,0 +1,184 @@
+"""
+Sessioni HTTP con pool di connessioni e tentativi automatici per le API dei fornitori.
+
+Ogni sessione monta un adapter con un pool per host dimensionato sulla concorrenza
+del polling (per default [POLLING] max_workers, il massimo di controlli contemporanei
+di un account): le connessioni (e le relative sessioni TLS) restano aperte in keep-alive
+e vengono riusate invece di ripetere l'handshake a ogni richiesta. Solo le richieste
+idempotenti (GET, HEAD, OPTIONS) sono ripetute automaticamente con backoff.
+"""
+import logging
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Impostazioni predefinite (sezione [HTTP] di ssem_config.ini)
+DEFAULT_HTTP_SETTINGS = {
+    "pool_connections": 10,  # Numero di host con pool dedicato per sessione
+    "pool_maxsize": 16,  # Connessioni per host (se non impostato, [POLLING] max_workers)
+    "pool_block": False,  # Se True, oltre pool_maxsize le richieste attendono una connessione libera
+    "max_retries": 3,
+    "backoff_factor": 0.5,  # Attese di 0.5, 1, 2... secondi tra i tentativi
+}
+
+# Codici di stato per cui una richiesta idempotente viene ripetuta
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+settings = dict(DEFAULT_HTTP_SETTINGS)
+
+# Adapter creati, per le statistiche dei pool (riferimenti deboli: seguono la vita delle sessioni)
+_adapters = weakref.WeakSet()
+_adapters_lock = threading.Lock()
+
+HTTP_POOL_CONNECTIONS = registry.gauge(
+    "ssem_http_pool_connections_created",
+    "Connessioni aperte finora dal pool per fornitore e host",
+    ["provider", "host"]
+)
+HTTP_POOL_REQUESTS = registry.gauge(
+    "ssem_http_pool_requests",
+    "Richieste servite dal pool per fornitore e host",
+    ["provider", "host"]
+)
+HTTP_POOL_IDLE = registry.gauge(
+    "ssem_http_pool_idle_connections",
+    "Connessioni inattive disponibili per il riuso per fornitore e host",
+    ["provider", "host"]
+)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter che ricorda il fornitore per cui è stato creato (per le statistiche)."""
+
+    def __init__(self, provider, **kwargs):
+        self.provider = provider
+        super().__init__(**kwargs)
+
+
+def configure_http(config):
+    """
+    Legge la sezione [HTTP] della configurazione generale.
+    Le impostazioni valgono per le sessioni create dopo la chiamata.
+    Senza pool_maxsize esplicito, il pool di ogni host ha tante connessioni quanti sono
+    i worker del polling ([POLLING] max_workers): i controlli contemporanei di un account
+    non superano i worker, quindi nessuna connessione viene aperta e poi scartata.
+
+    Args:
+        config (ConfigParser): Configurazione di ssem_config.ini
+    """
+    polling_workers = config.getint("POLLING", "max_workers", fallback=DEFAULT_HTTP_SETTINGS["pool_maxsize"])
+    settings.update({
+        "pool_connections": config.getint("HTTP", "pool_connections", fallback=DEFAULT_HTTP_SETTINGS["pool_connections"]),
+        "pool_maxsize": config.getint("HTTP", "pool_maxsize", fallback=max(1, polling_workers)),
+        "pool_block": config.getboolean("HTTP", "pool_block", fallback=DEFAULT_HTTP_SETTINGS["pool_block"]),
+        "max_retries": config.getint("HTTP", "max_retries", fallback=DEFAULT_HTTP_SETTINGS["max_retries"]),
+        "backoff_factor": config.getfloat("HTTP", "backoff_factor", fallback=DEFAULT_HTTP_SETTINGS["backoff_factor"]),
+    })
+    if settings["pool_maxsize"] < polling_workers:
+        logger.warning(f"[HTTP] pool_maxsize ({settings['pool_maxsize']}) è inferiore a [POLLING] max_workers "
+                       f"({polling_workers}): le connessioni oltre il pool saranno chiuse dopo ogni richiesta")
+    logger.info(f"Pool HTTP configurati: {settings['pool_maxsize']} connessioni per host, "
+                f"{settings['max_retries']} tentativi per le richieste idempotenti")
+
+
+def _create_adapter(provider):
+    retry = Retry(
+        total=settings["max_retries"],
+        connect=settings["max_retries"],
+        read=settings["max_retries"],
+        status=settings["max_retries"],
+        backoff_factor=settings["backoff_factor"],
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False  # Dopo l'ultimo tentativo restituisce la risposta, come senza retry
+    )
+    adapter = PooledHTTPAdapter(
+        provider,
+        pool_connections=settings["pool_connections"],
+        pool_maxsize=settings["pool_maxsize"],
+        pool_block=settings["pool_block"],
+        max_retries=retry
+    )
+    with _adapters_lock:
+        _adapters.add(adapter)
+    return adapter
+
+
+def mount_pooled_adapters(session, provider):
+    """
+    Monta gli adapter con pool e retry su una sessione esistente
+    (es. quella creata internamente da una libreria client).
+
+    Args:
+        session (requests.Session): Sessione da configurare
+        provider (str): Nome del fornitore (per le statistiche)
+
+    Returns:
+        requests.Session: La stessa sessione
+    """
+    adapter = _create_adapter(provider)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_session(provider):
+    """
+    Crea una sessione HTTP con pool di connessioni e retry.
+
+    Args:
+        provider (str): Nome del fornitore (per le statistiche)
+
+    Returns:
+        requests.Session: Nuova sessione
+    """
+    return mount_pooled_adapters(requests.Session(), provider)
+
+
+def get_pool_stats():
+    """
+    Restituisce le statistiche dei pool di connessioni attivi.
+
+    Returns:
+        list: Dizionari con provider, host, connessioni create, richieste e connessioni inattive
+    """
+    totals = {}
+    with _adapters_lock:
+        adapters = list(_adapters)
+    for adapter in adapters:
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}" + (f":{pool.port}" if pool.port else "")
+            stats = totals.setdefault((adapter.provider, host), {"connections": 0, "requests": 0, "idle": 0})
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+            # La coda del pool contiene None per gli slot ancora senza connessione
+            if pool.pool is not None:
+                stats["idle"] += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return [
+        {"provider": provider, "host": host, **stats}
+        for (provider, host), stats in sorted(totals.items())
+    ]
+
+
+def _update_pool_metrics():
+    """Aggiorna le metriche dei pool al momento dell'esportazione."""
+    for stats in get_pool_stats():
+        HTTP_POOL_CONNECTIONS.labels(stats["provider"], stats["host"]).set(stats["connections"])
+        HTTP_POOL_REQUESTS.labels(stats["provider"], stats["host"]).set(stats["requests"])
+        HTTP_POOL_IDLE.labels(stats["provider"], stats["host"]).set(stats["idle"])
+
+
+registry.add_collect_hook(_update_pool_metrics)
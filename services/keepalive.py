@@ -0,0 +1,190 @@
+"""
+Servizio di mantenimento delle sessioni verso i fornitori.
+
+Un thread temporizzatore, indipendente dal ciclo di monitoraggio, esegue a intervalli
+fissi le attività registrate (keep-alive, verifica e rinnovo anticipato delle sessioni).
+Ogni attività gira su un proprio worker: un login lento non ritarda i keep-alive degli
+altri fornitori, e un'attività ancora in corso non viene mai avviata una seconda volta.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.metrics import registry
+from services.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Limiti dell'istogramma del ritardo di avvio delle attività (secondi)
+LAG_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+KEEPALIVE_RUNS = registry.counter(
+    "ssem_keepalive_runs_total",
+    "Esecuzioni delle attività di mantenimento delle sessioni per attività ed esito",
+    ["task", "result"]
+)
+KEEPALIVE_DURATION = registry.histogram(
+    "ssem_keepalive_duration_seconds",
+    "Durata delle attività di mantenimento delle sessioni",
+    ["task"]
+)
+KEEPALIVE_LAG = registry.histogram(
+    "ssem_keepalive_lag_seconds",
+    "Ritardo tra l'istante programmato e l'avvio effettivo delle attività di mantenimento",
+    ["task"],
+    buckets=LAG_BUCKETS
+)
+
+# Limite dei worker delle attività (con centinaia di account)
+MAX_WORKERS = 32
+SESSION_REFRESHES = registry.counter(
+    "ssem_session_refreshes_total",
+    "Numero di rinnovi anticipati delle sessioni per fornitore ed esito",
+    ["provider", "result"]
+)
+
+
+class _Task:
+    """Attività periodica registrata nello scheduler."""
+
+    __slots__ = ("name", "func", "interval", "next_run", "running")
+
+    def __init__(self, name, func, interval, next_run):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_run = next_run
+        self.running = False
+
+
+class KeepAliveScheduler:
+    """
+    Temporizzatore delle attività di mantenimento delle sessioni di tutti i fornitori.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self._executor = None
+
+    def add_task(self, name, func, interval):
+        """
+        Registra un'attività periodica (la prima esecuzione avviene dopo un intervallo).
+
+        Args:
+            name (str): Nome dell'attività (per log e metriche)
+            func (callable): Funzione senza argomenti; False come risultato indica un esito negativo
+            interval (float): Secondi tra due esecuzioni
+        """
+        with self._condition:
+            self._tasks[name] = _Task(name, func, interval, time.monotonic() + interval)
+            self._condition.notify()
+
+    def register_session_manager(self, provider, manager, interval=15):
+        """
+        Registra il rinnovo anticipato della sessione di un gestore.
+
+        Args:
+            provider (str): Nome del fornitore (per log e metriche)
+            manager: Gestore con i metodi needs_refresh() e refresh()
+            interval (float): Secondi tra due controlli della scadenza
+        """
+        self.add_task(f"{provider}.refresh", lambda: self._refresh_session(provider, manager), interval)
+
+    @staticmethod
+    def _refresh_session(provider, manager):
+        """Rinnova la sessione di un gestore se prossima alla scadenza."""
+        if not manager.needs_refresh():
+            return True
+        try:
+            with tracer.span("session_refresh", attributes={"provider": provider}) as span:
+                success = manager.refresh()
+                span.set_attribute("refresh.success", success)
+        except Exception:
+            SESSION_REFRESHES.labels(provider, "error").inc()
+            raise
+        SESSION_REFRESHES.labels(provider, "success" if success else "failure").inc()
+        if not success:
+            logger.warning(f"Rinnovo anticipato della sessione {provider} fallito, nuovo tentativo al prossimo controllo")
+        return success
+
+    def _execute(self, task, scheduled):
+        """Esegue un'attività sul worker registrando ritardo, durata ed esito."""
+        start = time.monotonic()
+        KEEPALIVE_LAG.labels(task.name).observe(max(0.0, start - scheduled))
+        result = "error"
+        try:
+            result = "failure" if task.func() is False else "success"
+        except Exception as e:
+            logger.error(f"Errore nell'attività di mantenimento {task.name}: {e}")
+        finally:
+            KEEPALIVE_DURATION.labels(task.name).observe(time.monotonic() - start)
+            KEEPALIVE_RUNS.labels(task.name, result).inc()
+            with self._condition:
+                task.running = False
+
+    def _dispatch_due(self, now):
+        """
+        Avvia le attività scadute (con self._condition acquisito).
+
+        Returns:
+            float: Secondi fino alla prossima attività programmata
+        """
+        for task in self._tasks.values():
+            if task.next_run > now:
+                continue
+            scheduled = task.next_run
+            # Intervalli fissi senza deriva; le esecuzioni perse non vengono recuperate
+            task.next_run += task.interval
+            if task.next_run <= now:
+                task.next_run = now + task.interval
+            if task.running:
+                KEEPALIVE_RUNS.labels(task.name, "skipped").inc()
+                continue
+            task.running = True
+            self._executor.submit(self._execute, task, scheduled)
+        if not self._tasks:
+            return None
+        return max(0.0, min(task.next_run for task in self._tasks.values()) - now)
+
+    def _run(self):
+        with self._condition:
+            while not self._stopping:
+                timeout = self._dispatch_due(time.monotonic())
+                self._condition.wait(timeout)
+
+    def start(self):
+        """
+        Avvia il temporizzatore.
+
+        Returns:
+            bool: True se il temporizzatore è stato avviato, False se già attivo
+        """
+        if self._thread and self._thread.is_alive():
+            return False
+        with self._condition:
+            self._stopping = False
+            now = time.monotonic()
+            for task in self._tasks.values():
+                task.next_run = now + task.interval
+            # Un worker per attività (fino a MAX_WORKERS): nessuna attende che un'altra termini
+            self._executor = ThreadPoolExecutor(max_workers=max(1, min(len(self._tasks), MAX_WORKERS)),
+                                                thread_name_prefix="keepalive")
+        self._thread = threading.Thread(target=self._run, name="keepalive-scheduler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Ferma il temporizzatore (le attività in corso terminano in background)."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
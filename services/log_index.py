@@ -0,0 +1,408 @@
+"""
+Indice di ricerca dei file di log (ssem.log e copie ruotate, anche compresse).
+
+Un thread in background legge le righe nuove del log e, per blocchi di circa
+CHUNK_SIZE byte, registra in un database SQLite la posizione del blocco insieme a ora,
+livello e impianti citati nei messaggi. Una ricerca legge solo i blocchi indicati
+dall'indice, invece di scorrere tutti i file.
+
+I file sono riconosciuti dalla prima riga, che non cambia quando il file viene ruotato
+(ssem.log -> ssem.log.1 -> ssem.log.1.gz): le posizioni restano valide anche dopo
+la compressione, perché si riferiscono al contenuto non compresso.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from services.log_pipeline import LOG_FILE
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "logs_index.db"
+CHUNK_SIZE = 64 * 1024  # Byte di log per blocco indicizzato
+DEFAULT_INDEX_INTERVAL = 10  # Secondi tra due passate dell'indicizzatore
+MAX_SEARCH_RESULTS = 5000
+
+# Intestazione di un record (formato services.log_pipeline.LOG_FORMAT)
+RECORD_HEADER = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}):(\d{2}:\d{2}),(\d{3}) - (.*?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - "
+)
+LEVELS = {name: logging.getLevelName(name) for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    id INTEGER PRIMARY KEY,
+    head TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    first_ts REAL NOT NULL,
+    indexed_bytes INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS log_chunks (
+    file_id INTEGER NOT NULL,
+    chunk_offset INTEGER NOT NULL,
+    chunk_length INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    plant TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (file_id, chunk_offset, hour, level, plant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS log_chunks_plant ON log_chunks (plant, hour);
+CREATE INDEX IF NOT EXISTS log_chunks_hour ON log_chunks (hour, level);
+"""
+
+
+def _open_log(path):
+    """Apre un file di log in lettura binaria (decompresso se .gz)."""
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _file_head(path):
+    """Restituisce l'impronta della prima riga completa di un file di log, o None."""
+    try:
+        with _open_log(path) as f:
+            line = f.readline()
+    except (OSError, EOFError):
+        return None
+    if not line.endswith(b"\n"):
+        return None
+    return hashlib.sha1(line).hexdigest(), line
+
+
+class _Record:
+    """Record di log letto da un blocco."""
+
+    __slots__ = ("timestamp", "logger", "level", "lines")
+
+    def __init__(self, timestamp, logger_name, level, line):
+        self.timestamp = timestamp
+        self.logger = logger_name
+        self.level = level
+        self.lines = [line]
+
+    def to_dict(self):
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).astimezone().isoformat(),
+            "logger": self.logger,
+            "level": self.level,
+            "message": "\n".join(self.lines)
+        }
+
+
+class LogIndex:
+    """
+    Indice dei file di log di una directory, aggiornato da un thread in background.
+    Ogni thread usa una propria connessione SQLite (modalità WAL).
+    """
+
+    def __init__(self, log_dir, db_path=None, plant_names=None, interval=DEFAULT_INDEX_INTERVAL):
+        """
+        Args:
+            log_dir (str): Directory di ssem.log
+            db_path (str, optional): Percorso del database dell'indice. Default logs_index.db in log_dir.
+            plant_names (callable, optional): Funzione che restituisce i nomi degli impianti da riconoscere
+            interval (float): Secondi tra due passate dell'indicizzatore
+        """
+        self.log_dir = log_dir
+        self.db_path = db_path or os.path.join(log_dir, INDEX_FILE)
+        self.plant_names = plant_names or (lambda: [])
+        self.interval = interval
+        self._local = threading.local()
+        self._lock = threading.Lock()  # Una sola passata di indicizzazione alla volta
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._hours = {}  # Prefisso "AAAA-MM-GG HH" -> timestamp dell'ora
+        self._names_key = None
+        self._names_pattern = None
+        self._tail_keys = {}  # ID file -> chiavi dell'ultimo record (per le righe di continuazione)
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+    def _connection(self):
+        """Restituisce la connessione del thread corrente."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def start(self):
+        """Avvia l'indicizzatore in background."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ssem-log-indexer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Ferma l'indicizzatore."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Errore nell'indicizzazione dei log: {e}")
+            if self._stop_event.wait(self.interval):
+                return
+
+    def available(self):
+        """True se esiste il file di log da indicizzare."""
+        return os.path.exists(os.path.join(self.log_dir, LOG_FILE))
+
+    def _log_files(self):
+        """Restituisce i file di log presenti (il corrente per primo)."""
+        prefix = LOG_FILE + "."
+        paths = [os.path.join(self.log_dir, LOG_FILE)]
+        try:
+            names = os.listdir(self.log_dir)
+        except OSError:
+            return []
+        # Prima le copie non compresse: durante la rotazione possono esistere entrambe
+        rotated = sorted((name for name in names if name.startswith(prefix)), key=lambda name: name.endswith(".gz"))
+        paths.extend(os.path.join(self.log_dir, name) for name in rotated)
+        return [path for path in paths if os.path.isfile(path)]
+
+    def _hour(self, prefix):
+        """Converte il prefisso "AAAA-MM-GG HH" nel timestamp dell'ora (ora locale)."""
+        hour = self._hours.get(prefix)
+        if hour is None:
+            hour = int(time.mktime(time.strptime(prefix, "%Y-%m-%d %H")))
+            if len(self._hours) > 10000:
+                self._hours.clear()
+            self._hours[prefix] = hour
+        return hour
+
+    def _timestamp(self, match):
+        """Timestamp Unix dell'intestazione di un record (RECORD_HEADER)."""
+        minutes, seconds = match.group(2).split(":")
+        return self._hour(match.group(1)) + int(minutes) * 60 + int(seconds) + int(match.group(3)) / 1000
+
+    def _names(self):
+        """Restituisce l'espressione che riconosce i nomi degli impianti nei messaggi."""
+        try:
+            names = frozenset(name for name in self.plant_names() if name)
+        except Exception as e:
+            logger.debug(f"Nomi degli impianti non disponibili: {e}")
+            names = self._names_key or frozenset()
+        if names != self._names_key:
+            self._names_key = names
+            ordered = sorted(names, key=len, reverse=True)  # I nomi più lunghi vincono
+            self._names_pattern = re.compile("|".join(re.escape(name) for name in ordered)) if ordered else None
+        return self._names_pattern
+
+    def refresh(self):
+        """
+        Indicizza le righe nuove di tutti i file di log e rimuove dall'indice quelli eliminati.
+
+        Returns:
+            int: Byte indicizzati
+        """
+        with self._lock:
+            connection = self._connection()
+            known = {row[0]: row for row in connection.execute(
+                "SELECT head, id, path, indexed_bytes, complete FROM log_files")}
+            current_path = os.path.join(self.log_dir, LOG_FILE)
+            pattern = self._names()
+            seen = set()
+            indexed = 0
+
+            for path in self._log_files():
+                head = _file_head(path)
+                if head is None or head[0] in seen:
+                    continue
+                digest, first_line = head
+                seen.add(digest)
+                row = known.get(digest)
+                if row is None:
+                    match = RECORD_HEADER.match(first_line.decode("utf-8", "replace"))
+                    first_ts = self._timestamp(match) if match else 0
+                    cursor = connection.execute(
+                        "INSERT INTO log_files (head, path, first_ts) VALUES (?, ?, ?)", (digest, path, first_ts))
+                    row = (digest, cursor.lastrowid, path, 0, 0)
+                elif row[2] != path:
+                    connection.execute("UPDATE log_files SET path = ? WHERE id = ?", (path, row[1]))
+                _, file_id, _, indexed_bytes, complete = row
+                if complete:
+                    continue
+                rotated = path != current_path
+                indexed += self._index_file(connection, file_id, path, indexed_bytes, rotated, pattern)
+
+            for digest, row in known.items():
+                if digest not in seen:
+                    connection.execute("DELETE FROM log_chunks WHERE file_id = ?", (row[1],))
+                    connection.execute("DELETE FROM log_files WHERE id = ?", (row[1],))
+                    self._tail_keys.pop(row[1], None)
+            connection.commit()
+            return indexed
+
+    def _index_file(self, connection, file_id, path, start, rotated, pattern):
+        """
+        Indicizza un file a partire da un byte (sempre l'inizio di una riga).
+
+        Args:
+            connection (sqlite3.Connection): Connessione del thread
+            file_id (int): ID del file nell'indice
+            path (str): Percorso del file
+            start (int): Byte (non compresso) da cui riprendere
+            rotated (bool): True se il file non riceve più scritture
+            pattern (re.Pattern): Espressione dei nomi degli impianti, o None
+
+        Returns:
+            int: Byte indicizzati
+        """
+        rows = []
+        chunk_start = position = start
+        chunk_keys = set()
+        record_keys = self._tail_keys.get(file_id, ())
+
+        def flush():
+            for hour, level, plant in chunk_keys:
+                rows.append((file_id, chunk_start, position - chunk_start, hour, level, plant))
+            chunk_keys.clear()
+
+        try:
+            with _open_log(path) as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Riga ancora in scrittura
+                    text = line.decode("utf-8", "replace")
+                    match = RECORD_HEADER.match(text)
+                    if match:
+                        if position - chunk_start >= CHUNK_SIZE:
+                            flush()
+                            chunk_start = position
+                        hour = self._hour(match.group(1))
+                        level = LEVELS[match.group(5)]
+                        plants = set(pattern.findall(text, match.end())) if pattern else ()
+                        record_keys = [(hour, level, plant) for plant in plants] or [(hour, level, "")]
+                    chunk_keys.update(record_keys)
+                    position += len(line)
+        except (OSError, EOFError) as e:
+            logger.warning(f"Impossibile indicizzare il file di log {path}: {e}")
+            return 0
+        flush()
+
+        self._tail_keys[file_id] = record_keys
+        connection.executemany("INSERT OR IGNORE INTO log_chunks VALUES (?, ?, ?, ?, ?, ?)", rows)
+        connection.execute("UPDATE log_files SET indexed_bytes = ?, complete = ? WHERE id = ?",
+                           (position, 1 if rotated else 0, file_id))
+        return position - start
+
+    def search(self, plant=None, level=None, start=None, end=None, limit=500):
+        """
+        Restituisce i record di log più recenti che soddisfano i filtri.
+
+        Args:
+            plant (str, optional): Nome dell'impianto citato nel messaggio
+            level (str, optional): Livello minimo (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            start (float, optional): Timestamp Unix iniziale
+            end (float, optional): Timestamp Unix finale
+            limit (int): Numero massimo di record
+
+        Usa l'indice così com'è, senza attendere l'indicizzatore: i record scritti dopo la
+        sua ultima passata (al più interval secondi prima) compaiono alla passata successiva.
+
+        Returns:
+            list: Record (timestamp ISO 8601, logger, level, message) in ordine cronologico
+
+        Raises:
+            ValueError: Se il livello non è valido
+        """
+        min_level = 0
+        if level:
+            min_level = LEVELS.get(str(level).upper())
+            if min_level is None:
+                raise ValueError(f"Livello non supportato: {level}")
+        start = start if start is not None else 0
+        end = end if end is not None else time.time()
+        limit = max(1, min(int(limit), MAX_SEARCH_RESULTS))
+
+        query = ("SELECT DISTINCT f.id, f.path, f.head, c.chunk_offset, c.chunk_length, f.first_ts "
+                 "FROM log_chunks c JOIN log_files f ON f.id = c.file_id "
+                 "WHERE c.hour >= ? AND c.hour <= ? AND c.level >= ?")
+        # Le ore dell'indice sono locali: un'ora di margine copre i fusi con offset non intero
+        params = [int(start // 3600 * 3600) - 3600, end, min_level]
+        if plant:
+            query += " AND c.plant = ?"
+            params.append(plant)
+        query += " ORDER BY f.first_ts DESC, f.id DESC, c.chunk_offset"
+
+        files = {}
+        for file_id, path, head, offset, length, _first_ts in self._connection().execute(query, params):
+            files.setdefault(file_id, (path, head, []))[2].append((offset, length))
+
+        # Stesso riconoscimento dell'indicizzatore: "Casa 1" non corrisponde a "Casa 12"
+        pattern = self._names()
+        exact = bool(plant) and pattern is not None and pattern.fullmatch(plant) is not None
+
+        def mentions(record):
+            if not plant:
+                return True
+            if exact:
+                return plant in pattern.findall(record.lines[0])
+            return plant in record.lines[0]
+
+        # File dal più recente; i blocchi di ogni file sono letti in ordine (una sola decompressione)
+        results = []
+        for path, head, chunks in files.values():
+            records = [record for record in self._read_chunks(path, head, chunks)
+                       if start <= record.timestamp <= end and LEVELS[record.level] >= min_level
+                       and mentions(record)]
+            results = records + results
+            if len(results) >= limit:
+                break
+        return [record.to_dict() for record in results[-limit:]]
+
+    def _read_chunks(self, path, head, chunks):
+        """Legge i record dei blocchi indicati di un file (verificando che non sia stato ruotato)."""
+        current = _file_head(path)
+        if current is None or current[0] != head:
+            logger.debug(f"File di log {path} ruotato durante la ricerca, ignorato")
+            return
+        try:
+            with _open_log(path) as f:
+                for offset, length in chunks:
+                    f.seek(offset)
+                    # Le righe di continuazione iniziali appartengono a un record del blocco
+                    # precedente (che ha le stesse chiavi nell'indice): sono lette con quello
+                    record = None
+                    for line in f.read(length).decode("utf-8", "replace").splitlines():
+                        match = RECORD_HEADER.match(line)
+                        if match:
+                            if record is not None:
+                                yield record
+                            record = _Record(self._timestamp(match), match.group(4), match.group(5), line[match.end():])
+                        elif record is not None:
+                            record.lines.append(line)
+                    if record is None:
+                        continue
+                    # L'indicizzatore chiude un blocco a ogni passata, anche a metà di un record
+                    # su più righe: la lettura prosegue fino all'intestazione successiva
+                    while True:
+                        line = f.readline()
+                        if not line.endswith(b"\n"):
+                            break  # Fine del file o riga ancora in scrittura
+                        text = line.decode("utf-8", "replace").rstrip("\r\n")
+                        if RECORD_HEADER.match(text):
+                            break
+                        record.lines.append(text)
+                    yield record
+        except (OSError, EOFError) as e:
+            logger.warning(f"Impossibile leggere il file di log {path}: {e}")
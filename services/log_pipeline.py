@@ -0,0 +1,179 @@
+"""
+Logging non bloccante dell'applicazione.
+
+I thread che registrano un messaggio (polling, richieste HTTP) lo accodano soltanto:
+un QueueListener in un thread dedicato lo formatta e lo scrive su console e su file.
+Il file ruota per dimensione e le copie precedenti sono compresse con gzip.
+I messaggi identici ripetuti (es. lo stesso avviso per lo stesso impianto a ogni ciclo)
+sono registrati una volta per finestra di deduplicazione, con il numero di ripetizioni.
+"""
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+
+from services.metrics import registry
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FILE = "ssem.log"
+
+# Valori predefiniti della sezione [LOGGING] di ssem_config.ini
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_DEDUP_WINDOW = 900  # Secondi: un avviso ripetuto a ogni ciclo di 5 minuti compare ogni 15
+MAX_DEDUP_ENTRIES = 10000
+
+LOG_RECORDS_SUPPRESSED = registry.counter(
+    "ssem_log_records_suppressed_total",
+    "Messaggi di log ripetuti non registrati dalla deduplicazione",
+    ["level"]
+)
+LOG_RECORDS_DROPPED = registry.counter(
+    "ssem_log_records_dropped_total",
+    "Messaggi di log scartati perché la coda del logging era piena"
+)
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _gzip_namer(name):
+    """Nome della copia ruotata compressa (es. ssem.log.1.gz)."""
+    return name + ".gz"
+
+
+def _gzip_rotator(source, dest):
+    """Comprime il file appena ruotato e rimuove l'originale."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class DuplicateFilter(logging.Filter):
+    """
+    Lascia passare un messaggio identico (stesso logger, livello e testo) una sola volta
+    per finestra; alla prima ripetizione dopo la finestra il messaggio riporta quante
+    volte è stato soppresso.
+    """
+
+    def __init__(self, window=DEFAULT_DEDUP_WINDOW, max_level=logging.ERROR):
+        """
+        Args:
+            window (float): Durata della finestra di deduplicazione in secondi (0 la disattiva)
+            max_level (int): Livello massimo deduplicato (i messaggi più gravi passano sempre)
+        """
+        super().__init__()
+        self.window = window
+        self.max_level = max_level
+        self._seen = {}  # (logger, livello, messaggio) -> [istante della registrazione, soppressi]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.window <= 0 or record.levelno > self.max_level:
+            return True
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                LOG_RECORDS_SUPPRESSED.labels(record.levelname).inc()
+                return False
+            suppressed = entry[1] if entry is not None else 0
+            if entry is None and len(self._seen) >= MAX_DEDUP_ENTRIES:
+                self._purge(now)
+            self._seen[key] = [now, 0]
+        if suppressed:
+            record.msg = f"{message} (ripetuto {suppressed} volte negli ultimi {self.window:.0f} s)"
+            record.args = None
+        return True
+
+    def _purge(self, now):
+        """Rimuove le voci con finestra scaduta (o le più vecchie se sono tutte attive)."""
+        expired = [key for key, entry in self._seen.items() if now - entry[0] >= self.window]
+        if not expired:
+            expired = sorted(self._seen, key=lambda key: self._seen[key][0])[:len(self._seen) // 2]
+        for key in expired:
+            del self._seen[key]
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler che non blocca mai: con la coda piena il messaggio è scartato e contato."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging(config, log_dir, log_file=True, level=logging.INFO):
+    """
+    Configura il logging del processo dalla sezione [LOGGING] della configurazione generale.
+    Una nuova chiamata sostituisce la configurazione precedente.
+
+    Args:
+        config (configparser.ConfigParser): Configurazione generale (ssem_config.ini)
+        log_dir (str): Directory del file di log
+        log_file (bool): Se scrivere anche nel file ssem.log (altrimenti solo stderr)
+        level (int): Livello minimo dei messaggi registrati
+
+    Returns:
+        logging.handlers.QueueListener: Listener avviato
+    """
+    global _listener
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        max_bytes = config.getint("LOGGING", "max_bytes", fallback=DEFAULT_MAX_BYTES)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, LOG_FILE),
+            maxBytes=max(0, max_bytes),
+            backupCount=config.getint("LOGGING", "backup_count", fallback=DEFAULT_BACKUP_COUNT),
+            encoding="utf-8"
+        )
+        if config.getboolean("LOGGING", "compress", fallback=True):
+            file_handler.namer = _gzip_namer
+            file_handler.rotator = _gzip_rotator
+        handlers.insert(0, file_handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=config.getint("LOGGING", "queue_size", fallback=DEFAULT_QUEUE_SIZE))
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(DuplicateFilter(
+        config.getfloat("LOGGING", "dedup_window", fallback=DEFAULT_DEDUP_WINDOW)
+    ))
+
+    with _listener_lock:
+        shutdown()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def shutdown():
+    """Scrive i messaggi ancora in coda e ferma il listener (chiamata anche all'uscita)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(shutdown)
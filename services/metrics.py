@@ -0,0 +1,339 @@
+"""
+Registro di metriche del sistema di monitoraggio (contatori, gauge e istogrammi).
+Le metriche sono esposte in formato testo Prometheus dalla route /metrics.
+"""
+import bisect
+import threading
+import time
+
+# Limiti predefiniti degli istogrammi di latenza (secondi)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape_label_value(value):
+    """Applica l'escape richiesto dal formato Prometheus ai valori delle etichette."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    """Formatta un valore numerico per il formato Prometheus."""
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    """Costruisce la stringa delle etichette di un campione."""
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.extend(f'{name}="{_escape_label_value(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Timer:
+    """Context manager che misura una durata e la passa a una funzione di osservazione."""
+
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe):
+        self._observe = observe
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+
+class _CounterChild:
+    """Valore di un contatore per una combinazione di etichette."""
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1.0):
+        """Incrementa il contatore."""
+        if amount < 0:
+            raise ValueError("I contatori possono solo aumentare")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    """Valore di un gauge per una combinazione di etichette."""
+
+    __slots__ = ("_lock", "value", "_function")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function = None
+
+    def set(self, value):
+        """Imposta il valore del gauge."""
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount=1.0):
+        """Incrementa il gauge."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        """Decrementa il gauge."""
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function):
+        """Calcola il valore del gauge al momento dell'esportazione."""
+        self._function = function
+
+    def get(self):
+        """Restituisce il valore corrente del gauge."""
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return float("nan")
+        return self.value
+
+
+class _HistogramChild:
+    """Distribuzione di un istogramma per una combinazione di etichette."""
+
+    __slots__ = ("_lock", "_upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds):
+        self._lock = threading.Lock()
+        self._upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # L'ultimo bucket è +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Registra un'osservazione."""
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager che osserva la durata del blocco in secondi."""
+        return _Timer(self.observe)
+
+
+class _Metric:
+    """Base comune per le metriche con etichette."""
+
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *labelvalues):
+        """
+        Restituisce il valore della metrica per le etichette indicate.
+
+        Args:
+            *labelvalues: Valori delle etichette, nello stesso ordine di labelnames
+        """
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"Numero di etichette errato per {self.name}")
+        key = tuple(str(value) for value in labelvalues)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def collect(self):
+        """Restituisce le righe di testo Prometheus della metrica."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contatore monotono."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        """Incrementa il contatore senza etichette."""
+        self._default.inc(amount)
+
+    def _samples(self):
+        for labelvalues, child in self._items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    """Valore che può aumentare e diminuire."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        """Imposta il gauge senza etichette."""
+        self._default.set(value)
+
+    def inc(self, amount=1.0):
+        """Incrementa il gauge senza etichette."""
+        self._default.inc(amount)
+
+    def dec(self, amount=1.0):
+        """Decrementa il gauge senza etichette."""
+        self._default.dec(amount)
+
+    def set_function(self, function):
+        """Calcola il valore del gauge senza etichette al momento dell'esportazione."""
+        self._default.set_function(function)
+
+    def _samples(self):
+        for labelvalues, child in self._items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.get())}"
+
+
+class Histogram(_Metric):
+    """Istogramma con bucket cumulativi."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(float(bound) for bound in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        """Registra un'osservazione senza etichette."""
+        self._default.observe(value)
+
+    def time(self):
+        """Context manager che osserva la durata del blocco (senza etichette)."""
+        return self._default.time()
+
+    def _samples(self):
+        for labelvalues, child in self._items():
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, [("le", _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Registro delle metriche dell'applicazione.
+    La registrazione è idempotente: richiedere due volte la stessa metrica restituisce la stessa istanza.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._collect_hooks = []
+
+    def _get_or_create(self, metric_class, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metrica {name} già registrata con tipo o etichette diverse")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Registra (o restituisce) un contatore."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Registra (o restituisce) un gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Registra (o restituisce) un istogramma."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collect_hook(self, hook):
+        """
+        Registra una funzione chiamata prima di ogni esportazione, per aggiornare
+        metriche calcolate su richiesta (es. statistiche dei pool di connessioni).
+
+        Args:
+            hook (callable): Funzione senza argomenti
+        """
+        with self._lock:
+            self._collect_hooks.append(hook)
+
+    def render(self):
+        """
+        Esporta tutte le metriche nel formato testo Prometheus (versione 0.0.4).
+
+        Returns:
+            str: Testo delle metriche
+        """
+        with self._lock:
+            hooks = list(self._collect_hooks)
+        for hook in hooks:
+            try:
+                hook()
+            except Exception:
+                pass
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# Registro globale usato da tutta l'applicazione
+registry = MetricsRegistry()
+
+# Tipo di contenuto del formato testo Prometheus
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
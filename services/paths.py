@@ -0,0 +1,47 @@
+"""
+Directory di configurazione e dati dell'applicazione.
+
+Su Windows i dati restano in %APPDATA%/SSEM; altrove si seguono le convenzioni XDG.
+Le variabili d'ambiente SSEM_CONFIG_DIR e SSEM_DATA_DIR hanno la precedenza.
+"""
+import os
+
+APP_NAME = "SSEM"
+
+
+def data_dir():
+    """
+    Restituisce la directory dei dati persistenti (log, sessioni, snapshot, storico).
+    
+    Ordine: SSEM_DATA_DIR, %APPDATA%/SSEM, $XDG_DATA_HOME/ssem (default ~/.local/share/ssem).
+    
+    Returns:
+        str: Percorso della directory (non necessariamente esistente)
+    """
+    if os.environ.get("SSEM_DATA_DIR"):
+        return os.environ["SSEM_DATA_DIR"]
+    if os.environ.get("APPDATA"):
+        return os.path.join(os.environ["APPDATA"], APP_NAME)
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, APP_NAME.lower())
+
+
+def config_dir(default="config"):
+    """
+    Restituisce la directory dei file di configurazione.
+    
+    Ordine: SSEM_CONFIG_DIR, la directory predefinita se esiste (installazione Windows
+    e avvio dalla directory del progetto), $XDG_CONFIG_HOME/ssem (default ~/.config/ssem).
+    
+    Args:
+        default (str): Directory predefinita, relativa alla directory corrente
+    
+    Returns:
+        str: Percorso della directory (non necessariamente esistente)
+    """
+    if os.environ.get("SSEM_CONFIG_DIR"):
+        return os.environ["SSEM_CONFIG_DIR"]
+    if os.path.isdir(default):
+        return default
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, APP_NAME.lower())
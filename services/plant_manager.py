@@ -6,36 +6,97 @@ import threading
 import time
 import configparser
 import os
+import json
+import base64
+import bisect
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Utilizziamo import assoluti invece di relativi
-from services.session_managers import AuroraSessionManager, FusionSolarClientManager
-from models.aurora_plant import AuroraVisionPlant
-from models.fusion_plant import FusionSolarPlant, FUSION_SOLAR_AVAILABLE
-
-# Importa il supporto per la nuova API Northbound
-try:
-    from models.fusion_pyhfs_plant import PyHFSManager, FusionSolarNorthboundPlant, PYHFS_AVAILABLE
-except ImportError:
-    PYHFS_AVAILABLE = False
-    logging.warning("Libreria pyhfs non disponibile. Il supporto per FusionSolar Northbound API è disabilitato.")
+# Utilizziamo import assoluti invece di relativi.
+# I moduli dei fornitori (e le loro librerie) sono importati solo quando un account
+# del fornitore è configurato, vedi _load_aurora_account e _load_fusion_account.
+from services.metrics import registry
+from services.tracing import tracer, attach, detach, STATUS_ERROR
+from services.readings_store import ReadingsStore
+from services.keepalive import KeepAliveScheduler
+from services.accounts import (Account, AccountRegistry, DEFAULT_ACCOUNT, DEFAULT_ACCOUNT_CONCURRENCY,
+                               account_sections, account_file_name)
+from services.storage import atomic_write_json, load_json
+from services.providers import RateLimiter, get_provider, load_plugins
+from services import events
+from services.fleet import FleetSnapshot, PlantRecord, INDEXED_FIELDS, SORT_FIELDS
+from models.plant import STATUS_LABELS
 
 logger = logging.getLogger(__name__)
 
+# Intervallo minimo (secondi) tra due pubblicazioni dello snapshot durante un ciclo
+# (alla fine del ciclo lo snapshot è sempre pubblicato)
+SNAPSHOT_PUBLISH_INTERVAL = 0.5
+
+# Snapshot dello stato degli impianti usato per il ripristino all'avvio
+SNAPSHOT_FILE = "plants_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# Intervalli (secondi) delle attività di mantenimento della sessione FusionSolar
+# (come suggerito dalla documentazione di fusion_solar_py)
+FUSION_SESSION_CHECK_INTERVAL = 10
+FUSION_KEEP_ALIVE_INTERVAL = 30
+
+# Worker che controllano gli impianti in parallelo, se non configurato
+DEFAULT_POLL_WORKERS = 16
+
+# Stati possibili di un impianto (vedi Plant.update_status)
+PLANT_STATUSES = STATUS_LABELS
+
+# Metriche del ciclo di monitoraggio
+PLANT_CHECK_DURATION = registry.histogram(
+    "ssem_plant_check_duration_seconds",
+    "Durata di check_connection per impianto",
+    ["provider", "type"]
+)
+PLANT_CHECKS = registry.counter(
+    "ssem_plant_checks_total",
+    "Numero di controlli degli impianti per esito",
+    ["provider", "type", "result"]
+)
+CYCLE_DURATION = registry.histogram(
+    "ssem_update_cycle_duration_seconds",
+    "Durata di un ciclo completo di update_all_plants"
+)
+LAST_CYCLE_TIMESTAMP = registry.gauge(
+    "ssem_update_cycle_last_timestamp_seconds",
+    "Timestamp Unix della fine dell'ultimo ciclo di aggiornamento"
+)
+PLANTS_RATE_LIMITED = registry.counter(
+    "ssem_plants_rate_limited_total",
+    "Impianti non controllati nel ciclo per il limite di frequenza del provider",
+    ["provider"]
+)
+PLANTS_BY_STATUS = registry.gauge(
+    "ssem_plants",
+    "Numero di impianti per stato",
+    ["status"]
+)
+
 class PlantManager:
     """
     Gestore centralizzato degli impianti fotovoltaici.
     Monitora tutti gli impianti e mantiene lo stato aggiornato.
     """
     
-    def __init__(self, config_dir="config"):
+    def __init__(self, config_dir="config", data_dir=None, max_workers=DEFAULT_POLL_WORKERS, event_bus=None):
         """
         Inizializza il gestore impianti.
         
         Args:
             config_dir (str): Directory contenente i file di configurazione
+            data_dir (str, optional): Directory dei dati persistenti. Default config_dir.
+            max_workers (int): Worker che controllano gli impianti in parallelo
+            event_bus (EventBus, optional): Bus degli eventi di transizione. Default quello del processo.
         """
         self.config_dir = config_dir
+        self.data_dir = data_dir or config_dir
         self.plants = {}
         self.aurora_session_manager = None
         self.fusion_client_manager = None
@@ -45,16 +106,335 @@ class PlantManager:
         self.update_interval = 300  # 5 minuti di default
         self.aurora_config = None
         self.fusion_config = None
+        self.data_retention_days = None
+        
+        # Account dei fornitori: ognuno con la propria sessione e il proprio budget di concorrenza
+        self.accounts = AccountRegistry()
+        self.events = event_bus or events.bus
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._rate_limiters = {}  # Chiave account -> RateLimiter (provider con limite di frequenza)
+        
+        # Rinnovo anticipato delle sessioni, fuori dal ciclo di monitoraggio
+        self.keepalive = KeepAliveScheduler()
+        
+        # Archivio persistente delle letture (storico)
+        try:
+            self.readings_store = ReadingsStore(os.path.join(self.data_dir, "readings.db"))
+        except Exception as e:
+            logger.error(f"Impossibile aprire l'archivio delle letture: {e}")
+            self.readings_store = None
+        
+        # Snapshot immutabile letto dalle API (vedi services.fleet) e record in attesa di pubblicazione
+        self._snapshot = FleetSnapshot()
+        self._pending_records = {}
+        self._pending_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._last_publish = 0.0
+    
+    def _register_plant(self, plant_key, plant):
+        """
+        Registra un impianto e lo inserisce nel prossimo snapshot.
+        
+        Args:
+            plant_key (str): Chiave dell'impianto (es. aurora_<id>)
+            plant (Plant): Impianto da registrare
+        """
+        self.plants[plant_key] = plant
+        self._stage_plant(plant_key, plant)
+    
+    def add_account(self, account, keepalive_interval=None):
+        """
+        Registra un account di un provider (usato dai provider esterni, vedi services.providers).
+        
+        Args:
+            account (Account): Account da registrare
+            keepalive_interval (float, optional): Secondi tra i rinnovi anticipati della sessione
+                (il gestore deve avere refresh_if_needed). Default nessun rinnovo.
+        """
+        self.accounts.add(account)
+        if keepalive_interval:
+            self.keepalive.register_session_manager(self._session_label(account.provider, account.name),
+                                                    account.session_manager, keepalive_interval)
+    
+    def add_plant(self, plant_key, plant, account=None):
+        """
+        Registra un impianto e lo associa al suo account (usato dai provider esterni).
+        
+        Args:
+            plant_key (str): Chiave univoca dell'impianto
+            plant (Plant): Impianto da registrare
+            account (Account, optional): Account dell'impianto
+        
+        Returns:
+            bool: True se registrato, False se la chiave è già in uso
+        """
+        if plant_key in self.plants:
+            logger.warning(f"Impianto {plant_key} già registrato, ignorato")
+            return False
+        self._register_plant(plant_key, plant)
+        if account is not None:
+            self.accounts.assign(plant_key, account)
+        return True
+    
+    @property
+    def snapshot(self):
+        """Ultimo FleetSnapshot pubblicato (immutabile, leggibile senza lock)."""
+        return self._snapshot
+    
+    def _stage_plant(self, plant_key, plant):
+        """
+        Copia lo stato di un impianto per la prossima pubblicazione dello snapshot.
+        Va chiamato dal thread che ha appena aggiornato l'impianto.
+        
+        Args:
+            plant_key (str): Chiave dell'impianto
+            plant (Plant): Impianto aggiornato
+        """
+        record = PlantRecord(plant)
+        with self._pending_lock:
+            self._pending_records[plant_key] = record
+        self.publish_snapshot(force=False)
+    
+    def publish_snapshot(self, force=True):
+        """
+        Pubblica un nuovo snapshot con i record in attesa, sostituendo il riferimento corrente.
+        
+        Args:
+            force (bool): Se False pubblica solo se è trascorso SNAPSHOT_PUBLISH_INTERVAL
+                dall'ultima pubblicazione e nessun altro thread sta pubblicando
+        
+        Returns:
+            FleetSnapshot: Snapshot corrente dopo la pubblicazione
+        """
+        if not force and time.monotonic() - self._last_publish < SNAPSHOT_PUBLISH_INTERVAL:
+            return self._snapshot
+        if not self._publish_lock.acquire(blocking=force):
+            return self._snapshot
+        try:
+            with self._pending_lock:
+                changes, self._pending_records = self._pending_records, {}
+            if changes:
+                self._snapshot = self._snapshot.updated(changes)
+            self._last_publish = time.monotonic()
+            return self._snapshot
+        finally:
+            self._publish_lock.release()
+    
+    @staticmethod
+    def _encode_cursor(sort_value, plant_key):
+        """Codifica la posizione di paginazione in un cursore opaco."""
+        raw = json.dumps([sort_value, plant_key], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor, sort):
+        """
+        Decodifica un cursore di paginazione e ne verifica la coerenza con l'ordinamento.
+        
+        Args:
+            cursor (str): Cursore restituito dalla pagina precedente
+            sort (str): Campo di ordinamento della richiesta
+        
+        Raises:
+            ValueError: Se il cursore non è valido o è stato emesso per un altro ordinamento
+        """
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except Exception:
+            raise ValueError("Cursore non valido")
+        if not isinstance(position, list) or len(position) != 2:
+            raise ValueError("Cursore non valido")
+        sort_value, plant_key = position
+        if not isinstance(plant_key, str):
+            raise ValueError("Cursore non valido")
+        # Il valore deve avere il tipo restituito da FleetSnapshot.sort_value per questo ordinamento
+        if sort in ("power", "last_update"):
+            if isinstance(sort_value, bool) or not isinstance(sort_value, (int, float)):
+                raise ValueError("Cursore non valido per questo ordinamento")
+            sort_value = float(sort_value)
+        elif not isinstance(sort_value, str):
+            raise ValueError("Cursore non valido per questo ordinamento")
+        return sort_value, plant_key
+    
+    def query_plants(self, filters=None, sort="id", descending=False, cursor=None, limit=100):
+        """
+        Restituisce una pagina di impianti filtrata, ordinata e paginata.
+        Il costo è proporzionale al numero di impianti che soddisfano i filtri.
+        
+        Args:
+            filters (dict, optional): Filtri su status, type, provider, group e account
+            sort (str): Campo di ordinamento (id, name, power, last_update)
+            descending (bool): True per ordinamento decrescente
+            cursor (str, optional): Cursore restituito dalla pagina precedente
+            limit (int): Numero massimo di impianti per pagina
+            
+        Returns:
+            dict: Impianti della pagina, totale dei risultati e cursore successivo
+            (tutti dallo stesso snapshot)
+            
+        Raises:
+            ValueError: Se i parametri non sono validi
+        """
+        filters = filters or {}
+        for field in filters:
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Filtro non supportato: {field}")
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Ordinamento non supportato: {sort}")
+        if limit <= 0:
+            raise ValueError("Il limite deve essere positivo")
+        
+        snapshot = self._snapshot
+        keys = snapshot.filter_keys(filters)
+        
+        items = sorted((snapshot.sort_value(plant_key, sort), plant_key) for plant_key in keys)
+        
+        # Posizione del cursore nella lista ordinata in modo crescente
+        if cursor:
+            position = self._decode_cursor(cursor, sort)
+            if descending:
+                end = bisect.bisect_left(items, position)
+                start = max(0, end - limit)
+            else:
+                start = bisect.bisect_right(items, position)
+                end = start + limit
+        elif descending:
+            end = len(items)
+            start = max(0, end - limit)
+        else:
+            start = 0
+            end = limit
+        
+        page = items[start:end]
+        if descending:
+            page.reverse()
+            has_more = start > 0
+        else:
+            has_more = end < len(items)
+        
+        plants = []
+        for _, plant_key in page:
+            plant_data = snapshot.get(plant_key)
+            plant_data["key"] = plant_key
+            plants.append(plant_data)
+        
+        next_cursor = self._encode_cursor(*page[-1]) if page and has_more else None
+        
+        return {
+            "plants": plants,
+            "total": len(items),
+            "next_cursor": next_cursor
+        }
+    
+    def get_status_counts(self):
+        """
+        Restituisce il numero di impianti per ciascuno stato dallo snapshot corrente.
+        
+        Returns:
+            dict: Dizionario stato (minuscolo) -> numero di impianti
+        """
+        return dict(self._snapshot.status_counts)
+    
+    def get_plants_by_status(self, *statuses):
+        """
+        Restituisce gli impianti con uno degli stati indicati.
+        
+        Args:
+            *statuses (str): Stati da includere (es. "Online", "Inattivo")
+            
+        Returns:
+            list: Impianti corrispondenti
+        """
+        keys = self._snapshot.keys_by_status(*statuses)
+        return [self.plants[key] for key in keys if key in self.plants]
+    
+    def _set_data_retention(self, days):
+        """
+        Imposta i giorni di conservazione dello storico (il massimo tra le configurazioni caricate).
+        
+        Args:
+            days (int): Giorni di conservazione richiesti da una configurazione
+        """
+        self.data_retention_days = max(self.data_retention_days or 0, days)
+        if self.readings_store:
+            self.readings_store.retention_days = self.data_retention_days
+    
+    def _record_readings(self, plant_ids):
+        """
+        Salva nell'archivio le letture correnti degli impianti indicati.
+        
+        Args:
+            plant_ids (list): Chiavi degli impianti controllati nel ciclo
+        """
+        if not self.readings_store:
+            return
+        readings = []
+        for plant_id in plant_ids:
+            plant = self.plants.get(plant_id)
+            if plant is None or plant.last_update_ts is None:
+                continue
+            readings.append((
+                plant_id,
+                int(plant.last_update_ts),
+                float(plant.power),
+                float(plant.energy_today),
+                1 if plant.is_online else 0,
+                plant.status
+            ))
+        self.readings_store.record(readings)
+    
+    @staticmethod
+    def _session_label(provider, account_name):
+        """Etichetta del gestore di sessione di un account per log, metriche e keep-alive."""
+        return provider if account_name == DEFAULT_ACCOUNT else f"{provider}:{account_name}"
+    
+    @staticmethod
+    def _config_accounts(config):
+        """
+        Restituisce gli account di un file di configurazione: [CREDENTIALS] (account
+        predefinito) seguito dalle sezioni [ACCOUNT:<nome>].
+        
+        Args:
+            config (ConfigParser): Configurazione letta
+        
+        Returns:
+            list: Coppie (nome account, nome sezione)
+        """
+        sections = [(DEFAULT_ACCOUNT, "CREDENTIALS")] if config.has_section("CREDENTIALS") else []
+        return sections + account_sections(config)
+    
+    def load_providers(self):
+        """
+        Carica le configurazioni di tutti i provider registrati (integrati e plugin).
+        
+        Returns:
+            int: Numero di provider con almeno un impianto caricato
+        """
+        loaded = 0
+        for provider in load_plugins():
+            if not provider.config_file:
+                continue
+            try:
+                if provider.load_config(self, self.config_dir):
+                    loaded += 1
+            except Exception as e:
+                logger.error(f"Errore durante il caricamento del provider {provider.name}: {e}")
+        self.publish_snapshot()
+        return loaded
     
     def load_aurora_config(self, config_file):
         """
         Carica la configurazione AuroraVision da file.
+        Oltre all'account della sezione [CREDENTIALS] carica gli account aggiuntivi
+        definiti nelle sezioni [ACCOUNT:<nome>], ognuno con la propria sessione.
         
         Args:
             config_file (str): Nome del file di configurazione
         
         Returns:
-            bool: True se il caricamento è riuscito, False altrimenti
+            bool: True se almeno un account è stato caricato, False altrimenti
         """
         config = configparser.ConfigParser()
         config_path = os.path.join(self.config_dir, config_file)
@@ -66,49 +446,101 @@ class PlantManager:
         try:
             config.read(config_path)
             
-            self.aurora_config = {
-                "username": config.get("CREDENTIALS", "username"),
-                "password": config.get("CREDENTIALS", "password"),
-                "entity_ids": config.get("CREDENTIALS", "entity_ids").split(","),
-                "entity_aliases": config.get("CREDENTIALS", "entity_aliases", fallback="").split(","),
-                "time_interval": config.getint("SETTINGS", "time_interval", fallback=300)
-            }
-            
-            # Imposta l'intervallo di aggiornamento
-            self.update_interval = min(self.update_interval, self.aurora_config["time_interval"])
+            # Imposta l'intervallo di aggiornamento e la conservazione dello storico
+            time_interval = config.getint("SETTINGS", "time_interval", fallback=300)
+            self.update_interval = min(self.update_interval, time_interval)
+            self._set_data_retention(config.getint("SETTINGS", "data_retention_days", fallback=30))
             
-            # Crea il gestore di sessione
-            self.aurora_session_manager = AuroraSessionManager(
-                {
-                    "username": self.aurora_config["username"],
-                    "password": self.aurora_config["password"]
-                }
-            )
+            accounts = self._config_accounts(config)
+            if not accounts:
+                logger.error(f"Nessun account AuroraVision configurato in {config_path}")
+                return False
             
-            # Registra gli impianti
-            for i, entity_id in enumerate(self.aurora_config["entity_ids"]):
-                name = (self.aurora_config["entity_aliases"][i] 
-                        if i < len(self.aurora_config["entity_aliases"]) 
-                        else f"AuroraVision-{entity_id}")
-                plant = AuroraVisionPlant(name, entity_id, self.aurora_session_manager)
-                self.plants[f"aurora_{entity_id}"] = plant
-                logger.info(f"Registrato impianto AuroraVision: {name} (ID: {entity_id})")
+            loaded = 0
+            for account_name, section in accounts:
+                try:
+                    self._load_aurora_account(config, account_name, section)
+                    loaded += 1
+                except Exception as e:
+                    logger.error(f"Errore durante il caricamento dell'account AuroraVision {account_name}: {e}")
             
-            return True
+            return loaded > 0
             
         except Exception as e:
             logger.error(f"Errore durante il caricamento della configurazione AuroraVision: {e}")
             return False
     
+    def _load_aurora_account(self, config, account_name, section):
+        """
+        Registra un account AuroraVision con il suo gestore di sessione e i suoi impianti.
+        
+        Args:
+            config (ConfigParser): Configurazione letta
+            account_name (str): Nome dell'account
+            section (str): Sezione con credenziali e impianti dell'account
+        """
+        from services.session_managers import AuroraSessionManager
+        from models.aurora_plant import AuroraVisionPlant
+        
+        username = config.get(section, "username")
+        password = config.get(section, "password")
+        entity_ids = [entity_id.strip() for entity_id in config.get(section, "entity_ids").split(",") if entity_id.strip()]
+        entity_aliases = config.get(section, "entity_aliases", fallback="").split(",")
+        entity_groups = config.get(section, "entity_groups", fallback="").split(",")
+        api_url = config.get(section, "api_url", fallback="") or None
+        
+        # Crea il gestore di sessione dell'account
+        session_manager = AuroraSessionManager(
+            {"username": username, "password": password},
+            session_file=os.path.join(self.data_dir, account_file_name("aurora_session", account_name)),
+            api_url=api_url
+        )
+        account = Account(account_name, "AuroraVision", session_manager,
+                          config.getint(section, "max_concurrent_checks", fallback=DEFAULT_ACCOUNT_CONCURRENCY))
+        self.accounts.add(account)
+        self.keepalive.register_session_manager(self._session_label("AuroraVision", account_name), session_manager)
+        
+        if account_name == DEFAULT_ACCOUNT:
+            self.aurora_session_manager = session_manager
+            self.aurora_config = {
+                "username": username,
+                "password": password,
+                "entity_ids": entity_ids,
+                "entity_aliases": entity_aliases,
+                "entity_groups": entity_groups,
+                "time_interval": config.getint("SETTINGS", "time_interval", fallback=300),
+                "data_retention_days": config.getint("SETTINGS", "data_retention_days", fallback=30)
+            }
+        
+        # Registra gli impianti
+        for i, entity_id in enumerate(entity_ids):
+            plant_key = f"aurora_{entity_id}"
+            if plant_key in self.plants:
+                logger.warning(f"Impianto AuroraVision {entity_id} già registrato, ignorato nell'account {account_name}")
+                continue
+            name = (entity_aliases[i].strip() or f"AuroraVision-{entity_id}"
+                    if i < len(entity_aliases)
+                    else f"AuroraVision-{entity_id}")
+            group = (entity_groups[i].strip() or None
+                     if i < len(entity_groups)
+                     else None)
+            plant = AuroraVisionPlant(name, entity_id, session_manager, group=group, account=account_name,
+                                      api_url=api_url)
+            self._register_plant(plant_key, plant)
+            self.accounts.assign(plant_key, account)
+            logger.info(f"Registrato impianto AuroraVision: {name} (ID: {entity_id}, account: {account_name})")
+    
     def load_fusion_config(self, config_file):
         """
         Carica la configurazione FusionSolar da file.
+        Oltre all'account della sezione [CREDENTIALS] (con l'eventuale sezione [NORTHBOUND])
+        carica gli account aggiuntivi definiti nelle sezioni [ACCOUNT:<nome>].
         
         Args:
             config_file (str): Nome del file di configurazione
         
         Returns:
-            bool: True se il caricamento è riuscito, False altrimenti
+            bool: True se almeno un account è stato caricato, False altrimenti
         """
         config = configparser.ConfigParser()
         config_path = os.path.join(self.config_dir, config_file)
@@ -120,40 +552,98 @@ class PlantManager:
         try:
             config.read(config_path)
             
-            # Leggi la configurazione dalla sezione standard
-            username = config.get("CREDENTIALS", "username")
-            password = config.get("CREDENTIALS", "password")
-            subdomain = config.get("CREDENTIALS", "subdomain", fallback="")
-            captcha_model_path = config.get("CREDENTIALS", "captcha_model_path", fallback="")
-            plant_name = config.get("CREDENTIALS", "plant_name", fallback="FusionSolar")
+            # Imposta l'intervallo di aggiornamento e la conservazione dello storico
             time_interval = config.getint("SETTINGS", "time_interval", fallback=300)
+            self.update_interval = min(self.update_interval, time_interval)
+            self._set_data_retention(config.getint("SETTINGS", "data_retention_days", fallback=30))
             
-            # Verifica se la sezione NORTHBOUND esiste e se è abilitata
-            northbound_enabled = False
-            northbound_username = username
-            northbound_password = password
-            northbound_plant_id = "main"
-            
-            if config.has_section("NORTHBOUND"):
-                # Leggi il flag enabled
-                northbound_enabled = config.getboolean("NORTHBOUND", "enabled", fallback=False)
-                
-                if northbound_enabled:
-                    northbound_username = config.get("NORTHBOUND", "username", fallback=username)
-                    northbound_password = config.get("NORTHBOUND", "password", fallback=password)
-                    northbound_plant_id = config.get("NORTHBOUND", "plant_id", fallback="main")
+            loaded = 0
+            for account_name, section in self._config_accounts(config):
+                try:
+                    if self._load_fusion_account(config, account_name, section, time_interval):
+                        loaded += 1
+                except Exception as e:
+                    logger.error(f"Errore durante il caricamento dell'account FusionSolar {account_name}: {e}")
             
-            # Determina quale API usare (Northbound o Standard)
-            if northbound_enabled and PYHFS_AVAILABLE:
-                api_type = "Northbound"
-                logger.info("API Northbound abilitata e disponibile per FusionSolar")
-            elif FUSION_SOLAR_AVAILABLE:
-                api_type = "Standard"
-                logger.info("API Standard disponibile per FusionSolar")
-            else:
-                logger.warning("Nessuna libreria FusionSolar disponibile, configurazione ignorata")
-                return False
+            return loaded > 0
             
+        except Exception as e:
+            logger.error(f"Errore durante il caricamento della configurazione FusionSolar: {e}")
+            return False
+    
+    def _load_fusion_account(self, config, account_name, section, time_interval):
+        """
+        Registra un account FusionSolar (API Northbound o Standard) e il suo impianto.
+        
+        Per l'account predefinito l'API Northbound si configura nella sezione [NORTHBOUND];
+        per gli account aggiuntivi con le chiavi northbound, plant_id, max_concurrent_requests
+        e metadata_ttl nella sezione dell'account stesso.
+        
+        Args:
+            config (ConfigParser): Configurazione letta
+            account_name (str): Nome dell'account
+            section (str): Sezione con le credenziali dell'account
+            time_interval (int): Intervallo di aggiornamento configurato
+        
+        Returns:
+            bool: True se l'account è stato registrato, False altrimenti
+        """
+        from services.session_managers import FusionSolarClientManager
+        from models.fusion_plant import FusionSolarPlant, FUSION_SOLAR_AVAILABLE
+        from models.fusion_pyhfs_plant import PyHFSManager, FusionSolarNorthboundPlant, PYHFS_AVAILABLE
+        
+        is_default = account_name == DEFAULT_ACCOUNT
+        
+        # Leggi le credenziali dell'account
+        username = config.get(section, "username")
+        password = config.get(section, "password")
+        subdomain = config.get(section, "subdomain", fallback="")
+        captcha_model_path = config.get(section, "captcha_model_path", fallback="")
+        plant_name = config.get(section, "plant_name",
+                                fallback="FusionSolar" if is_default else f"FusionSolar-{account_name}")
+        plant_group = config.get(section, "plant_group", fallback="") or None
+        plant_key = "fusion_main" if is_default else account_file_name("fusion", account_name, extension="")
+        
+        # Verifica se l'API Northbound è abilitata per l'account
+        if is_default:
+            northbound_section = "NORTHBOUND"
+            northbound_enabled = (config.has_section("NORTHBOUND") and
+                                  config.getboolean("NORTHBOUND", "enabled", fallback=False))
+        else:
+            northbound_section = section
+            northbound_enabled = config.getboolean(section, "northbound", fallback=False)
+        
+        northbound_username = username
+        northbound_password = password
+        northbound_plant_id = "main"
+        northbound_max_concurrent = 4
+        northbound_metadata_ttl = 86400
+        northbound_api_url = None
+        
+        if northbound_enabled:
+            northbound_username = config.get(northbound_section, "username", fallback=username)
+            northbound_password = config.get(northbound_section, "password", fallback=password)
+            northbound_plant_id = config.get(northbound_section, "plant_id", fallback="main")
+            northbound_max_concurrent = config.getint(northbound_section, "max_concurrent_requests", fallback=4)
+            northbound_metadata_ttl = config.getint(northbound_section, "metadata_ttl", fallback=86400)
+            northbound_api_url = config.get(northbound_section, "api_url", fallback="") or None
+        
+        # Determina quale API usare (Northbound o Standard)
+        if northbound_enabled and PYHFS_AVAILABLE:
+            api_type = "Northbound"
+            logger.info(f"API Northbound abilitata e disponibile per l'account FusionSolar {account_name}")
+        elif FUSION_SOLAR_AVAILABLE:
+            api_type = "Standard"
+            logger.info(f"API Standard disponibile per l'account FusionSolar {account_name}")
+        else:
+            logger.warning(f"Nessuna libreria FusionSolar disponibile, account {account_name} ignorato")
+            return False
+        
+        if plant_key in self.plants:
+            logger.warning(f"Impianto {plant_key} già registrato, account FusionSolar {account_name} ignorato")
+            return False
+        
+        if is_default:
             self.fusion_config = {
                 "username": username,
                 "password": password,
@@ -167,124 +657,356 @@ class PlantManager:
                 "northbound_password": northbound_password,
                 "northbound_plant_id": northbound_plant_id
             }
+        
+        # Inizializza il gestore appropriato in base al tipo di API
+        if api_type == "Northbound":
+            # Crea il gestore Northbound API
+            session_manager = PyHFSManager(
+                {
+                    "username": northbound_username,
+                    "password": northbound_password
+                },
+                max_concurrent_requests=northbound_max_concurrent,
+                metadata_file=os.path.join(self.data_dir, account_file_name("northbound_stations", account_name)),
+                metadata_ttl=northbound_metadata_ttl,
+                api_url=northbound_api_url
+            )
+            account = Account(account_name, "FusionSolar-Northbound", session_manager)
+            self.accounts.add(account)
+            self.keepalive.register_session_manager(self._session_label("FusionSolar-Northbound", account_name),
+                                                    session_manager)
+            if is_default:
+                self.fusion_northbound_manager = session_manager
             
-            # Imposta l'intervallo di aggiornamento
-            self.update_interval = min(self.update_interval, time_interval)
-            
-            # Inizializza il gestore appropriato in base al tipo di API
-            if api_type == "Northbound":
-                logger.info("Utilizzo dell'API Northbound per FusionSolar")
-                # Crea il gestore Northbound API
-                self.fusion_northbound_manager = PyHFSManager(
-                    {
-                        "username": northbound_username,
-                        "password": northbound_password
-                    }
-                )
-                
-                # Registra impianto FusionSolar con API Northbound
-                plant = FusionSolarNorthboundPlant(plant_name, northbound_plant_id, self.fusion_northbound_manager)
-                self.plants["fusion_main"] = plant
-                logger.info(f"Registrato impianto FusionSolar principale (API Northbound): {plant_name}")
-            else:
-                logger.info("Utilizzo dell'API Standard per FusionSolar")
-                # Verifica percorso del modello CAPTCHA
-                if captcha_model_path and not os.path.isabs(captcha_model_path):
-                    # Costruisci un percorso assoluto rispetto alla directory di configurazione
-                    abs_captcha_path = os.path.abspath(os.path.join(self.config_dir, captcha_model_path))
-                    if os.path.exists(abs_captcha_path):
-                        captcha_model_path = abs_captcha_path
-                        logger.info(f"Aggiornato percorso del modello CAPTCHA a: {abs_captcha_path}")
-                    else:
-                        logger.warning(f"File del modello CAPTCHA non trovato nel percorso: {abs_captcha_path}")
-                
-                # Crea il gestore di client
-                self.fusion_client_manager = FusionSolarClientManager(
-                    {
-                        "username": username,
-                        "password": password,
-                        "subdomain": subdomain,
-                        "captcha_model_path": captcha_model_path
-                    }
-                )
-                
-                # Registra impianto FusionSolar con API Standard
-                plant = FusionSolarPlant(plant_name, "main", self.fusion_client_manager)
-                self.plants["fusion_main"] = plant
-                logger.info(f"Registrato impianto FusionSolar principale (API Standard): {plant_name}")
+            # Registra impianto FusionSolar con API Northbound
+            plant = FusionSolarNorthboundPlant(plant_name, northbound_plant_id, session_manager,
+                                               group=plant_group, account=account_name)
+        else:
+            # Verifica percorso del modello CAPTCHA
+            if captcha_model_path and not os.path.isabs(captcha_model_path):
+                # Costruisci un percorso assoluto rispetto alla directory di configurazione
+                abs_captcha_path = os.path.abspath(os.path.join(self.config_dir, captcha_model_path))
+                if os.path.exists(abs_captcha_path):
+                    captcha_model_path = abs_captcha_path
+                    logger.info(f"Aggiornato percorso del modello CAPTCHA a: {abs_captcha_path}")
+                else:
+                    logger.warning(f"File del modello CAPTCHA non trovato nel percorso: {abs_captcha_path}")
             
-            return True
+            # Crea il gestore di client
+            session_manager = FusionSolarClientManager(
+                {
+                    "username": username,
+                    "password": password,
+                    "subdomain": subdomain,
+                    "captcha_model_path": captcha_model_path
+                },
+                session_file=os.path.join(self.data_dir, account_file_name("fusion_session", account_name))
+            )
+            account = Account(account_name, "FusionSolar", session_manager)
+            self.accounts.add(account)
+            label = self._session_label("FusionSolar", account_name)
+            self.keepalive.register_session_manager(label, session_manager)
+            self.keepalive.add_task(f"{label}.session_check", session_manager.check_session,
+                                    FUSION_SESSION_CHECK_INTERVAL)
+            self.keepalive.add_task(f"{label}.keep_alive", session_manager.keep_session_alive,
+                                    FUSION_KEEP_ALIVE_INTERVAL)
+            if is_default:
+                self.fusion_client_manager = session_manager
             
-        except Exception as e:
-            logger.error(f"Errore durante il caricamento della configurazione FusionSolar: {e}")
-            return False
+            # Registra impianto FusionSolar con API Standard
+            plant = FusionSolarPlant(plant_name, "main", session_manager, group=plant_group, account=account_name)
+        
+        self._register_plant(plant_key, plant)
+        self.accounts.assign(plant_key, account)
+        logger.info(f"Registrato impianto FusionSolar (API {api_type}): {plant_name} (account: {account_name})")
+        return True
     
-    def update_all_plants(self):
+    def _check_plant(self, plant_id, plant):
         """
-        Aggiorna lo stato di tutti gli impianti.
+        Controlla un singolo impianto registrando metriche e span di tracciamento.
         
+        Args:
+            plant_id (str): Chiave dell'impianto
+            plant (Plant): Impianto da controllare
+            
         Returns:
-            dict: Dizionario con i risultati degli aggiornamenti
+            bool: True se l'aggiornamento ha avuto successo, False altrimenti
         """
-        results = {}
-        
-        for plant_id, plant in self.plants.items():
+        check_start = time.perf_counter()
+        previous = events.plant_state(plant)
+        with tracer.span("check_connection", attributes={
+            "plant.key": plant_id,
+            "plant.name": plant.name,
+            "plant.provider": plant.provider
+        }) as span:
             try:
                 # Aggiorna lo stato dell'impianto
                 success = plant.check_connection()
-                results[plant_id] = success
+                result_label = "success" if success else "failure"
                 
                 if success:
                     logger.info(f"Aggiornato impianto {plant.name}: {plant.power} kW")
                 else:
                     logger.warning(f"Aggiornamento fallito per l'impianto {plant.name}: {plant.error_message}")
+                    span.set_status(STATUS_ERROR, plant.error_message)
                     
             except Exception as e:
                 logger.error(f"Errore durante l'aggiornamento dell'impianto {plant_id}: {e}")
-                results[plant_id] = False
+                span.record_exception(e)
+                success = False
+                result_label = "error"
+            
+            span.set_attribute("plant.status", plant.status)
         
+        PLANT_CHECK_DURATION.labels(plant.provider, plant.type).observe(time.perf_counter() - check_start)
+        PLANT_CHECKS.labels(plant.provider, plant.type, result_label).inc()
+        self._stage_plant(plant_id, plant)
+        self._publish_transitions(plant_id, plant, previous)
+        return success
+    
+    def _publish_transitions(self, plant_id, plant, previous):
+        """
+        Pubblica gli eventi delle transizioni di stato di un impianto dopo un controllo.
+        
+        Args:
+            plant_id (str): Chiave dell'impianto
+            plant (Plant): Impianto controllato
+            previous (dict): Stato prima del controllo (events.plant_state)
+        """
+        current = events.plant_state(plant)
+        for event_type in events.transitions(previous, current):
+            self.events.publish(event_type, plant_id, plant.name, previous, current)
+    
+    def _update_status_gauges(self):
+        """Aggiorna le metriche del numero di impianti per stato."""
+        counts = self.get_status_counts()
+        for status in PLANT_STATUSES:
+            PLANTS_BY_STATUS.labels(status).set(counts.get(status.lower(), 0))
+    
+    def _get_executor(self):
+        """Restituisce il pool di worker per i controlli, creandolo al primo uso."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="poll")
+            return self._executor
+    
+    def _provider_for(self, plant_id):
+        """Restituisce account e provider di un impianto."""
+        account = self.accounts.account_for(plant_id)
+        return account, get_provider(account.provider if account else self.plants[plant_id].type)
+    
+    def _batch_size(self, account):
+        """Impianti per lotto preferiti dal provider di un account."""
+        return get_provider(account.provider).batch_size
+    
+    def _rate_limiter(self, account, provider):
+        """Restituisce il limitatore di frequenza dell'account, o None se il provider non ha limiti."""
+        if not provider.requests_per_minute:
+            return None
+        key = account.key if account else provider.name
+        with self._executor_lock:
+            limiter = self._rate_limiters.get(key)
+            if limiter is None:
+                limiter = self._rate_limiters[key] = RateLimiter(provider.requests_per_minute)
+            return limiter
+    
+    def _check_lane(self, lane, deadline=None):
+        """
+        Controlla gli impianti di una corsia (vedi AccountRegistry.lanes) in lotti della
+        dimensione preferita dal provider, rispettandone il limite di frequenza.
+        
+        Args:
+            lane (list): Chiavi degli impianti (tutti dello stesso account)
+            deadline (float, optional): Istante (time.monotonic) entro cui terminare.
+                Default un intervallo di aggiornamento da ora.
+        
+        Returns:
+            dict: Risultati dei controlli per chiave (solo impianti controllati)
+        """
+        plant_ids = [plant_id for plant_id in lane if plant_id in self.plants]
+        if not plant_ids:
+            return {}
+        if deadline is None:
+            deadline = time.monotonic() + self.update_interval
+        account, provider = self._provider_for(plant_ids[0])
+        limiter = self._rate_limiter(account, provider)
+        
+        results = {}
+        for start in range(0, len(plant_ids), provider.batch_size):
+            batch = plant_ids[start:start + provider.batch_size]
+            if limiter is not None and not limiter.acquire(
+                    provider.requests_for([self.plants[plant_id] for plant_id in batch]), deadline):
+                skipped = len(plant_ids) - start
+                PLANTS_RATE_LIMITED.labels(provider.name).inc(skipped)
+                logger.warning(f"Limite di frequenza {provider.name}: {skipped} impianti non controllati in questo ciclo")
+                break
+            results.update(self._check_batch(provider, batch, deadline))
         return results
     
+    def _check_batch(self, provider, plant_ids, deadline):
+        """
+        Aggiorna un lotto di impianti: uno alla volta con _check_plant, oppure con una
+        sola chiamata a fetch_batch se il provider supporta le richieste a lotti.
+        
+        Args:
+            provider (Provider): Provider degli impianti
+            plant_ids (list): Chiavi degli impianti del lotto
+            deadline (float): Istante (time.monotonic) entro cui terminare
+        
+        Returns:
+            dict: Risultati dei controlli per chiave (solo impianti controllati)
+        """
+        if not provider.native_batch:
+            results = {}
+            for plant_id in plant_ids:
+                if time.monotonic() >= deadline:
+                    break
+                results[plant_id] = self._check_plant(plant_id, self.plants[plant_id])
+            return results
+        
+        plants = [self.plants[plant_id] for plant_id in plant_ids]
+        previous = [events.plant_state(plant) for plant in plants]
+        batch_start = time.perf_counter()
+        with tracer.span("fetch_batch", attributes={
+            "plant.provider": provider.name,
+            "batch.size": len(plants)
+        }) as span:
+            try:
+                outcomes = list(provider.fetch_batch(plants, deadline))
+                labels = [None if outcome is None else ("success" if outcome else "failure") for outcome in outcomes]
+            except Exception as e:
+                logger.error(f"Errore durante l'aggiornamento di un lotto {provider.name}: {e}")
+                span.record_exception(e)
+                outcomes = [False] * len(plants)
+                labels = ["error"] * len(plants)
+        duration = (time.perf_counter() - batch_start) / len(plants)
+        
+        results = {}
+        for plant_id, plant, before, outcome, result_label in zip(plant_ids, plants, previous, outcomes, labels):
+            if result_label is None:
+                continue  # Non controllato entro la scadenza
+            self._stage_plant(plant_id, plant)
+            self._publish_transitions(plant_id, plant, before)
+            if outcome:
+                logger.info(f"Aggiornato impianto {plant.name}: {plant.power} kW")
+            else:
+                logger.warning(f"Aggiornamento fallito per l'impianto {plant.name}: {plant.error_message}")
+            PLANT_CHECK_DURATION.labels(plant.provider, plant.type).observe(duration)
+            PLANT_CHECKS.labels(plant.provider, plant.type, result_label).inc()
+            results[plant_id] = bool(outcome)
+        return results
+    
+    def update_all_plants(self):
+        """
+        Aggiorna lo stato di tutti gli impianti.
+        
+        Returns:
+            dict: Dizionario con i risultati degli aggiornamenti
+        """
+        results = {}
+        cycle_start = time.perf_counter()
+        
+        plant_keys = list(self.plants.keys())
+        
+        with tracer.span("update_all_plants", attributes={"plants.count": len(plant_keys)}):
+            # Gli account sono controllati in parallelo, ognuno entro il proprio budget e
+            # a lotti della dimensione preferita dal provider; il ciclo non supera l'intervallo
+            deadline = time.monotonic() + self.update_interval
+            lanes = self.accounts.lanes(plant_keys, batch_size=self._batch_size)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._check_lane, lane, deadline)
+                for lane in lanes
+            ]
+            lane_results = {}
+            for future in futures:
+                lane_results.update(future.result())
+            results = {plant_id: lane_results[plant_id] for plant_id in plant_keys if plant_id in lane_results}
+        
+        self.publish_snapshot()
+        self._record_readings(results.keys())
+        self.save_snapshot()
+        CYCLE_DURATION.observe(time.perf_counter() - cycle_start)
+        LAST_CYCLE_TIMESTAMP.set(time.time())
+        self._update_status_gauges()
+        
+        return results
+    
+    def save_snapshot(self):
+        """
+        Salva in modo atomico lo stato corrente di tutti gli impianti.
+        
+        Returns:
+            bool: True se il salvataggio è riuscito, False altrimenti
+        """
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "plants": {plant_id: plant.to_snapshot() for plant_id, plant in list(self.plants.items())}
+        }
+        try:
+            atomic_write_json(os.path.join(self.data_dir, SNAPSHOT_FILE), snapshot)
+            return True
+        except Exception as e:
+            logger.error(f"Errore nel salvataggio dello snapshot degli impianti: {e}")
+            return False
+    
+    def restore_snapshot(self):
+        """
+        Ripristina lo stato degli impianti registrati dall'ultimo snapshot.
+        Gli impianti ripristinati sono marcati come non aggiornati (stale)
+        fino al primo controllo reale.
+        
+        Returns:
+            int: Numero di impianti ripristinati
+        """
+        snapshot = load_json(os.path.join(self.data_dir, SNAPSHOT_FILE))
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return 0
+        
+        restored = 0
+        for plant_id, data in snapshot.get("plants", {}).items():
+            plant = self.plants.get(plant_id)
+            # Non sovrascrive impianti già aggiornati da un controllo reale
+            if plant is None or plant.last_update_ts is not None:
+                continue
+            try:
+                plant.restore_snapshot(data)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Snapshot non valido per l'impianto {plant_id}: {e}")
+                continue
+            self._stage_plant(plant_id, plant)
+            restored += 1
+        
+        if restored:
+            self.publish_snapshot()
+            self._update_status_gauges()
+            saved_at = datetime.fromtimestamp(snapshot.get("saved_at", 0)).strftime("%Y-%m-%d %H:%M:%S")
+            logger.info(f"Ripristinato lo stato di {restored} impianti dallo snapshot del {saved_at}")
+        return restored
+    
     def monitoring_loop(self):
         """Loop di monitoraggio che aggiorna periodicamente tutti gli impianti."""
         logger.info(f"Avvio loop di monitoraggio (intervallo: {self.update_interval} secondi)")
         
-        # Contatori per il keep-alive
-        keep_alive_counter = 0
-        keep_alive_interval = 30  # Secondi (come suggerito dalla documentazione)
-        is_session_active_interval = 10  # Secondi (come suggerito dalla documentazione)
-        is_session_active_counter = 0
-        
         while self.monitoring_active:
+            cycle_span = tracer.start_span("monitoring_cycle")
+            token = attach(cycle_span)
             try:
-                # Per l'API Standard: gestione della sessione FusionSolar
-                if self.fusion_client_manager:
-                    # Verifica se la sessione è attiva (circa ogni 10 secondi)
-                    if is_session_active_counter >= is_session_active_interval:
-                        try:
-                            if self.fusion_client_manager.client and hasattr(self.fusion_client_manager.client, 'is_session_active'):
-                                self.fusion_client_manager.client.is_session_active()
-                            is_session_active_counter = 0
-                        except Exception as e:
-                            logger.debug(f"Errore nella verifica della sessione: {e}")
-                    
-                    # Mantieni attiva la sessione FusionSolar (circa ogni 30 secondi)
-                    if keep_alive_counter >= keep_alive_interval:
-                        self.fusion_client_manager.keep_session_alive()
-                        keep_alive_counter = 0
-                
-                # Aggiorna tutti gli impianti
+                # Il mantenimento delle sessioni è gestito dal KeepAliveScheduler
                 self.update_all_plants()
             except Exception as e:
                 logger.error(f"Errore nel loop di monitoraggio: {e}")
+                cycle_span.record_exception(e)
+            finally:
+                detach(token)
+                cycle_span.end()
                 
             # Attendi il prossimo aggiornamento
             for i in range(self.update_interval):
                 if not self.monitoring_active:
                     break
                 time.sleep(1)
-                keep_alive_counter += 1
-                is_session_active_counter += 1
     
     def start_monitoring(self):
         """
@@ -300,6 +1022,7 @@ class PlantManager:
         self.monitoring_thread = threading.Thread(target=self.monitoring_loop)
         self.monitoring_thread.daemon = True
         self.monitoring_thread.start()
+        self.keepalive.start()
         logger.info("Monitoraggio avviato")
         return True
     
@@ -314,25 +1037,63 @@ class PlantManager:
             return False
             
         self.monitoring_active = False
+        self.keepalive.stop()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=10)
             self.monitoring_thread = None
         
+        # Rilascia i worker del polling (ricreati al prossimo ciclo)
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        
         # Chiudi le sessioni
-        if self.fusion_northbound_manager:
-            self.fusion_northbound_manager.invalidate_session()
+        for account in self.accounts.by_provider("FusionSolar-Northbound"):
+            account.session_manager.invalidate_session()
             
         logger.info("Monitoraggio fermato")
         return True
     
     def get_all_plants(self):
         """
-        Restituisce informazioni su tutti gli impianti.
+        Restituisce informazioni su tutti gli impianti dallo snapshot corrente.
         
         Returns:
             dict: Dizionario con le informazioni degli impianti
         """
-        return {plant_id: plant.to_dict() for plant_id, plant in self.plants.items()}
+        return self._snapshot.to_dict()
+    
+    def get_station_metadata(self, refresh=False):
+        """
+        Restituisce i metadati delle stazioni Northbound (dalla cache se ancora validi).
+        
+        Args:
+            refresh (bool): Invalida la cache e rilegge i metadati dall'API
+        
+        Returns:
+            list: Metadati delle stazioni di tutti gli account (con il campo account),
+                o None se l'API Northbound non è configurata
+        """
+        accounts = self.accounts.by_provider("FusionSolar-Northbound")
+        if not accounts:
+            return None
+        stations = []
+        for account in accounts:
+            if refresh:
+                account.session_manager.invalidate_metadata()
+            stations.extend(dict(station, account=account.name)
+                            for station in account.session_manager.get_plant_list())
+        return stations
+    
+    def count_stale_plants(self):
+        """
+        Restituisce il numero di impianti con stato ripristinato e non ancora aggiornato.
+        
+        Returns:
+            int: Numero di impianti non aggiornati
+        """
+        return self._snapshot.stale_count
     
     def get_plant(self, plant_id):
         """
@@ -344,5 +1105,4 @@ class PlantManager:
         Returns:
             dict: Informazioni sull'impianto o None se non trovato
         """
-        plant = self.plants.get(plant_id)
-        return plant.to_dict() if plant else None
\ No newline at end of file
+        return self._snapshot.get(plant_id)
\ No newline at end of file
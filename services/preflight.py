@@ -0,0 +1,307 @@
+"""
+Verifica preliminare (dry run) della connettività di tutti gli impianti configurati.
+
+Esegue un login per ogni account, poi controlla tutti gli impianti in parallelo entro
+una scadenza e riporta per ogni impianto latenza ed eventuale errore in un'unica tabella.
+Non modifica lo stato del server in esecuzione: usa un PlantManager dedicato con una
+directory dei dati temporanea, in cui copia soltanto le sessioni salvate.
+
+Da riga di comando:
+
+    python -m services.preflight --config-dir config --deadline 60
+"""
+import argparse
+import configparser
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from services import paths
+from services.providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINE = 60  # Secondi per login e controlli di tutti gli impianti
+DEFAULT_WORKERS = 16
+
+# File di stato degli account copiati dalla directory dei dati (vedi account_file_name)
+STATE_FILE_PREFIXES = ("aurora_session", "fusion_session", "northbound_stations")
+
+
+class PreflightResult:
+    """Esito della verifica di un impianto."""
+
+    __slots__ = ("plant_key", "name", "provider", "account", "ok", "latency", "power", "error")
+
+    def __init__(self, plant_key, plant):
+        self.plant_key = plant_key
+        self.name = plant.name
+        self.provider = plant.provider
+        self.account = plant.account
+        self.ok = False
+        self.latency = None
+        self.power = None
+        self.error = None
+
+    def to_dict(self):
+        """Converte l'esito in un dizionario."""
+        return {
+            "plant": self.plant_key,
+            "name": self.name,
+            "provider": self.provider,
+            "account": self.account,
+            "ok": self.ok,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "power": self.power,
+            "error": self.error
+        }
+
+
+def _login_account(account):
+    """
+    Esegue il login di un account.
+
+    Returns:
+        str: Messaggio di errore, o None se il login è riuscito
+    """
+    try:
+        return None if get_provider(account.provider).login(account.session_manager) else "Login fallito"
+    except Exception as e:
+        return f"Login fallito: {e}"
+
+
+def _check(result, plant):
+    """Controlla un impianto registrando latenza ed esito nel risultato."""
+    start = time.perf_counter()
+    try:
+        result.ok = bool(plant.check_connection())
+        result.power = plant.power
+        if not result.ok:
+            result.error = plant.error_message or plant.status
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        result.latency = time.perf_counter() - start
+
+
+def _run_parallel(tasks, max_workers, timeout):
+    """
+    Esegue le funzioni in parallelo su thread daemon, così un controllo bloccato non
+    impedisce l'uscita del processo, e attende al massimo timeout secondi.
+
+    Args:
+        tasks (list): Funzioni senza argomenti (non devono sollevare eccezioni)
+        max_workers (int): Funzioni eseguite contemporaneamente
+        timeout (float): Secondi massimi di attesa
+
+    Returns:
+        tuple: (risultati per indice, insieme degli indici completati)
+    """
+    results = [None] * len(tasks)
+    completed = set()
+    if not tasks:
+        return results, completed
+
+    work = queue.Queue()
+    for index, task in enumerate(tasks):
+        work.put((index, task))
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def worker():
+        while True:
+            try:
+                index, task = work.get_nowait()
+            except queue.Empty:
+                return
+            results[index] = task()
+            with lock:
+                completed.add(index)
+                if len(completed) == len(tasks):
+                    finished.set()
+
+    for _ in range(min(max(1, max_workers), len(tasks))):
+        threading.Thread(target=worker, name="preflight", daemon=True).start()
+    finished.wait(max(0.0, timeout))
+    with lock:
+        return results, set(completed)
+
+
+def run_preflight(plant_manager, deadline=DEFAULT_DEADLINE, max_workers=DEFAULT_WORKERS):
+    """
+    Esegue la verifica di tutti gli impianti di un PlantManager già configurato.
+
+    Args:
+        plant_manager (PlantManager): Gestore con le configurazioni caricate
+        deadline (float): Secondi massimi per l'intera verifica
+        max_workers (int): Login e controlli eseguiti in parallelo
+
+    Returns:
+        list: PreflightResult, uno per impianto, nell'ordine di registrazione
+    """
+    end = time.monotonic() + deadline
+    plants = dict(plant_manager.plants)
+    results = {plant_key: PreflightResult(plant_key, plant) for plant_key, plant in plants.items()}
+
+    # Un login per account, in parallelo: gli impianti di un account senza login non vengono controllati
+    accounts = list(plant_manager.accounts)
+    login_errors, completed = _run_parallel([lambda account=account: _login_account(account) for account in accounts],
+                                            max_workers, end - time.monotonic())
+    failed_accounts = {}
+    for index, account in enumerate(accounts):
+        error = login_errors[index] if index in completed else "Login non completato entro la scadenza"
+        if error:
+            failed_accounts[account.key] = error
+
+    # Controllo di tutti gli impianti in parallelo entro la scadenza residua
+    to_check = []
+    for plant_key, plant in plants.items():
+        account = plant_manager.accounts.account_for(plant_key)
+        if account is not None and account.key in failed_accounts:
+            results[plant_key].error = failed_accounts[account.key]
+        else:
+            to_check.append((results[plant_key], plant))
+
+    _, completed = _run_parallel([lambda result=result, plant=plant: _check(result, plant) for result, plant in to_check],
+                                 max_workers, end - time.monotonic())
+    for index, (result, _plant) in enumerate(to_check):
+        if index not in completed:
+            result.ok = False
+            result.latency = None
+            result.error = f"Nessuna risposta entro {deadline:g} secondi"
+
+    return list(results.values())
+
+
+def run_preflight_from_config(config_dir="config", data_dir=None, deadline=DEFAULT_DEADLINE,
+                              max_workers=DEFAULT_WORKERS):
+    """
+    Carica le configurazioni in un PlantManager dedicato ed esegue la verifica.
+    Il gestore lavora in una directory temporanea (rimossa al termine) con una copia
+    delle sessioni salvate: i login della verifica non sostituiscono le sessioni, il
+    database delle letture e lo snapshot del server in esecuzione.
+
+    Args:
+        config_dir (str): Directory dei file di configurazione
+        data_dir (str, optional): Directory dei dati da cui copiare le sessioni salvate. Default config_dir.
+        deadline (float): Secondi massimi per l'intera verifica
+        max_workers (int): Login e controlli eseguiti in parallelo
+
+    Returns:
+        list: PreflightResult, uno per impianto
+    """
+    from services.http_pool import configure_http
+    from services.plant_manager import PlantManager
+
+    settings = configparser.ConfigParser()
+    settings.read(os.path.join(config_dir, "ssem_config.ini"))
+    configure_http(settings)
+
+    work_dir = tempfile.mkdtemp(prefix="ssem-preflight-")
+    try:
+        _copy_saved_state(data_dir or config_dir, work_dir)
+        plant_manager = PlantManager(config_dir=config_dir, data_dir=work_dir, max_workers=max_workers)
+        plant_manager.load_providers()
+        return run_preflight(plant_manager, deadline=deadline, max_workers=max_workers)
+    finally:
+        # I controlli oltre la scadenza possono ancora scrivere: gli errori di rimozione sono ignorati
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _copy_saved_state(source_dir, target_dir):
+    """
+    Copia sessioni e metadati salvati degli account in una directory di lavoro.
+
+    Args:
+        source_dir (str): Directory dei dati dell'applicazione
+        target_dir (str): Directory di lavoro della verifica
+    """
+    try:
+        names = os.listdir(source_dir)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith(".json") or not name.startswith(STATE_FILE_PREFIXES):
+            continue
+        try:
+            shutil.copy2(os.path.join(source_dir, name), os.path.join(target_dir, name))
+        except OSError as e:
+            logger.warning(f"Impossibile copiare il file di stato {name}: {e}")
+
+
+def format_table(results):
+    """
+    Formatta gli esiti in una tabella di testo.
+
+    Args:
+        results (list): PreflightResult
+
+    Returns:
+        str: Tabella con un impianto per riga e un riepilogo finale
+    """
+    header = ("Impianto", "Account", "Fornitore", "Esito", "Latenza", "Dettaglio")
+    rows = [
+        (
+            f"{result.name} ({result.plant_key})",
+            result.account or "-",
+            result.provider,
+            "OK" if result.ok else "ERRORE",
+            f"{result.latency:.2f} s" if result.latency is not None else "-",
+            f"{result.power:.2f} kW" if result.ok else (result.error or "")
+        )
+        for result in results
+    ]
+    widths = [max(len(str(row[i])) for row in rows + [header]) for i in range(len(header))]
+
+    lines = ["  ".join(str(value).ljust(widths[i]) for i, value in enumerate(header)).rstrip(),
+             "  ".join("-" * width for width in widths)]
+    lines.extend("  ".join(str(value).ljust(widths[i]) for i, value in enumerate(row)).rstrip() for row in rows)
+
+    ok_count = sum(1 for result in results if result.ok)
+    lines.append("")
+    lines.append(f"{ok_count}/{len(results)} impianti raggiungibili")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Entry point da riga di comando.
+
+    Returns:
+        int: 0 se tutti gli impianti sono raggiungibili, 1 altrimenti
+    """
+    parser = argparse.ArgumentParser(description="Verifica la connettività di tutti gli impianti configurati")
+    parser.add_argument("--config-dir", default=None,
+                        help="Directory dei file di configurazione (default: SSEM_CONFIG_DIR, ./config o ~/.config/ssem)")
+    parser.add_argument("--data-dir", default=None,
+                        help="Directory dei dati con le sessioni salvate (default: quella dell'applicazione, se esiste)")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE, help="Secondi massimi per la verifica")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Controlli eseguiti in parallelo")
+    parser.add_argument("--json", action="store_true", help="Stampa gli esiti in formato JSON")
+    parser.add_argument("--verbose", action="store_true", help="Mostra il log dei gestori di sessione")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    config_dir = args.config_dir or paths.config_dir()
+    data_dir = args.data_dir
+    if data_dir is None and os.path.isdir(paths.data_dir()):
+        data_dir = paths.data_dir()
+
+    results = run_preflight_from_config(config_dir, data_dir, deadline=args.deadline, max_workers=args.workers)
+    if args.json:
+        print(json.dumps([result.to_dict() for result in results], indent=2))
+    else:
+        print(format_table(results))
+    return 0 if results and all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Interfaccia dei fornitori (provider) di impianti e registro dei plugin.
+
+Un provider sa caricare i propri account e impianti dal file di configurazione e
+aggiornare un gruppo di impianti con fetch_batch(plants, deadline). Dichiara inoltre
+la dimensione preferita dei lotti e un limite di richieste al minuto per account:
+il PlantManager raggruppa gli impianti per account, li divide in lotti e rispetta il
+limite, così un nuovo provider ottiene concorrenza e batching senza codice aggiuntivo.
+
+I provider esterni si registrano con un entry point nel gruppo "ssem.providers"
+che punta a una sottoclasse (o a un'istanza) di Provider:
+
+    [project.entry-points."ssem.providers"]
+    mio_fornitore = "mio_pacchetto.provider:MioProvider"
+"""
+import configparser
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "ssem.providers"
+
+_providers = {}
+_providers_lock = threading.Lock()
+_plugins_lock = threading.RLock()  # Serializza il caricamento dei plugin (rientrante per i plugin che lo richiamano)
+_plugins_loaded = False
+
+
+class Provider:
+    """
+    Provider base. Le sottoclassi definiscono name, config_file e load_config;
+    quelle con un'API a lotti impostano native_batch e ridefiniscono fetch_batch.
+    """
+
+    name = None  # Fornitore degli account (Account.provider) gestiti dal provider
+    config_file = None  # File di configurazione letto da load_config (None se caricato da un altro provider)
+    batch_size = 1  # Impianti per chiamata a fetch_batch
+    native_batch = False  # True se fetch_batch aggiorna il lotto con una sola richiesta
+    requests_per_minute = None  # Richieste al minuto ammesse per account (None = nessun limite)
+    login_method = None  # Metodo del gestore di sessione che esegue il login (es. get_session)
+
+    def load_config(self, manager, config_dir):
+        """
+        Legge il file di configurazione e registra account e impianti nel gestore
+        (vedi PlantManager.add_account e PlantManager.add_plant).
+
+        Args:
+            manager (PlantManager): Gestore impianti
+            config_dir (str): Directory dei file di configurazione
+
+        Returns:
+            bool: True se almeno un impianto è stato registrato, False altrimenti
+        """
+        if not self.config_file:
+            return False
+        config_path = os.path.join(config_dir, self.config_file)
+        if not os.path.exists(config_path):
+            logger.debug(f"Configurazione del provider {self.name} assente: {config_path}")
+            return False
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        return self.configure(manager, config)
+
+    def configure(self, manager, config):
+        """
+        Registra account e impianti dalla configurazione letta.
+
+        Args:
+            manager (PlantManager): Gestore impianti
+            config (ConfigParser): Configurazione del provider
+
+        Returns:
+            bool: True se almeno un impianto è stato registrato, False altrimenti
+        """
+        raise NotImplementedError("I provider devono implementare configure() o load_config()")
+
+    def requests_for(self, plants):
+        """
+        Restituisce le richieste consumate da un lotto (per il limite di frequenza).
+
+        Args:
+            plants (list): Impianti del lotto
+
+        Returns:
+            int: Numero di richieste
+        """
+        return 1 if self.native_batch else len(plants)
+
+    def fetch_batch(self, plants, deadline):
+        """
+        Aggiorna lo stato di un lotto di impianti dello stesso account.
+        L'implementazione predefinita controlla gli impianti uno alla volta.
+
+        Args:
+            plants (list): Impianti (Plant) da aggiornare
+            deadline (float): Istante (time.monotonic) entro cui terminare
+
+        Returns:
+            list: Esito per impianto, nello stesso ordine (None se non controllato entro la scadenza)
+        """
+        results = []
+        for plant in plants:
+            if time.monotonic() >= deadline:
+                results.append(None)
+                continue
+            try:
+                results.append(bool(plant.check_connection()))
+            except Exception as e:
+                logger.error(f"Errore durante l'aggiornamento dell'impianto {plant.name}: {e}")
+                results.append(False)
+        return results
+
+    def login(self, session_manager):
+        """
+        Esegue (o riprende) il login di un account.
+
+        Args:
+            session_manager: Gestore di sessione dell'account
+
+        Returns:
+            bool: True se il login è riuscito (o non necessario), False altrimenti
+        """
+        method = getattr(session_manager, self.login_method, None) if self.login_method else None
+        return bool(method()) if method else True
+
+
+class AuroraVisionProvider(Provider):
+    """Provider AuroraVision (un impianto per richiesta PlantEnergy.json)."""
+
+    name = "AuroraVision"
+    config_file = "aurora_config.ini"
+    login_method = "get_session"
+
+    def load_config(self, manager, config_dir):
+        return manager.load_aurora_config(self.config_file)
+
+
+class FusionSolarProvider(Provider):
+    """Provider FusionSolar (API Standard); il file carica anche gli account Northbound."""
+
+    name = "FusionSolar"
+    config_file = "fusion_config.ini"
+    login_method = "get_client"
+
+    def load_config(self, manager, config_dir):
+        return manager.load_fusion_config(self.config_file)
+
+
+class FusionSolarNorthboundProvider(Provider):
+    """
+    Provider FusionSolar Northbound; gli account sono caricati da FusionSolarProvider.
+    getStationRealKpi restituisce fino a 100 stazioni per richiesta, e l'API risponde
+    FrequencyLimit (failCode 407) alle richieste troppo ravvicinate dello stesso account.
+    """
+
+    name = "FusionSolar-Northbound"
+    login_method = "ensure_session"
+    batch_size = 100
+    native_batch = True
+    requests_per_minute = 10
+
+    def fetch_batch(self, plants, deadline):
+        # Una richiesta per gestore di sessione (in pratica uno per account)
+        groups = {}
+        for index, plant in enumerate(plants):
+            groups.setdefault(id(plant.northbound_manager), []).append(index)
+        results = [None] * len(plants)
+        for indexes in groups.values():
+            if time.monotonic() >= deadline:
+                break
+            group = [plants[index] for index in indexes]
+            for index, outcome in zip(indexes, type(group[0]).check_batch(group)):
+                results[index] = bool(outcome)
+        return results
+
+
+class RateLimiter:
+    """
+    Limite di richieste al minuto condiviso dalle corsie di uno stesso account:
+    le richieste sono distribuite a intervalli regolari.
+    """
+
+    def __init__(self, requests_per_minute):
+        """
+        Args:
+            requests_per_minute (float): Richieste al minuto ammesse
+        """
+        self.interval = 60.0 / requests_per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, requests, deadline):
+        """
+        Attende il turno per eseguire un certo numero di richieste.
+
+        Args:
+            requests (int): Richieste da eseguire
+            deadline (float): Istante (time.monotonic) oltre il quale rinunciare
+
+        Returns:
+            bool: True se le richieste possono essere eseguite, False se il turno cade oltre la scadenza
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            if start >= deadline:
+                return False
+            self._next = start + requests * self.interval
+        if start > now:
+            time.sleep(start - now)
+        return True
+
+
+def register_provider(provider):
+    """
+    Registra un provider (istanza o sottoclasse di Provider), sostituendo quello con lo stesso nome.
+
+    Args:
+        provider (Provider): Provider da registrare
+
+    Returns:
+        Provider: Istanza registrata
+
+    Raises:
+        ValueError: Se il provider non è valido
+    """
+    if isinstance(provider, type):
+        provider = provider()
+    if not isinstance(provider, Provider) or not provider.name:
+        raise ValueError(f"Provider non valido: {provider!r}")
+    if provider.batch_size < 1:
+        raise ValueError(f"batch_size non valido per il provider {provider.name}: {provider.batch_size}")
+    with _providers_lock:
+        _providers[provider.name] = provider
+    return provider
+
+
+def _entry_points():
+    """Restituisce gli entry point del gruppo dei provider."""
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=ENTRY_POINT_GROUP))
+    return list(entry_points.get(ENTRY_POINT_GROUP, []))
+
+
+def load_plugins():
+    """
+    Registra i provider integrati e quelli degli entry point "ssem.providers" (una sola volta).
+
+    Returns:
+        list: Provider registrati
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        with _providers_lock:
+            return list(_providers.values())
+    # Gli altri thread attendono la fine della registrazione: il flag è impostato solo dopo,
+    # così get_provider non vede mai un registro incompleto
+    with _plugins_lock:
+        if not _plugins_loaded:
+            for builtin in (AuroraVisionProvider, FusionSolarProvider, FusionSolarNorthboundProvider):
+                register_provider(builtin)
+
+            try:
+                entry_points = _entry_points()
+            except Exception as e:
+                logger.warning(f"Impossibile leggere gli entry point dei provider: {e}")
+                entry_points = []
+            for entry_point in entry_points:
+                try:
+                    provider = register_provider(entry_point.load())
+                    logger.info(f"Provider registrato dal plugin {entry_point.name}: {provider.name}")
+                except Exception as e:
+                    logger.error(f"Impossibile caricare il provider {entry_point.name}: {e}")
+            _plugins_loaded = True
+
+    with _providers_lock:
+        return list(_providers.values())
+
+
+def get_provider(name):
+    """
+    Restituisce il provider di un fornitore (quello base se non registrato).
+
+    Args:
+        name (str): Fornitore (es. AuroraVision)
+
+    Returns:
+        Provider: Provider registrato o uno base senza batching né limiti
+    """
+    load_plugins()
+    provider = _providers.get(name)
+    if provider is None:
+        provider = Provider()
+        provider.name = name
+    return provider
@@ -0,0 +1,155 @@
+"""
+Archivio persistente delle letture degli impianti.
+
+Le letture sono salvate in un database SQLite (modalità WAL, così le letture
+dello storico non bloccano le scritture del ciclo di monitoraggio).
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Risoluzioni supportate per le interrogazioni dello storico (secondi per intervallo)
+RESOLUTIONS = {
+    "raw": None,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400
+}
+
+# Numero di righe lette dal database per ogni blocco
+FETCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    plant_key TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    power REAL NOT NULL,
+    energy_today REAL NOT NULL,
+    is_online INTEGER NOT NULL,
+    status TEXT,
+    PRIMARY KEY (plant_key, ts)
+) WITHOUT ROWID
+"""
+
+
+class ReadingsStore:
+    """
+    Archivio delle letture degli impianti su SQLite.
+    Ogni thread usa una propria connessione per le scritture; le interrogazioni
+    dello storico aprono una connessione dedicata per tutta la durata dello streaming.
+    """
+
+    def __init__(self, db_path, retention_days=30):
+        """
+        Inizializza l'archivio creando il database se necessario.
+
+        Args:
+            db_path (str): Percorso del file SQLite
+            retention_days (int): Giorni di conservazione delle letture
+        """
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.prune_interval = 3600  # Secondi tra due pulizie delle letture scadute
+        self._last_prune = 0
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(SCHEMA)
+        connection.commit()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connection(self):
+        """Restituisce la connessione del thread corrente."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def record(self, readings):
+        """
+        Salva un insieme di letture in un'unica transazione.
+
+        Args:
+            readings (list): Tuple (plant_key, timestamp, power, energy_today, is_online, status)
+        """
+        if not readings:
+            return
+        try:
+            connection = self._connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO readings (plant_key, ts, power, energy_today, is_online, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    readings
+                )
+            self._prune_if_due()
+        except sqlite3.Error as e:
+            logger.error(f"Errore nel salvataggio delle letture: {e}")
+
+    def _prune_if_due(self):
+        """Elimina le letture più vecchie del periodo di conservazione (al massimo una volta ogni ora)."""
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        cutoff = int(now - self.retention_days * 86400)
+        connection = self._connection()
+        with connection:
+            deleted = connection.execute("DELETE FROM readings WHERE ts < ?", (cutoff,)).rowcount
+        if deleted:
+            logger.info(f"Eliminate {deleted} letture più vecchie di {self.retention_days} giorni")
+
+    def iter_history(self, plant_keys, start, end, resolution="raw"):
+        """
+        Restituisce lo storico degli impianti come generatore, impianto per impianto.
+        La memoria usata è costante: le righe sono lette dal database a blocchi.
+
+        Args:
+            plant_keys (list): Chiavi degli impianti
+            start (int): Timestamp Unix di inizio (incluso)
+            end (int): Timestamp Unix di fine (escluso)
+            resolution (str): Risoluzione (raw, 5m, 15m, 1h, 1d); gli intervalli sono allineati a UTC
+
+        Yields:
+            tuple: Per risoluzione raw (plant_key, ts, power, energy_today, is_online, status),
+                altrimenti (plant_key, ts, power_avg, power_max, energy_today, online_ratio, samples)
+
+        Raises:
+            ValueError: Se la risoluzione non è supportata
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Risoluzione non supportata: {resolution}")
+        bucket = RESOLUTIONS[resolution]
+
+        if bucket is None:
+            query = ("SELECT plant_key, ts, power, energy_today, is_online, status FROM readings "
+                     "WHERE plant_key = ? AND ts >= ? AND ts < ? ORDER BY ts")
+        else:
+            query = (f"SELECT plant_key, (ts / {bucket}) * {bucket} AS bucket, AVG(power), MAX(power), "
+                     "MAX(energy_today), AVG(is_online), COUNT(*) FROM readings "
+                     "WHERE plant_key = ? AND ts >= ? AND ts < ? GROUP BY bucket ORDER BY bucket")
+
+        connection = self._connect()
+        try:
+            for plant_key in plant_keys:
+                cursor = connection.execute(query, (plant_key, int(start), int(end)))
+                while True:
+                    rows = cursor.fetchmany(FETCH_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+        finally:
+            connection.close()
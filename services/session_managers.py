@@ -1,44 +1,200 @@
 """
 Gestori di sessione per le varie API di impianti fotovoltaici.
 """
+import importlib.util
 import logging
 import requests
 import time
 import os
-import pickle
 from datetime import datetime, timedelta
 import threading
 
-# Verifica se la libreria FusionSolar è disponibile
-try:
-    from fusion_solar_py.client import FusionSolarClient
-    FUSION_SOLAR_AVAILABLE = True
-except ImportError:
-    FUSION_SOLAR_AVAILABLE = False
+from services.metrics import registry
+from services.tracing import tracer, traced_lock
+from services.http_pool import create_session, mount_pooled_adapters
+from services.session_store import (SessionStore, account_fingerprint, cookies_to_list,
+                                    cookies_from_list, cookie_expiry)
+from services.captcha import captcha_usage, get_solver
+
+# Verifica se la libreria FusionSolar è disponibile senza importarla: viene caricata
+# (con le sue dipendenze) solo alla creazione del primo client (vedi _fusion_client_class)
+FUSION_SOLAR_AVAILABLE = importlib.util.find_spec("fusion_solar_py") is not None
+if not FUSION_SOLAR_AVAILABLE:
     logging.warning("Libreria fusion_solar_py non disponibile. Il supporto per FusionSolar è disabilitato.")
 
 logger = logging.getLogger(__name__)
 
+# Header della sessione FusionSolar da conservare insieme ai cookie (roarand è il token CSRF)
+SESSION_HEADERS = ("roarand", "User-Agent")
+
+# Metriche dei login verso le API dei fornitori
+SESSION_LOGINS = registry.counter(
+    "ssem_session_logins_total",
+    "Numero di tentativi di login per fornitore ed esito",
+    ["provider", "result"]
+)
+SESSION_LOGIN_DURATION = registry.histogram(
+    "ssem_session_login_duration_seconds",
+    "Durata dei tentativi di login per fornitore",
+    ["provider"]
+)
+SESSION_LOGIN_CPU = registry.histogram(
+    "ssem_session_login_cpu_seconds",
+    "Tempo CPU dei tentativi di login per fornitore (CAPTCHA compreso)",
+    ["provider"]
+)
+
+# Attesa tra login FusionSolar falliti consecutivi (raddoppia a ogni fallimento)
+LOGIN_BACKOFF_BASE = 60
+LOGIN_BACKOFF_MAX = 1800
+
+_fusion_client = None
+
+
+def _fusion_client_class():
+    """
+    Restituisce la classe del client FusionSolar, importando fusion_solar_py al primo utilizzo.
+    
+    Returns:
+        type: SSEMFusionSolarClient
+    """
+    global _fusion_client
+    if _fusion_client is None:
+        from fusion_solar_py.client import FusionSolarClient
+        
+        class SSEMFusionSolarClient(FusionSolarClient):
+            """
+            Client FusionSolar che usa il risolutore CAPTCHA condiviso: il modello ONNX è
+            caricato una volta per processo invece che a ogni nuovo client.
+            """
+            
+            def _init_solver(self):
+                if not self._captcha_model_path:
+                    raise ValueError("CAPTCHA richiesto ma nessun modello configurato (captcha_model_path)")
+                if self._captcha_solver is None:
+                    self._captcha_solver = get_solver(self._captcha_model_path, self.captcha_device)
+        
+        _fusion_client = SSEMFusionSolarClient
+    return _fusion_client
+
+# Endpoint di login AuroraVision (api_url lo sostituisce, es. con tool/mock_server.py)
+AURORA_LOGIN_URL = "https://www.auroravision.net"
+AURORA_LOGIN_PATH = "/ums/v1/login?setCookie=true"
+
 class AuroraSessionManager:
     """
     Gestore della sessione per l'API AuroraVision.
     Mantiene una sessione condivisa per tutti gli impianti AuroraVision.
     """
     
-    def __init__(self, credentials):
+    def __init__(self, credentials, session_file=None, api_url=None):
         """
         Inizializza il gestore di sessione AuroraVision.
         
         Args:
             credentials (dict): Credenziali per l'API AuroraVision
+            session_file (str, optional): File in cui conservare i cookie tra un avvio e l'altro
+            api_url (str, optional): Indirizzo alternativo dell'API (es. un server di prova locale)
         """
         self.credentials = credentials
         self.session = None
         self.last_login_time = None
-        self.login_valid_duration = 3600  # 1 ora in secondi
-        self.lock = threading.RLock()
-        self.login_url = "https://www.auroravision.net/ums/v1/login?setCookie=true"
+        self.session_expiry = None  # Timestamp Unix di scadenza della sessione corrente
+        self.login_valid_duration = 3600  # Usata solo se i cookie non dichiarano una scadenza
+        self.expiry_margin = 60  # Secondi prima della scadenza oltre i quali la sessione non è più usata
+        self.refresh_margin = 300  # Secondi prima della scadenza in cui il rinnovo avviene in background
+        self.lock = threading.RLock()  # Protegge lo scambio della sessione (sezioni brevi)
+        self.login_lock = threading.RLock()  # Un solo login alla volta
+        self.persist_lock = threading.Lock()  # Un salvataggio della sessione alla volta (acquisito prima di lock)
+        self.login_url = (api_url or AURORA_LOGIN_URL).rstrip("/") + AURORA_LOGIN_PATH
         self.request_timeout = 30  # Timeout in secondi
+        self.session_store = SessionStore(session_file) if session_file else None
+        self._saved_cookies = None
+        
+        # Riprende la sessione salvata se ancora valida
+        self._restore_session()
+    
+    def _new_session(self):
+        """Crea una sessione HTTP (con pool di connessioni) con gli header usati per AuroraVision."""
+        session = create_session("AuroraVision")
+        
+        # Headers per sembrare un browser
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'application/json, text/plain, */*',
+        })
+        return session
+    
+    def _compute_expiry(self, session, login_time):
+        """
+        Calcola la scadenza della sessione dai cookie, o dalla durata predefinita se assente.
+        
+        Args:
+            session (requests.Session): Sessione autenticata
+            login_time (float): Timestamp Unix del login
+        
+        Returns:
+            float: Timestamp Unix di scadenza
+        """
+        expiry = cookie_expiry(session.cookies)
+        return expiry if expiry is not None else login_time + self.login_valid_duration
+    
+    def _restore_session(self):
+        """Carica i cookie salvati e riusa la sessione se non è scaduta."""
+        if not self.session_store:
+            return
+        stored = self.session_store.load()
+        if not stored:
+            return
+        if stored.get("account") != account_fingerprint(self.credentials.get("username", "")):
+            logger.info("Sessione AuroraVision salvata appartenente a un altro account, ignorata")
+            return
+        
+        session = self._new_session()
+        cookies_from_list(stored.get("cookies", []), session.cookies)
+        login_time = stored.get("data", {}).get("login_time") or stored.get("saved_at", 0)
+        expiry = min(stored.get("expires_at") or float("inf"), self._compute_expiry(session, login_time))
+        if expiry - self.expiry_margin <= time.time():
+            logger.info("Sessione AuroraVision salvata scaduta, sarà effettuato un nuovo login")
+            return
+        
+        self.session = session
+        self.session_expiry = expiry
+        self.last_login_time = datetime.fromtimestamp(login_time)
+        self._saved_cookies = cookies_to_list(session.cookies)
+        logger.info(f"Sessione AuroraVision ripresa (scadenza {datetime.fromtimestamp(expiry):%Y-%m-%d %H:%M:%S})")
+    
+    def persist_session(self):
+        """
+        Aggiorna la scadenza della sessione e salva i cookie se sono cambiati
+        dall'ultimo salvataggio (es. cookie rinnovati dal server).
+        La scrittura su disco avviene fuori da self.lock, su una copia dei cookie,
+        così i controlli degli impianti non attendono l'I/O.
+        """
+        with self.persist_lock:
+            with self.lock:
+                session = self.session
+                if not session or not self.last_login_time:
+                    return
+                cookies = cookies_to_list(session.cookies)
+                if cookies == self._saved_cookies:
+                    return
+                jar = session.cookies.copy()
+                login_time = self.last_login_time.timestamp()
+                self.session_expiry = self._compute_expiry(session, login_time)
+                expiry = self.session_expiry
+            
+            if self.session_store and not self.session_store.save(
+                jar,
+                expiry,
+                account_fingerprint(self.credentials.get("username", "")),
+                {"login_time": login_time}
+            ):
+                return
+            with self.lock:
+                # Registra il salvataggio solo se nel frattempo la sessione non è cambiata
+                if self.session is session:
+                    self._saved_cookies = cookies
     
     def login(self):
         """
@@ -47,46 +203,59 @@ class AuroraSessionManager:
         Returns:
             bool: True se il login ha avuto successo, False altrimenti
         """
-        with self.lock:
+        with self.login_lock:
             logger.info("Tentativo login AuroraVision...")
-            try:
-                username = self.credentials.get("username", "")
-                password = self.credentials.get("password", "")
-                
-                # Controlla le credenziali
-                if not username or not password:
-                    logger.error("Credenziali AuroraVision mancanti")
-                    return False
-                
-                # Crea una nuova sessione
-                session = requests.Session()
-                
-                # Headers per sembrare un browser
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'application/json, text/plain, */*',
-                }
-                session.headers.update(headers)
-                
-                # Effettua il login
-                response = session.get(
-                    self.login_url,
-                    auth=requests.auth.HTTPBasicAuth(username, password),
-                    timeout=self.request_timeout
-                )
-                
-                if response.status_code == 200:
+            with tracer.span("aurora.login") as span, SESSION_LOGIN_DURATION.labels("AuroraVision").time():
+                success = self._do_login()
+                span.set_attribute("login.success", success)
+            SESSION_LOGINS.labels("AuroraVision", "success" if success else "failure").inc()
+            return success
+    
+    def _do_login(self):
+        """
+        Esegue la richiesta di login AuroraVision su una nuova sessione e la sostituisce
+        a quella corrente solo a login riuscito: fino ad allora gli impianti continuano
+        a usare la sessione precedente.
+        
+        Returns:
+            bool: True se il login ha avuto successo, False altrimenti
+        """
+        try:
+            username = self.credentials.get("username", "")
+            password = self.credentials.get("password", "")
+            
+            # Controlla le credenziali
+            if not username or not password:
+                logger.error("Credenziali AuroraVision mancanti")
+                return False
+            
+            # Crea una nuova sessione
+            session = self._new_session()
+            
+            # Effettua il login
+            response = session.get(
+                self.login_url,
+                auth=requests.auth.HTTPBasicAuth(username, password),
+                timeout=self.request_timeout
+            )
+            
+            if response.status_code == 200:
+                login_time = datetime.now()
+                with self.lock:
                     self.session = session
-                    self.last_login_time = datetime.now()
-                    logger.info("Login AuroraVision riuscito")
-                    return True
-                else:
-                    logger.error(f"Login AuroraVision fallito: {response.status_code}")
-                    return False
-                    
-            except Exception as e:
-                logger.error(f"Errore durante il login AuroraVision: {e}")
+                    self.last_login_time = login_time
+                    self.session_expiry = self._compute_expiry(session, login_time.timestamp())
+                    self._saved_cookies = None
+                self.persist_session()
+                logger.info("Login AuroraVision riuscito")
+                return True
+            else:
+                logger.error(f"Login AuroraVision fallito: {response.status_code}")
                 return False
+                
+        except Exception as e:
+            logger.error(f"Errore durante il login AuroraVision: {e}")
+            return False
     
     def get_session(self):
         """
@@ -95,22 +264,66 @@ class AuroraSessionManager:
         Returns:
             requests.Session: Sessione valida o None se il login fallisce
         """
-        with self.lock:
-            # Se la sessione è valida, restituiscila
-            if (self.session and self.last_login_time and 
-                    (datetime.now() - self.last_login_time).total_seconds() < self.login_valid_duration):
-                return self.session
+        with tracer.span("aurora.get_session"):
+            # Percorso normale: la sessione è rinnovata in background prima della scadenza
+            session = self._valid_session()
+            if session:
+                return session
             
-            # Altrimenti, effettua un nuovo login
-            if self.login():
-                return self.session
-            else:
-                return None
+            # Nessuna sessione valida (primo avvio o sessione rifiutata): login sincrono
+            with traced_lock(self.login_lock, "aurora.session"):
+                session = self._valid_session()
+                if session:
+                    return session
+                if self.login():
+                    return self.session
+                else:
+                    return None
+    
+    def _valid_session(self):
+        """Restituisce la sessione corrente se non è scaduta, altrimenti None."""
+        session, expiry = self.session, self.session_expiry
+        if session and self.last_login_time and expiry and time.time() < expiry - self.expiry_margin:
+            return session
+        return None
+    
+    def needs_refresh(self):
+        """
+        Indica se la sessione scade entro refresh_margin e va rinnovata in background.
+        
+        Returns:
+            bool: True se il rinnovo è dovuto
+        """
+        expiry = self.session_expiry
+        return bool(self.session and expiry and time.time() >= expiry - self.refresh_margin)
+    
+    def refresh(self):
+        """
+        Rinnova la sessione in anticipo; gli impianti continuano a usare quella
+        corrente finché la nuova non è pronta.
+        
+        Returns:
+            bool: True se la sessione è valida al termine del rinnovo
+        """
+        if not self.login_lock.acquire(blocking=False):
+            return True  # Login già in corso in un altro thread
+        try:
+            if not self.needs_refresh():
+                return True
+            logger.info("Rinnovo anticipato della sessione AuroraVision")
+            return self.login()
+        finally:
+            self.login_lock.release()
     
     def invalidate_session(self):
-        """Invalida la sessione corrente."""
-        with self.lock:
-            self.last_login_time = None
+        """Invalida la sessione corrente (es. dopo una risposta 401/403) e quella salvata."""
+        with self.persist_lock:
+            with self.lock:
+                self.last_login_time = None
+                self.session_expiry = None
+                self._saved_cookies = None
+            if self.session_store:
+                self.session_store.clear()
 
 
 class FusionSolarClientManager:
@@ -119,43 +332,170 @@ class FusionSolarClientManager:
     Mantiene un client condiviso per tutti gli impianti FusionSolar.
     """
     
-    def __init__(self, credentials):
+    def __init__(self, credentials, session_file=None):
         """
         Inizializza il gestore del client FusionSolar.
         
         Args:
             credentials (dict): Credenziali per l'API FusionSolar
+            session_file (str, optional): File della sessione condivisa tra avvii e processi SSEM
         """
         self.credentials = credentials
         self.client = None
-        self.session = requests.Session()  # Sessione persistente
         self.last_login_time = None
         self.login_valid_duration = 3600  # 1 ora in secondi
-        self.lock = threading.RLock()
+        self.refresh_margin = 300  # Secondi prima della scadenza in cui il rinnovo avviene in background
+        self.lock = threading.RLock()  # Protegge lo scambio del client (sezioni brevi)
+        self.login_lock = threading.RLock()  # Un solo login alla volta (il CAPTCHA può richiedere secondi)
+        self.persist_lock = threading.Lock()  # Un salvataggio della sessione alla volta (acquisito prima di lock)
         self.available = FUSION_SOLAR_AVAILABLE
-        self.session_file = "fusion_session.pkl"  # File per salvare la sessione
+        self.session_store = SessionStore(session_file) if session_file else None
+        self._saved_state = None
+        
+        # Tentativi di login: i fallimenti consecutivi rimandano il login successivo
+        self.login_failures = 0
+        self.next_login_at = 0.0  # time.monotonic() prima del quale non si ritenta il login
+        self.last_login_attempt = None
         
-        # Carica la sessione precedente se disponibile
-        self._load_session()
+        # Il percorso del modello CAPTCHA è verificato una sola volta
+        captcha_model_path = credentials.get("captcha_model_path", "")
+        if captcha_model_path and not os.path.exists(captcha_model_path):
+            logger.warning(f"File del modello CAPTCHA non trovato: {captcha_model_path}")
+        self.captcha_model_path = os.path.abspath(captcha_model_path) if captcha_model_path else None
     
-    def _load_session(self):
-        """Carica una sessione salvata in precedenza, se disponibile."""
-        try:
-            if os.path.exists(self.session_file):
-                with open(self.session_file, 'rb') as f:
-                    self.session = pickle.load(f)
-                    logger.info("Sessione FusionSolar caricata dal file")
-        except Exception as e:
-            logger.warning(f"Impossibile caricare la sessione FusionSolar: {e}")
+    def _account(self):
+        """Impronta di account e sottodominio della sessione salvata."""
+        return account_fingerprint(f"{self.credentials.get('username', '')}@{self.credentials.get('subdomain', '')}")
     
-    def _save_session(self):
-        """Salva la sessione corrente per riutilizzarla in futuro."""
-        try:
-            with open(self.session_file, 'wb') as f:
-                pickle.dump(self.session, f)
+    def _session_state(self, client):
+        """
+        Estrae dal client i dati necessari a riprendere la sessione: cookie e token.
+        
+        Args:
+            client (FusionSolarClient): Client autenticato
+        
+        Returns:
+            dict: Cookie, header della sessione (roarand, User-Agent) e ID azienda, o None
+        """
+        session = getattr(client, "_session", None)
+        if session is None:
+            return None
+        return {
+            "cookies": cookies_to_list(session.cookies),
+            "headers": {name: session.headers[name] for name in SESSION_HEADERS if name in session.headers},
+            "company_id": getattr(client, "_company_id", None)
+        }
+    
+    def _persist_client(self, client, login_time):
+        """
+        Salva cookie e token del client se sono cambiati dall'ultimo salvataggio.
+        Lo stato è copiato sotto self.lock e scritto su disco dopo averlo rilasciato.
+        
+        Args:
+            client (FusionSolarClient): Client autenticato
+            login_time (float): Timestamp Unix del login che ha creato la sessione
+        """
+        if not self.session_store:
+            return
+        with self.persist_lock:
+            with self.lock:
+                state = self._session_state(client)
+                if state is None or state == self._saved_state:
+                    return
+                jar = client._session.cookies.copy()
+            
+            if self.session_store.save(jar, cookie_expiry(jar), self._account(),
+                                       {"headers": state["headers"], "company_id": state["company_id"],
+                                        "login_time": login_time}):
+                with self.lock:
+                    self._saved_state = state
                 logger.info("Sessione FusionSolar salvata")
+    
+    def _resume_client(self, captcha_model_path):
+        """
+        Crea un client dalla sessione salvata (anche da un altro processo SSEM),
+        senza login né CAPTCHA, se il server la considera ancora attiva.
+        Una sessione il cui login è ormai entro refresh_margin dalla scadenza non è
+        ripresa: il rinnovo anticipato deve produrre un nuovo login sul server.
+        
+        Args:
+            captcha_model_path (str): Percorso del modello CAPTCHA (per eventuali login successivi)
+        
+        Returns:
+            tuple: (FusionSolarClient con la sessione ripresa, timestamp Unix del login originale),
+            o (None, None)
+        """
+        if not self.session_store:
+            return None, None
+        stored = self.session_store.load()
+        if not stored or stored.get("account") != self._account():
+            return None, None
+        if stored.get("expires_at") and stored["expires_at"] <= time.time():
+            return None, None
+        
+        now = time.time()
+        data = stored.get("data", {})
+        login_time = data.get("login_time")
+        if not login_time or now - login_time >= self.login_valid_duration - self.refresh_margin:
+            return None, None
+        cookies = {item["name"]: item["value"] for item in stored.get("cookies", [])
+                   if not item.get("expires") or item["expires"] > now}
+        if not cookies:
+            return None, None
+        
+        try:
+            # Con i cookie il client non esegue il login
+            client = _fusion_client_class()(
+                self.credentials.get("username", ""),
+                self.credentials.get("password", ""),
+                captcha_model_path=captcha_model_path,
+                huawei_subdomain=self.credentials.get("subdomain", ""),
+                cookies=cookies
+            )
+            
+            # Ripristina i cookie con dominio e scadenza originali e i token della sessione
+            session = getattr(client, "_session", None)
+            if session is not None:
+                mount_pooled_adapters(session, "FusionSolar")
+                session.cookies.clear()
+                cookies_from_list(stored["cookies"], session.cookies, now)
+                session.headers.update(data.get("headers", {}))
+            if data.get("company_id") and hasattr(client, "_company_id"):
+                client._company_id = data["company_id"]
+            
+            if not client.is_session_active():
+                logger.info("Sessione FusionSolar salvata non più attiva")
+                return None, None
         except Exception as e:
-            logger.warning(f"Impossibile salvare la sessione FusionSolar: {e}")
+            logger.warning(f"Impossibile riprendere la sessione FusionSolar salvata: {e}")
+            return None, None
+        
+        self._saved_state = self._session_state(client)
+        logger.info("Sessione FusionSolar ripresa senza nuovo login")
+        return client, login_time
+    
+    def _login_client(self, captcha_model_path):
+        """
+        Crea un nuovo client con login completo (ed eventuale CAPTCHA) e ne salva la sessione.
+        
+        Args:
+            captcha_model_path (str): Percorso del modello CAPTCHA
+        
+        Returns:
+            tuple: (FusionSolarClient autenticato, timestamp Unix del login)
+        """
+        login_time = time.time()
+        client = _fusion_client_class()(
+            self.credentials.get("username", ""),
+            self.credentials.get("password", ""),
+            captcha_model_path=captcha_model_path,
+            huawei_subdomain=self.credentials.get("subdomain", "")
+        )
+        # Il login usa la sessione interna del client; il polling successivo usa il pool
+        if getattr(client, "_session", None) is not None:
+            mount_pooled_adapters(client._session, "FusionSolar")
+        self._persist_client(client, login_time)
+        return client, login_time
     
     def initialize_client(self):
         """
@@ -168,56 +508,108 @@ class FusionSolarClientManager:
             logger.error("Libreria FusionSolar non disponibile")
             return False
             
-        with self.lock:
+        with self.login_lock:
+            wait = self.next_login_at - time.monotonic()
+            if wait > 0:
+                SESSION_LOGINS.labels("FusionSolar", "backoff").inc()
+                logger.debug(f"Login FusionSolar rimandato di {wait:.0f} secondi dopo {self.login_failures} fallimenti")
+                return False
+            
             logger.info("Inizializzazione client FusionSolar...")
-            try:
-                username = self.credentials.get("username", "")
-                password = self.credentials.get("password", "")
-                subdomain = self.credentials.get("subdomain", "")
-                captcha_model_path = self.credentials.get("captcha_model_path", "")
-                
-                # Controlla le credenziali
-                if not username or not password:
-                    logger.error("Credenziali FusionSolar mancanti")
-                    return False
-                
-                # Verifica esistenza del file del modello CAPTCHA
-                if captcha_model_path and not os.path.exists(captcha_model_path):
-                    logger.warning(f"File del modello CAPTCHA non trovato nel percorso relativo: {captcha_model_path}")
-                    # Prova a verificare se è un percorso relativo
-                    absolute_path = os.path.abspath(captcha_model_path)
-                    logger.info(f"Tentativo con percorso assoluto: {absolute_path}")
-                    if not os.path.exists(absolute_path):
-                        logger.error("File del modello CAPTCHA non trovato anche con percorso assoluto")
-                    else:
-                        captcha_model_path = absolute_path
-                        logger.info(f"File del modello CAPTCHA trovato al percorso assoluto: {absolute_path}")
-                
-                # Crea un nuovo client con la sessione esistente
-                client = FusionSolarClient(
-                    username, 
-                    password,
-                    captcha_model_path=captcha_model_path,
-                    huawei_subdomain=subdomain,
-                    session=self.session  # Passa la sessione esistente
-                )
-                
-                # Testa il client
-                power_status = client.get_power_status()
-                if power_status:
+            start = time.perf_counter()
+            cpu_start = time.thread_time()
+            with captcha_usage() as usage, tracer.span("fusionsolar.login") as span:
+                success = self._do_initialize_client()
+                span.set_attribute("login.success", success)
+                span.set_attribute("captcha.count", usage.count)
+            self._record_login_attempt(success, time.perf_counter() - start, time.thread_time() - cpu_start, usage)
+            return success
+    
+    def _record_login_attempt(self, success, duration, cpu_seconds, usage):
+        """
+        Registra costo ed esito di un tentativo di login e aggiorna l'attesa prima del prossimo.
+        
+        Args:
+            success (bool): Esito del tentativo
+            duration (float): Durata in secondi
+            cpu_seconds (float): Tempo CPU del thread in secondi
+            usage (CaptchaUsage): CAPTCHA risolti durante il tentativo
+        """
+        SESSION_LOGINS.labels("FusionSolar", "success" if success else "failure").inc()
+        SESSION_LOGIN_DURATION.labels("FusionSolar").observe(duration)
+        SESSION_LOGIN_CPU.labels("FusionSolar").observe(cpu_seconds)
+        
+        backoff = 0
+        if success:
+            self.login_failures = 0
+        else:
+            self.login_failures += 1
+            backoff = min(LOGIN_BACKOFF_MAX, LOGIN_BACKOFF_BASE * 2 ** (self.login_failures - 1))
+        self.next_login_at = time.monotonic() + backoff
+        
+        self.last_login_attempt = {
+            "timestamp": time.time(),
+            "success": success,
+            "duration": round(duration, 3),
+            "cpu_seconds": round(cpu_seconds, 3),
+            "captchas": usage.count,
+            "captcha_inference_seconds": round(usage.inference_seconds, 3)
+        }
+        message = (f"Login FusionSolar {'riuscito' if success else 'fallito'} in {duration:.2f} s "
+                   f"(CPU {cpu_seconds:.2f} s, CAPTCHA {usage.count}, inferenza {usage.inference_seconds:.2f} s)")
+        if success:
+            logger.info(message)
+        else:
+            logger.warning(f"{message}; nuovo tentativo tra {backoff} secondi")
+    
+    def _do_initialize_client(self):
+        """
+        Crea un nuovo client FusionSolar (login ed eventuale CAPTCHA) e lo verifica.
+        Il nuovo client sostituisce quello corrente solo se funzionante: fino ad allora
+        gli impianti continuano a usare il client precedente.
+        
+        Returns:
+            bool: True se l'inizializzazione ha avuto successo, False altrimenti
+        """
+        try:
+            username = self.credentials.get("username", "")
+            password = self.credentials.get("password", "")
+            captcha_model_path = self.captcha_model_path
+            
+            # Controlla le credenziali
+            if not username or not password:
+                logger.error("Credenziali FusionSolar mancanti")
+                return False
+            
+            # Riprende la sessione salvata, se attiva; altrimenti effettua il login.
+            # Il login è esclusivo tra i processi SSEM: chi attende riusa la sessione appena salvata
+            client, login_time = self._resume_client(captcha_model_path)
+            if client is None and self.session_store:
+                with self.session_store.lock():
+                    client, login_time = self._resume_client(captcha_model_path)
+                    if client is None:
+                        client, login_time = self._login_client(captcha_model_path)
+            elif client is None:
+                client, login_time = self._login_client(captcha_model_path)
+            
+            # Testa il client
+            power_status = client.get_power_status()
+            if power_status:
+                # La scadenza è contata dal login sul server, anche per una sessione ripresa
+                with self.lock:
                     self.client = client
-                    self.last_login_time = datetime.now()
-                    self._save_session()  # Salva la sessione per il futuro
-                    logger.info("Inizializzazione client FusionSolar riuscita")
-                    return True
-                else:
-                    logger.error("Inizializzazione client FusionSolar fallita")
-                    return False
-                    
-            except Exception as e:
-                logger.error(f"Errore durante l'inizializzazione del client FusionSolar: {e}")
+                    self.last_login_time = datetime.fromtimestamp(login_time)
+                self._persist_client(client, login_time)
+                logger.info("Inizializzazione client FusionSolar riuscita")
+                return True
+            else:
+                logger.error("Inizializzazione client FusionSolar fallita")
                 return False
-    
+        
+        except Exception as e:
+            logger.error(f"Errore durante l'inizializzazione del client FusionSolar: {e}")
+            return False
+
     def get_client(self):
         """
         Ottiene un client valido, inizializzandolo se necessario.
@@ -228,23 +620,80 @@ class FusionSolarClientManager:
         if not self.available:
             return None
             
-        with self.lock:
-            # Se il client è valido, restituiscilo
-            if (self.client and self.last_login_time and 
-                    (datetime.now() - self.last_login_time).total_seconds() < self.login_valid_duration):
-                return self.client
+        with tracer.span("fusionsolar.get_client"):
+            # Percorso normale: il client è rinnovato in background prima della scadenza
+            client = self._valid_client()
+            if client:
+                return client
             
-            # Altrimenti, inizializza un nuovo client
-            if self.initialize_client():
-                return self.client
-            else:
-                return None
+            # Nessun client valido (primo avvio o client invalidato): inizializzazione sincrona
+            with traced_lock(self.login_lock, "fusionsolar.client"):
+                client = self._valid_client()
+                if client:
+                    return client
+                if self.initialize_client():
+                    return self.client
+                else:
+                    return None
+    
+    def _valid_client(self):
+        """Restituisce il client corrente se non è scaduto, altrimenti None."""
+        client, login_time = self.client, self.last_login_time
+        if client and login_time and (datetime.now() - login_time).total_seconds() < self.login_valid_duration:
+            return client
+        return None
+    
+    def needs_refresh(self):
+        """
+        Indica se il client scade entro refresh_margin e va rinnovato in background.
+        
+        Returns:
+            bool: True se il rinnovo è dovuto
+        """
+        login_time = self.last_login_time
+        if not self.client or not login_time:
+            return False
+        age = (datetime.now() - login_time).total_seconds()
+        return age >= self.login_valid_duration - self.refresh_margin
+    
+    def refresh(self):
+        """
+        Rinnova il client in anticipo (con un nuovo login, o riprendendo la sessione di un
+        login più recente salvata da un altro processo);
+        gli impianti continuano a usare quello corrente finché il nuovo non è pronto.
+        
+        Returns:
+            bool: True se il client è valido al termine del rinnovo
+        """
+        if not self.available:
+            return False
+        if not self.login_lock.acquire(blocking=False):
+            return True  # Inizializzazione già in corso in un altro thread
+        try:
+            if not self.needs_refresh():
+                return True
+            logger.info("Rinnovo anticipato del client FusionSolar")
+            return self.initialize_client()
+        finally:
+            self.login_lock.release()
     
     def invalidate_client(self):
         """Invalida il client corrente."""
         with self.lock:
             self.last_login_time = None
     
+    def check_session(self):
+        """
+        Verifica che la sessione FusionSolar risulti attiva sul server.
+        
+        Returns:
+            bool: True se la sessione è attiva, False altrimenti
+        """
+        client = self.client
+        if not client or not hasattr(client, 'is_session_active'):
+            return False
+        return bool(client.is_session_active())
+    
     def keep_session_alive(self):
         """
         Mantiene attiva la sessione FusionSolar chiamando i metodi appropriati.
@@ -265,6 +714,9 @@ class FusionSolarClientManager:
                     # Invia un segnale keep-alive
                     try:
                         self.client.keep_alive()
+                        login_time = self.last_login_time
+                        if login_time:
+                            self._persist_client(self.client, login_time.timestamp())
                         logger.debug("Sessione FusionSolar mantenuta attiva")
                         return True
                     except Exception as inner_e:
@@ -0,0 +1,224 @@
+"""
+Archivio su disco delle sessioni HTTP verso i fornitori.
+
+Salva solo cookie e token (mai oggetti serializzati con pickle) in JSON compatto,
+scritto in modo atomico con permessi 0600: una sessione ancora valida sopravvive
+al riavvio e può essere condivisa da più processi SSEM.
+"""
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from requests.cookies import create_cookie
+
+# Lock tra processi sul file di sessione (msvcrt su Windows, fcntl altrove)
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+from services.storage import atomic_write_json, load_json
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_VERSION = 1
+
+
+def account_fingerprint(username):
+    """
+    Restituisce un'impronta dell'account, per non riusare la sessione di un altro utente.
+
+    Args:
+        username (str): Nome utente
+
+    Returns:
+        str: Impronta SHA-256 del nome utente
+    """
+    return hashlib.sha256(str(username).encode("utf-8")).hexdigest()
+
+
+def cookies_to_list(jar):
+    """
+    Converte un cookie jar in una lista serializzabile.
+
+    Args:
+        jar (RequestsCookieJar): Cookie della sessione
+
+    Returns:
+        list: Cookie come dizionari
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "expires": cookie.expires,
+            "secure": cookie.secure,
+            "rest": dict(getattr(cookie, "_rest", {}) or {})
+        }
+        for cookie in jar
+    ]
+
+
+def cookies_from_list(items, jar, now=None):
+    """
+    Inserisce nel cookie jar i cookie salvati, scartando quelli già scaduti.
+
+    Args:
+        items (list): Cookie salvati con cookies_to_list
+        jar (RequestsCookieJar): Cookie jar di destinazione
+        now (float, optional): Istante di riferimento. Default adesso.
+
+    Returns:
+        int: Numero di cookie caricati
+    """
+    now = now or time.time()
+    loaded = 0
+    for item in items:
+        expires = item.get("expires")
+        if expires is not None and expires <= now:
+            continue
+        jar.set_cookie(create_cookie(
+            item["name"],
+            item["value"],
+            domain=item.get("domain", ""),
+            path=item.get("path", "/"),
+            expires=expires,
+            secure=item.get("secure", False),
+            rest=item.get("rest") or {}
+        ))
+        loaded += 1
+    return loaded
+
+
+def cookie_expiry(jar):
+    """
+    Restituisce la scadenza più vicina tra i cookie persistenti del jar.
+
+    Args:
+        jar (RequestsCookieJar): Cookie della sessione
+
+    Returns:
+        float: Timestamp Unix di scadenza, o None se i cookie non dichiarano scadenza
+    """
+    expiries = [cookie.expires for cookie in jar if cookie.expires is not None]
+    return min(expiries) if expiries else None
+
+
+def _lock_file(f):
+    """Acquisisce il lock esclusivo non bloccante su un file aperto (OSError se occupato)."""
+    if msvcrt:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock_file(f):
+    """Rilascia il lock acquisito con _lock_file."""
+    if msvcrt:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SessionStore:
+    """
+    File di sessione di un fornitore: cookie, scadenza e metadati.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Percorso del file di sessione
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Legge la sessione salvata.
+
+        Returns:
+            dict: Sessione salvata (cookies, expires_at, account, data) o None se assente o non valida
+        """
+        stored = load_json(self.path)
+        if not isinstance(stored, dict) or stored.get("version") != SESSION_STORE_VERSION:
+            return None
+        return stored
+
+    def save(self, jar, expires_at, account, data=None):
+        """
+        Salva la sessione in modo atomico con permessi 0600.
+
+        Args:
+            jar (RequestsCookieJar): Cookie della sessione
+            expires_at (float): Timestamp Unix di scadenza della sessione
+            account (str): Impronta dell'account (vedi account_fingerprint)
+            data (dict, optional): Metadati aggiuntivi del fornitore
+
+        Returns:
+            bool: True se il salvataggio è riuscito, False altrimenti
+        """
+        stored = {
+            "version": SESSION_STORE_VERSION,
+            "saved_at": time.time(),
+            "expires_at": expires_at,
+            "account": account,
+            "cookies": cookies_to_list(jar),
+            "data": data or {}
+        }
+        try:
+            atomic_write_json(self.path, stored, mode=0o600)
+            return True
+        except Exception as e:
+            logger.warning(f"Impossibile salvare la sessione in {self.path}: {e}")
+            return False
+
+    @contextmanager
+    def lock(self, timeout=120):
+        """
+        Lock esclusivo tra processi sulla sessione, da tenere durante il login:
+        gli altri processi attendono e poi riusano la sessione appena salvata.
+
+        Args:
+            timeout (float): Secondi massimi di attesa
+
+        Raises:
+            TimeoutError: Se il lock non è acquisito entro il timeout
+        """
+        lock_path = self.path + ".lock"
+        os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+        f = open(lock_path, "a+b")
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    _lock_file(f)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Lock della sessione {self.path} non acquisito entro {timeout} secondi")
+                    time.sleep(0.5)
+            try:
+                yield
+            finally:
+                try:
+                    _unlock_file(f)
+                except OSError:
+                    pass
+        finally:
+            f.close()
+
+    def clear(self):
+        """Elimina la sessione salvata."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Impossibile eliminare la sessione {self.path}: {e}")
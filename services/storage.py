@@ -0,0 +1,73 @@
+"""
+Funzioni di supporto per la scrittura sicura dei file di stato.
+"""
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path, data, mode=0o644):
+    """
+    Scrive un file in modo atomico: i dati vanno in un file temporaneo nella stessa
+    directory che poi sostituisce la destinazione, così un lettore (o un riavvio)
+    non vede mai un file scritto a metà.
+
+    Args:
+        path (str): Percorso del file di destinazione
+        data (str | bytes): Contenuto da scrivere
+        mode (int): Permessi del file (es. 0o600 per file con credenziali)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        os.chmod(temp_path, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data, mode=0o644):
+    """
+    Serializza un oggetto in JSON compatto e lo scrive in modo atomico.
+
+    Args:
+        path (str): Percorso del file di destinazione
+        data: Oggetto serializzabile in JSON
+        mode (int): Permessi del file
+    """
+    atomic_write(path, json.dumps(data, separators=(",", ":")), mode=mode)
+
+
+def load_json(path):
+    """
+    Legge un file JSON scritto con atomic_write_json.
+
+    Args:
+        path (str): Percorso del file
+
+    Returns:
+        L'oggetto letto, o None se il file non esiste o non è valido
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"File di stato non leggibile {path}: {e}")
+        return None
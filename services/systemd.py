@@ -0,0 +1,52 @@
+"""
+Integrazione con systemd (sd_notify) senza dipendenze esterne.
+
+Se il processo non è avviato da systemd (NOTIFY_SOCKET assente) le funzioni non fanno nulla.
+"""
+import logging
+import os
+import socket
+
+logger = logging.getLogger(__name__)
+
+
+def notify(*states):
+    """
+    Invia uno o più stati a systemd (es. "READY=1", "STATUS=...", "WATCHDOG=1").
+    
+    Args:
+        *states (str): Stati nel formato CHIAVE=valore
+    
+    Returns:
+        bool: True se il messaggio è stato inviato, False altrimenti
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address or not states:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]  # Socket nel namespace astratto
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall("\n".join(states).encode("utf-8"))
+        return True
+    except OSError as e:
+        logger.warning(f"Notifica a systemd non riuscita: {e}")
+        return False
+
+
+def watchdog_interval():
+    """
+    Restituisce ogni quanti secondi inviare WATCHDOG=1 (metà del timeout configurato).
+    
+    Returns:
+        float: Intervallo in secondi, o None se il watchdog non è abilitato per questo processo
+    """
+    usec = os.environ.get("WATCHDOG_USEC")
+    pid = os.environ.get("WATCHDOG_PID")
+    if not usec or (pid and pid != str(os.getpid())):
+        return None
+    try:
+        return int(usec) / 1e6 / 2
+    except ValueError:
+        return None
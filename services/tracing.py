@@ -0,0 +1,415 @@
+"""
+Tracciamento leggero delle operazioni del sistema di monitoraggio.
+
+Gli span sono compatibili con il modello OpenTelemetry e vengono esportati nel formato
+OTLP/JSON, su file (una richiesta ExportTraceServiceRequest per riga, leggibile dal
+receiver otlpjsonfile dell'OpenTelemetry Collector) oppure via HTTP verso un collector.
+Il campionamento è basato sul trace: gli span figli seguono la decisione del padre.
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Tipi di span (SpanKind OpenTelemetry)
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# Codici di stato degli span
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Span corrente nel contesto di esecuzione (thread o richiesta)
+_current_span = contextvars.ContextVar("ssem_current_span", default=None)
+
+
+def _otlp_value(value):
+    """Converte un valore Python in un AnyValue OTLP/JSON."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    """Converte un dizionario di attributi nella lista di KeyValue OTLP/JSON."""
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class Span:
+    """Span registrato (campionato)."""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "kind", "attributes",
+                 "start_time", "end_time", "status_code", "status_message", "events", "_tracer")
+    sampled = True
+
+    def __init__(self, tracer, name, trace_id, parent_span_id=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.status_code = STATUS_UNSET
+        self.status_message = None
+        self.events = []
+
+    def set_attribute(self, key, value):
+        """Imposta un attributo dello span."""
+        self.attributes[key] = value
+
+    def set_status(self, code, message=None):
+        """Imposta lo stato dello span (STATUS_OK o STATUS_ERROR)."""
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, exception):
+        """Registra un'eccezione come evento e marca lo span come errore."""
+        self.events.append({
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": _otlp_attributes({
+                "exception.type": type(exception).__name__,
+                "exception.message": str(exception)
+            })
+        })
+        self.set_status(STATUS_ERROR, str(exception))
+
+    def end(self):
+        """Chiude lo span e lo accoda per l'esportazione."""
+        if self.end_time is not None:
+            return
+        self.end_time = time.time_ns()
+        self._tracer._on_end(self)
+
+    def to_otlp(self):
+        """Restituisce lo span nel formato OTLP/JSON."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time),
+            "endTimeUnixNano": str(self.end_time),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+class NonRecordingSpan:
+    """
+    Span non campionato: non registra nulla ma propaga la decisione di campionamento
+    (e l'identificativo del trace) agli span figli.
+    """
+
+    __slots__ = ("trace_id", "span_id")
+    sampled = False
+
+    def __init__(self, trace_id, span_id=None):
+        self.trace_id = trace_id
+        self.span_id = span_id or "%016x" % random.getrandbits(64)
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, code, message=None):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self):
+        pass
+
+
+# Span restituito quando il tracciamento è disabilitato
+_DISABLED_SPAN = NonRecordingSpan("0" * 32, "0" * 16)
+
+
+class FileSpanExporter:
+    """Esporta gli span su file in formato OTLP/JSON, un batch per riga."""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, payload):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """Esporta gli span verso un collector OTLP/HTTP (codifica JSON)."""
+
+    def __init__(self, endpoint, timeout=10):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+        self._session = None
+
+    def export(self, payload):
+        # Import locale: requests serve solo con questo esportatore
+        import requests
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.post(self.url, json=payload, timeout=self.timeout)
+        if response.status_code >= 400:
+            raise RuntimeError(f"Collector OTLP ha risposto {response.status_code}")
+
+
+class Tracer:
+    """
+    Tracer con campionamento a rapporto fisso ed esportazione a batch in background.
+    Quando è disabilitato ogni span è un NonRecordingSpan e il costo è trascurabile.
+    """
+
+    def __init__(self, service_name="ssem"):
+        self.service_name = service_name
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.exporter = None
+        self.export_interval = 5.0
+        self.max_batch_size = 512
+        self.dropped_spans = 0
+        self._queue = queue.Queue(maxsize=2048)
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def configure(self, enabled, sample_rate=1.0, exporter=None, export_interval=5.0,
+                  max_queue_size=2048, max_batch_size=512):
+        """
+        Configura il tracer e avvia il thread di esportazione.
+
+        Args:
+            enabled (bool): Abilita la registrazione degli span
+            sample_rate (float): Frazione dei trace radice da campionare (0-1)
+            exporter: Esportatore con metodo export(payload)
+            export_interval (float): Intervallo massimo tra due esportazioni (secondi)
+            max_queue_size (int): Numero massimo di span in attesa (gli altri vengono scartati)
+            max_batch_size (int): Numero massimo di span per esportazione
+        """
+        self.shutdown()
+        self.enabled = bool(enabled and exporter is not None)
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self.exporter = exporter
+        self.export_interval = export_interval
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        if self.enabled:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._export_loop, name="ssem-trace-exporter")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def start_span(self, name, kind=SPAN_KIND_INTERNAL, attributes=None, parent=None):
+        """
+        Crea uno span figlio dello span corrente (o di parent, se indicato).
+        Lo span deve essere chiuso con end(); vedere anche span() e attach().
+
+        Returns:
+            Span o NonRecordingSpan
+        """
+        if not self.enabled:
+            return _DISABLED_SPAN
+        if parent is None:
+            parent = _current_span.get()
+        if parent is not None:
+            if not parent.sampled:
+                # Trace non campionato: i figli riusano il contesto del padre
+                return parent
+            return Span(self, name, parent.trace_id, parent.span_id, kind, attributes)
+
+        trace_id = "%032x" % random.getrandbits(128)
+        if random.random() >= self.sample_rate:
+            return NonRecordingSpan(trace_id)
+        return Span(self, name, trace_id, None, kind, attributes)
+
+    @contextmanager
+    def span(self, name, kind=SPAN_KIND_INTERNAL, attributes=None):
+        """
+        Context manager che crea uno span, lo rende corrente e lo chiude all'uscita.
+        Le eccezioni vengono registrate sullo span e rilanciate.
+        """
+        span = self.start_span(name, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _on_end(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped_spans += 1
+
+    def _build_payload(self, spans):
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "ssem"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def flush(self):
+        """Esporta tutti gli span in coda."""
+        while True:
+            batch = []
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            try:
+                self.exporter.export(self._build_payload(batch))
+            except Exception as e:
+                logger.warning(f"Errore nell'esportazione di {len(batch)} span: {e}")
+
+    def _export_loop(self):
+        while not self._stop_event.wait(self.export_interval):
+            self.flush()
+        self.flush()
+
+    def shutdown(self):
+        """Ferma il thread di esportazione dopo aver esportato gli span rimasti."""
+        if self._thread:
+            self._stop_event.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+def attach(span):
+    """
+    Rende corrente uno span creato con start_span().
+
+    Returns:
+        Token da passare a detach()
+    """
+    return _current_span.set(span)
+
+
+def detach(token):
+    """Ripristina lo span corrente precedente a attach()."""
+    _current_span.reset(token)
+
+
+def get_current_span():
+    """Restituisce lo span corrente o None."""
+    return _current_span.get()
+
+
+def parse_traceparent(header):
+    """
+    Interpreta un header W3C traceparent per proseguire un trace esterno.
+
+    Args:
+        header (str): Valore dell'header traceparent
+
+    Returns:
+        NonRecordingSpan: Contesto padre (sampled impostato dal flag) o None se non valido
+    """
+    try:
+        version, trace_id, span_id, flags = header.strip().split("-")
+        if len(trace_id) != 32 or len(span_id) != 16 or int(trace_id, 16) == 0:
+            return None
+        parent = NonRecordingSpan(trace_id, span_id)
+        if int(flags, 16) & 0x01:
+            # Il chiamante ha campionato il trace: gli span locali lo seguono
+            parent = _RemoteSpan(trace_id, span_id)
+        return parent
+    except (ValueError, AttributeError):
+        return None
+
+
+class _RemoteSpan(NonRecordingSpan):
+    """Contesto padre remoto campionato."""
+
+    __slots__ = ()
+    sampled = True
+
+
+@contextmanager
+def traced_lock(lock, name):
+    """
+    Acquisisce un lock registrando l'attesa come span dedicato.
+
+    Args:
+        lock: Lock o RLock da acquisire
+        name (str): Prefisso del nome dello span (es. "aurora.session")
+    """
+    span = tracer.start_span(f"{name}.lock_wait")
+    lock.acquire()
+    span.end()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def configure_tracing(config, default_directory):
+    """
+    Configura il tracer globale dalla sezione [TRACING] della configurazione generale.
+
+    Args:
+        config (configparser.ConfigParser): Configurazione generale (ssem_config.ini)
+        default_directory (str): Directory predefinita per il file dei trace
+    """
+    enabled = config.getboolean("TRACING", "enabled", fallback=False)
+    if not enabled:
+        tracer.configure(False)
+        return
+
+    exporter_type = config.get("TRACING", "exporter", fallback="file").lower()
+    if exporter_type == "otlp":
+        endpoint = config.get("TRACING", "otlp_endpoint", fallback="http://localhost:4318")
+        exporter = OTLPHttpSpanExporter(endpoint)
+        destination = exporter.url
+    else:
+        path = config.get("TRACING", "file_path", fallback="") or os.path.join(default_directory, "traces.jsonl")
+        exporter = FileSpanExporter(path)
+        destination = path
+
+    sample_rate = config.getfloat("TRACING", "sample_rate", fallback=0.1)
+    tracer.configure(
+        True,
+        sample_rate=sample_rate,
+        exporter=exporter,
+        export_interval=config.getfloat("TRACING", "export_interval", fallback=5.0),
+        max_queue_size=config.getint("TRACING", "max_queue_size", fallback=2048)
+    )
+    logger.info(f"Tracciamento abilitato (campionamento {sample_rate:.0%}, destinazione: {destination})")
+
+
+# Tracer globale usato da tutta l'applicazione
+tracer = Tracer()
@@ -1,14 +1,88 @@
 """
 Package per le route del sistema di monitoraggio fotovoltaico.
 """
-from flask import Blueprint, render_template
+import time
+
+from flask import Blueprint, render_template, Response, request, g
 
 # Importa il blueprint delle API
 from solar_routes.api import api_bp
+from services.metrics import registry, CONTENT_TYPE_LATEST
+from services.tracing import tracer, attach, detach, parse_traceparent, SPAN_KIND_SERVER, STATUS_ERROR
 
 # Crea il blueprint principale
 main_bp = Blueprint('main', __name__)
 
+# Metriche delle richieste HTTP servite da Flask
+HTTP_REQUESTS = registry.counter(
+    "ssem_http_requests_total",
+    "Numero di richieste HTTP per route, metodo e codice di stato",
+    ["route", "method", "status"]
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "ssem_http_request_duration_seconds",
+    "Durata delle richieste HTTP per route",
+    ["route"]
+)
+
+@main_bp.before_app_request
+def start_request_timer():
+    """Memorizza l'istante di inizio della richiesta e apre lo span della richiesta."""
+    g.request_start = time.perf_counter()
+    
+    # Prosegue un eventuale trace del chiamante (header W3C traceparent)
+    parent = parse_traceparent(request.headers.get('traceparent', ''))
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    span = tracer.start_span(f"{request.method} {route}", kind=SPAN_KIND_SERVER, parent=parent, attributes={
+        "http.method": request.method,
+        "http.route": route,
+        "http.target": request.full_path
+    })
+    g.request_span = span
+    g.request_span_token = attach(span)
+
+@main_bp.after_app_request
+def record_request_metrics(response):
+    """
+    Registra durata ed esito della richiesta.
+
+    Args:
+        response: Risposta Flask
+
+    Returns:
+        Response: La stessa risposta, invariata
+    """
+    start = g.pop('request_start', None)
+    # Usa il pattern della route (non l'URL) per limitare il numero di serie
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    if start is not None:
+        HTTP_REQUEST_DURATION.labels(route).observe(time.perf_counter() - start)
+    HTTP_REQUESTS.labels(route, request.method, response.status_code).inc()
+    
+    span = g.get('request_span')
+    if span is not None:
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.set_status(STATUS_ERROR)
+    return response
+
+@main_bp.teardown_app_request
+def end_request_span(exception=None):
+    """Chiude lo span della richiesta, anche in caso di eccezione."""
+    span = g.pop('request_span', None)
+    token = g.pop('request_span_token', None)
+    if span is None:
+        return
+    if exception is not None:
+        span.record_exception(exception)
+    if token is not None:
+        try:
+            detach(token)
+        except ValueError:
+            # Il token appartiene a un altro contesto (es. risposte in streaming)
+            pass
+    span.end()
+
 @main_bp.route('/')
 def index():
     """
@@ -19,7 +93,17 @@ def index():
     """
     return render_template('index.html')
 
+@main_bp.route('/metrics')
+def metrics():
+    """
+    Espone le metriche dell'applicazione nel formato testo Prometheus.
+
+    Returns:
+        Response: Metriche in formato testo
+    """
+    return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE_LATEST)
+
 # Lista di tutti i blueprint
 blueprints = [main_bp, api_bp]
 
-__all__ = ['blueprints']
\ No newline at end of file
+__all__ = ['blueprints']
@@ -1,21 +1,84 @@
 """
 Route API per il sistema di monitoraggio fotovoltaico.
 """
-from flask import Blueprint, jsonify, current_app
+import csv
+import io
+import json
+import math
+import time
+from datetime import datetime
+
+from flask import Blueprint, jsonify, current_app, request, Response, stream_with_context
+
+from services import events
+from services.readings_store import RESOLUTIONS
 
 # Crea il blueprint per le API
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Parametri di query per filtro, ordinamento e paginazione di /api/plants
+PLANT_QUERY_PARAMS = ('status', 'type', 'provider', 'group', 'account', 'sort', 'order', 'cursor', 'limit')
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Parametri dello storico (/api/history)
+HISTORY_FORMATS = ('ndjson', 'csv')
+MAX_HISTORY_PLANTS = 5000
+DEFAULT_HISTORY_RANGE = 86400  # Ultime 24 ore
+MAX_TIMESTAMP = 253402300799  # 9999-12-31 23:59:59 UTC, ultimo istante rappresentabile
+RAW_HISTORY_FIELDS = ('plant', 'timestamp', 'power', 'energy_today', 'is_online', 'status')
+AGGREGATED_HISTORY_FIELDS = ('plant', 'timestamp', 'power_avg', 'power_max', 'energy_today',
+                             'online_ratio', 'samples')
+
+# Ricerca nei log (/api/logs)
+LOG_FORMATS = ('json', 'text')
+DEFAULT_LOG_LIMIT = 500
+DEFAULT_LOG_RANGE = 86400  # Ultime 24 ore
+
+# Flusso degli eventi (/api/events)
+EVENTS_KEEPALIVE = 15  # Secondi tra i commenti di keep-alive (rilevano anche i client disconnessi)
+EVENTS_QUEUE_SIZE = 500  # Eventi conservati per un client lento
+
 @api_bp.route('/plants')
 def get_plants():
     """
-    Restituisce lo stato di tutti gli impianti.
+    Restituisce lo stato degli impianti.
+    
+    Senza parametri restituisce tutti gli impianti come dizionario (formato storico).
+    Con almeno uno dei parametri status, type, provider, group, account, sort, order,
+    cursor o limit restituisce una pagina di risultati con cursore per la pagina successiva.
     
     Returns:
-        JSON: Stato di tutti gli impianti
+        JSON: Stato degli impianti
     """
     plant_manager = current_app.config['PLANT_MANAGER']
-    return jsonify(plant_manager.get_all_plants())
+    
+    if not any(param in request.args for param in PLANT_QUERY_PARAMS):
+        return jsonify(plant_manager.get_all_plants())
+    
+    filters = {
+        field: request.args.get(field)
+        for field in ('status', 'type', 'provider', 'group', 'account')
+        if request.args.get(field)
+    }
+    sort = request.args.get('sort', 'id')
+    order = request.args.get('order', 'asc').lower()
+    
+    try:
+        limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Ordine non supportato: {order}")
+        result = plant_manager.query_plants(
+            filters=filters,
+            sort=sort,
+            descending=(order == 'desc'),
+            cursor=request.args.get('cursor'),
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(result)
 
 @api_bp.route('/plants/<plant_id>')
 def get_plant(plant_id):
@@ -96,14 +159,14 @@ def get_status():
     """
     plant_manager = current_app.config['PLANT_MANAGER']
     
-    # Calcola statistiche
-    plants = plant_manager.get_all_plants()
-    total_plants = len(plants)
-    online_plants = sum(1 for plant in plants.values() if plant['is_online'] and plant['power'] > 0)
-    offline_plants = sum(1 for plant in plants.values() if not plant['is_online'])
-    warning_plants = sum(1 for plant in plants.values() if plant['is_online'] and plant['power'] <= 0)
-    
-    total_power = sum(plant['power'] for plant in plants.values() if plant['is_online'])
+    # Calcola statistiche da un unico snapshot, così conteggi e potenza sono coerenti
+    # ("Online" = in produzione, "Inattivo" = connesso senza produzione, il resto è offline)
+    snapshot = plant_manager.snapshot
+    counts = snapshot.status_counts
+    total_plants = len(snapshot)
+    online_plants = counts.get('online', 0)
+    warning_plants = counts.get('inattivo', 0)
+    offline_plants = total_plants - online_plants - warning_plants
     
     return jsonify({
         "status": "active" if plant_manager.monitoring_active else "inactive",
@@ -113,6 +176,231 @@ def get_status():
             "online_plants": online_plants,
             "offline_plants": offline_plants,
             "warning_plants": warning_plants,
-            "total_power": round(total_power, 2)
+            "stale_plants": snapshot.stale_count,
+            "total_power": round(snapshot.total_power, 2)
+        },
+        "snapshot": {
+            "version": snapshot.version,
+            "created_at": snapshot.created_at
         }
-    })
\ No newline at end of file
+    })
+
+@api_bp.route('/northbound/stations')
+def get_northbound_stations():
+    """
+    Restituisce i metadati delle stazioni Northbound (nome, capacità, coordinate).
+    Con refresh=1 la cache viene invalidata e i metadati riletti dall'API.
+    
+    Returns:
+        JSON: Metadati delle stazioni
+    """
+    plant_manager = current_app.config['PLANT_MANAGER']
+    refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+    stations = plant_manager.get_station_metadata(refresh=refresh)
+    
+    if stations is None:
+        return jsonify({"error": "API Northbound non configurata"}), 404
+    return jsonify({"stations": stations, "total": len(stations)})
+
+def _parse_time(value, default):
+    """
+    Converte un parametro temporale (timestamp Unix o data ISO 8601) in timestamp Unix.
+    
+    Args:
+        value: Valore del parametro
+        default (float): Valore da usare se il parametro è assente
+    
+    Returns:
+        float: Timestamp Unix
+    
+    Raises:
+        ValueError: Se il valore non è riconosciuto
+    """
+    if value is None or value == '':
+        return default
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        timestamp = float(value)
+    elif isinstance(value, str):
+        try:
+            timestamp = float(value)
+        except ValueError:
+            try:
+                timestamp = datetime.fromisoformat(value).timestamp()
+            except (ValueError, OverflowError, OSError):
+                raise ValueError(f"Data non valida: {value}")
+    else:
+        raise ValueError(f"Data non valida: {value}")
+    # Esclude inf, nan e valori non rappresentabili come interi SQLite o date
+    if not math.isfinite(timestamp) or not 0 <= timestamp <= MAX_TIMESTAMP:
+        raise ValueError(f"Data fuori intervallo: {value}")
+    return timestamp
+
+def _history_rows(rows, aggregated):
+    """Converte le righe dell'archivio in dizionari con timestamp ISO 8601."""
+    fields = AGGREGATED_HISTORY_FIELDS if aggregated else RAW_HISTORY_FIELDS
+    for row in rows:
+        item = dict(zip(fields, row))
+        item['timestamp'] = datetime.fromtimestamp(item['timestamp']).astimezone().isoformat()
+        if aggregated:
+            item['power_avg'] = round(item['power_avg'], 3)
+            item['online_ratio'] = round(item['online_ratio'], 3)
+        else:
+            item['is_online'] = bool(item['is_online'])
+        yield item
+
+def _stream_ndjson(rows):
+    """Serializza le righe in formato NDJSON, una riga per lettura."""
+    for item in rows:
+        yield json.dumps(item, separators=(',', ':')) + '\n'
+
+def _stream_csv(rows, fields):
+    """Serializza le righe in formato CSV, intestazione compresa."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    for item in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([item[field] for field in fields])
+        yield buffer.getvalue()
+
+@api_bp.route('/history', methods=['GET', 'POST'])
+def get_history():
+    """
+    Restituisce lo storico delle letture di più impianti in streaming.
+    
+    Parametri (query string per GET, corpo JSON per POST con molti impianti):
+    plants (chiavi separate da virgola o lista; default tutti), from e to
+    (timestamp Unix o ISO 8601; default ultime 24 ore), resolution
+    (raw, 5m, 15m, 1h, 1d) e format (ndjson o csv).
+    
+    Returns:
+        Response: Letture in streaming, impianto per impianto
+    """
+    plant_manager = current_app.config['PLANT_MANAGER']
+    store = plant_manager.readings_store
+    if store is None:
+        return jsonify({"error": "Archivio delle letture non disponibile"}), 503
+    
+    if request.method == 'POST':
+        params = request.get_json(silent=True)
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            return jsonify({"error": "Il corpo della richiesta deve essere un oggetto JSON"}), 400
+        plants = params.get('plants')
+    else:
+        params = request.args
+        plants = ','.join(request.args.getlist('plants'))
+    if isinstance(plants, str):
+        plants = [key.strip() for key in plants.split(',') if key.strip()]
+    if not plants:
+        plants = sorted(plant_manager.plants.keys())
+    
+    resolution = str(params.get('resolution', 'raw'))
+    output_format = str(params.get('format', 'ndjson')).lower()
+    
+    try:
+        if not isinstance(plants, list) or not all(isinstance(key, str) for key in plants):
+            raise ValueError("Il parametro plants deve essere una lista di chiavi")
+        if len(plants) > MAX_HISTORY_PLANTS:
+            raise ValueError(f"Troppi impianti richiesti (massimo {MAX_HISTORY_PLANTS})")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Risoluzione non supportata: {resolution}")
+        if output_format not in HISTORY_FORMATS:
+            raise ValueError(f"Formato non supportato: {output_format}")
+        end = _parse_time(params.get('to'), time.time())
+        start = _parse_time(params.get('from'), end - DEFAULT_HISTORY_RANGE)
+        if start >= end:
+            raise ValueError("L'inizio dell'intervallo deve precedere la fine")
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    
+    aggregated = RESOLUTIONS[resolution] is not None
+    rows = _history_rows(store.iter_history(plants, start, end, resolution), aggregated)
+    
+    if output_format == 'csv':
+        fields = AGGREGATED_HISTORY_FIELDS if aggregated else RAW_HISTORY_FIELDS
+        response = Response(stream_with_context(_stream_csv(rows, fields)), mimetype='text/csv')
+        response.headers['Content-Disposition'] = 'attachment; filename=history.csv'
+        return response
+    
+    return Response(stream_with_context(_stream_ndjson(rows)), mimetype='application/x-ndjson')
+
+@api_bp.route('/events')
+def plant_events():
+    """
+    Flusso Server-Sent Events delle transizioni di stato degli impianti.
+    
+    Parametro opzionale types: tipi di evento separati da virgola
+    (plant.online, plant.offline, plant.power_zero, plant.error_changed).
+    
+    Returns:
+        Response: Flusso text/event-stream (un evento per transizione)
+    """
+    types = [event_type for event_type in request.args.get('types', '').split(',') if event_type]
+    unknown = [event_type for event_type in types if event_type not in events.EVENT_TYPES]
+    if unknown:
+        return jsonify({"error": f"Tipi di evento non supportati: {', '.join(unknown)}"}), 400
+    
+    plant_manager = current_app.config['PLANT_MANAGER']
+    subscription = plant_manager.events.subscribe("sse", types or None, maxsize=EVENTS_QUEUE_SIZE)
+    
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                event = subscription.get(timeout=EVENTS_KEEPALIVE)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.to_dict())}\n\n"
+        finally:
+            subscription.close()
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@api_bp.route('/logs')
+def get_logs():
+    """
+    Cerca nei file di log (anche ruotati e compressi) usando l'indice per impianto, livello e ora.
+    
+    Parametri opzionali: plant (chiave o nome dell'impianto), level (livello minimo),
+    from e to (timestamp Unix o ISO 8601; default ultime 24 ore), limit (record più
+    recenti restituiti) e format (json o text).
+    
+    Returns:
+        JSON o testo: Record di log in ordine cronologico
+    """
+    log_index = current_app.config.get('LOG_INDEX')
+    if log_index is None or not log_index.available():
+        return jsonify({"error": "Log su file non disponibile"}), 503
+    
+    plant = request.args.get('plant')
+    if plant:
+        # Le chiavi sono convertite nel nome dell'impianto, che è quello scritto nei log
+        plant_data = current_app.config['PLANT_MANAGER'].get_plant(plant)
+        if plant_data:
+            plant = plant_data['name']
+    output_format = request.args.get('format', 'json').lower()
+    
+    try:
+        if output_format not in LOG_FORMATS:
+            raise ValueError(f"Formato non supportato: {output_format}")
+        limit = int(request.args.get('limit', DEFAULT_LOG_LIMIT))
+        if limit <= 0:
+            raise ValueError("Il limite deve essere positivo")
+        end = _parse_time(request.args.get('to'), time.time())
+        start = _parse_time(request.args.get('from'), end - DEFAULT_LOG_RANGE)
+        records = log_index.search(plant=plant, level=request.args.get('level'),
+                                   start=start, end=end, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if output_format == 'text':
+        lines = [f"{record['timestamp']} - {record['logger']} - {record['level']} - {record['message']}"
+                 for record in records]
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; charset=utf-8')
+    return jsonify({"records": records, "total": len(records)})
@@ -0,0 +1,153 @@
+"""
+Entry point a riga di comando di SSEM, anche senza interfaccia grafica.
+
+    python -m ssem serve   # Server headless (es. servizio systemd su Linux)
+    python -m ssem check   # Verifica delle connessioni (vedi services.preflight)
+    python -m ssem gui     # Pannello di controllo (come python app.py)
+
+In modalità serve il processo termina in modo ordinato con SIGTERM/SIGINT, ricarica le
+configurazioni con SIGHUP e, se avviato da systemd, notifica READY/RELOADING/STOPPING
+e invia il watchdog finché il server HTTP è attivo e il monitoraggio non si è fermato
+senza essere stato arrestato.
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+from services import paths, systemd
+
+logger = logging.getLogger("SSEM")
+
+
+def _status(plant_manager):
+    """Riga di stato per systemd (mostrata da systemctl status)."""
+    snapshot = plant_manager.snapshot
+    online = sum(snapshot.status_counts.get(status, 0) for status in ("online", "inattivo"))
+    return f"STATUS={online}/{len(snapshot)} impianti online"
+
+
+def serve(args):
+    """
+    Avvia il server headless e attende i segnali di arresto e ricarica.
+    
+    Returns:
+        int: Codice di uscita
+    """
+    # La directory dati va impostata prima di importare app (che la crea all'import)
+    if args.data_dir:
+        os.environ["SSEM_DATA_DIR"] = os.path.abspath(args.data_dir)
+    import app as ssem_app
+    from werkzeug.serving import make_server
+    
+    config_dir = os.path.abspath(args.config_dir or paths.config_dir())
+    ssem_app.setup_logging(log_file=args.log_file, config_dir=config_dir)
+    logger.info(f"Avvio headless (configurazione: {config_dir}, dati: {ssem_app.app_data_dir})")
+    
+    flask_app = ssem_app.create_app(config_dir)
+    server = make_server(args.host, args.port, flask_app, threaded=True)
+    
+    stop_requested = threading.Event()
+    reload_requested = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_requested.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_requested.set())
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_requested.set())
+    
+    http_thread = threading.Thread(target=server.serve_forever, name="http", daemon=True)
+    http_thread.start()
+    ssem_app.plant_manager.start_monitoring()
+    ssem_app.server_running = True
+    logger.info(f"Server SSEM in ascolto su http://{args.host}:{args.port}")
+    systemd.notify("READY=1", _status(ssem_app.plant_manager))
+    
+    watchdog = systemd.watchdog_interval()
+    next_watchdog = time.monotonic()
+    while not stop_requested.is_set():
+        stop_requested.wait(min(watchdog or 1.0, 1.0))
+        
+        if reload_requested.is_set():
+            reload_requested.clear()
+            logger.info("SIGHUP ricevuto, ricarico le configurazioni")
+            systemd.notify("RELOADING=1", f"MONOTONIC_USEC={int(time.monotonic() * 1e6)}")
+            try:
+                ssem_app.reload_app(flask_app, config_dir)
+            except Exception as e:
+                logger.error(f"Ricarica delle configurazioni fallita, resta attiva la precedente: {e}")
+            systemd.notify("READY=1", _status(ssem_app.plant_manager))
+        
+        # Il watchdog non è inviato (e systemd riavvia) se il server HTTP è terminato o se il
+        # thread di monitoraggio è terminato senza che il monitoraggio sia stato fermato
+        # (un arresto richiesto, es. da /api/monitoring/stop, azzera monitoring_active)
+        if watchdog and time.monotonic() >= next_watchdog:
+            plant_manager = ssem_app.plant_manager
+            monitor = plant_manager.monitoring_thread
+            monitor_crashed = plant_manager.monitoring_active and monitor is not None and not monitor.is_alive()
+            if not http_thread.is_alive():
+                logger.error("Server HTTP non attivo, watchdog non inviato")
+            elif monitor_crashed:
+                logger.error("Monitoraggio terminato inaspettatamente, watchdog non inviato")
+            else:
+                systemd.notify("WATCHDOG=1", _status(plant_manager))
+            next_watchdog = time.monotonic() + watchdog
+    
+    logger.info("Arresto del server SSEM...")
+    systemd.notify("STOPPING=1")
+    server.shutdown()
+    ssem_app.stop_server()
+    logger.info("Server SSEM arrestato")
+    return 0
+
+
+def check(args):
+    """Esegue la verifica delle connessioni (services.preflight)."""
+    from services import preflight
+    return preflight.main(args.preflight_args)
+
+
+def run_gui(args):
+    """Avvia il pannello di controllo."""
+    import app as ssem_app
+    import gui
+    ssem_app.setup_logging()
+    return gui.run(ssem_app)
+
+
+def main(argv=None):
+    """
+    Entry point da riga di comando.
+    
+    Returns:
+        int: Codice di uscita
+    """
+    parser = argparse.ArgumentParser(prog="ssem", description="SSEM - monitoraggio di impianti fotovoltaici")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    serve_parser = commands.add_parser("serve", help="Avvia il server senza interfaccia grafica")
+    serve_parser.add_argument("--config-dir", default=None,
+                              help="Directory di configurazione (default: SSEM_CONFIG_DIR, ./config o ~/.config/ssem)")
+    serve_parser.add_argument("--data-dir", default=None,
+                              help="Directory dei dati (default: SSEM_DATA_DIR, %%APPDATA%%/SSEM o ~/.local/share/ssem)")
+    serve_parser.add_argument("--host", default="0.0.0.0", help="Indirizzo di ascolto")
+    serve_parser.add_argument("--port", type=int, default=5000, help="Porta di ascolto")
+    serve_parser.add_argument("--log-file", action="store_true",
+                              help="Scrive anche ssem.log nella directory dei dati (default: solo stderr)")
+    serve_parser.set_defaults(handler=serve)
+    
+    check_parser = commands.add_parser("check", help="Verifica la connettività di tutti gli impianti",
+                                       add_help=False)
+    check_parser.add_argument("preflight_args", nargs=argparse.REMAINDER)
+    check_parser.set_defaults(handler=check)
+    
+    gui_parser = commands.add_parser("gui", help="Avvia il pannello di controllo")
+    gui_parser.set_defaults(handler=run_gui)
+    
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -173,6 +173,12 @@ function createPlantCard(plant) {
     powerEl.textContent = plant.power + ' kW';
     updateTimeEl.textContent = 'Aggiornato: ' + plant.last_update;
     
+    // Stato ripristinato dall'ultimo snapshot, in attesa del primo controllo reale
+    if (plant.stale) {
+        updateTimeEl.textContent += ' (ultimo stato noto, in attesa di aggiornamento)';
+        card.classList.add('plant-stale');
+    }
+    
     // Determina se l'impianto ha potenza zero mentre è online
     const isZeroPower = plant.is_online && plant.power <= 0;
     
@@ -213,6 +219,110 @@ function createPlantCard(plant) {
     return clone;
 }
 
+/**
+ * Card degli impianti presenti nella pagina, indicizzate per chiave impianto.
+ * Ogni voce contiene l'elemento DOM e la firma dei dati con cui è stato creato.
+ */
+const plantCards = new Map();
+
+// Numero di impianti richiesti per ogni pagina di /api/plants
+const PLANTS_PAGE_SIZE = 500;
+
+/**
+ * Scarica tutti gli impianti seguendo la paginazione a cursore di /api/plants
+ * @returns {Promise<Array>} - Lista degli impianti
+ */
+function fetchAllPlants() {
+    const plants = [];
+    
+    function fetchPage(cursor) {
+        let url = `/api/plants?limit=${PLANTS_PAGE_SIZE}`;
+        if (cursor) {
+            url += `&cursor=${encodeURIComponent(cursor)}`;
+        }
+        return fetch(url)
+            .then(response => response.json())
+            .then(page => {
+                plants.push(...page.plants);
+                return page.next_cursor ? fetchPage(page.next_cursor) : plants;
+            });
+    }
+    
+    return fetchPage(null);
+}
+
+/**
+ * Calcola la firma dei dati visualizzati in una card
+ * @param {Object} plant - Dati dell'impianto
+ * @returns {string} - Firma usata per capire se la card va ricreata
+ */
+function plantSignature(plant) {
+    return [plant.name, plant.power, plant.is_online, plant.last_update, plant.error_message, plant.stale].join('|');
+}
+
+/**
+ * Rimuove tutte le card e svuota l'indice delle card
+ * @param {string} html - Contenuto da mostrare al posto delle card
+ */
+function resetPlantsContainer(html) {
+    plantCards.clear();
+    document.getElementById('plantsContainer').innerHTML = html;
+}
+
+/**
+ * Aggiorna le card nel DOM ricreando solo quelle cambiate
+ * @param {Array} plants - Lista ordinata degli impianti
+ */
+function renderPlants(plants) {
+    const plantsContainer = document.getElementById('plantsContainer');
+    
+    // Rimuove messaggi di caricamento o errore lasciati nel contenitore
+    Array.from(plantsContainer.children).forEach(child => {
+        if (!child.dataset.plantKey) {
+            child.remove();
+        }
+    });
+    
+    const seen = new Set();
+    let previous = null;
+    
+    plants.forEach(plant => {
+        seen.add(plant.key);
+        const signature = plantSignature(plant);
+        let entry = plantCards.get(plant.key);
+        
+        if (!entry || entry.signature !== signature) {
+            try {
+                const element = createPlantCard(plant).firstElementChild;
+                element.dataset.plantKey = plant.key;
+                if (entry) {
+                    plantsContainer.replaceChild(element, entry.element);
+                }
+                entry = { element, signature };
+                plantCards.set(plant.key, entry);
+            } catch (error) {
+                console.error('Errore nella creazione della card per l\'impianto:', plant.name, error);
+                if (!entry) return;
+            }
+        }
+        
+        // Sposta la card solo se non è già nella posizione corretta
+        const expected = previous ? previous.nextSibling : plantsContainer.firstChild;
+        if (entry.element !== expected) {
+            plantsContainer.insertBefore(entry.element, expected);
+        }
+        previous = entry.element;
+    });
+    
+    // Rimuove le card degli impianti non più presenti
+    plantCards.forEach((entry, key) => {
+        if (!seen.has(key)) {
+            entry.element.remove();
+            plantCards.delete(key);
+        }
+    });
+}
+
 /**
  * Aggiorna le informazioni degli impianti
  */
@@ -221,21 +331,16 @@ function updatePlants() {
     refreshBtn.disabled = true;
     refreshBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Aggiornamento...';
     
-    fetch('/api/plants')
-        .then(response => response.json())
+    fetchAllPlants()
         .then(plants => {
-            const plantsContainer = document.getElementById('plantsContainer');
-            plantsContainer.innerHTML = '';
-            
             let onlineCount = 0;
             let warningCount = 0;
             let offlineCount = 0;
             let newHasOfflineImpianti = false; // Resetta lo stato offline
             let newHasZeroPowerImpianti = false; // Resetta lo stato potenza zero
             
-            // Mostra tutti gli impianti
-            Object.entries(plants).forEach(([plantId, plant]) => {
-                // Determina lo stato dell'impianto
+            // Determina lo stato di tutti gli impianti
+            plants.forEach(plant => {
                 if (plant.is_online) {
                     if (plant.power > 0) {
                         onlineCount++;
@@ -249,16 +354,11 @@ function updatePlants() {
                     offlineCount++;
                     newHasOfflineImpianti = true;
                 }
-                
-                // Crea e aggiungi la card usando il template
-                try {
-                    const plantCard = createPlantCard(plant);
-                    plantsContainer.appendChild(plantCard);
-                } catch (error) {
-                    console.error('Errore nella creazione della card per l\'impianto:', plant.name, error);
-                }
             });
             
+            // Aggiorna solo le card cambiate
+            renderPlants(plants);
+            
             // Aggiorna i contatori
             document.getElementById('onlineCount').textContent = onlineCount;
             document.getElementById('warningCount').textContent = warningCount;
@@ -294,17 +394,40 @@ function updatePlants() {
             refreshBtn.innerHTML = '<i class="bi bi-arrow-clockwise"></i> Aggiorna';
             
             // Mostra un messaggio di errore
-            const plantsContainer = document.getElementById('plantsContainer');
-            plantsContainer.innerHTML = `
+            resetPlantsContainer(`
                 <div class="col-12">
                     <div class="alert alert-danger">
                         Errore durante il recupero dei dati. Riprova più tardi.
                     </div>
                 </div>
-            `;
+            `);
         });
 }
 
+// Aggiornamento della dashboard guidato dagli eventi di transizione (/api/events)
+let eventRefreshTimeout = null;
+
+function subscribePlantEvents() {
+    if (!window.EventSource) {
+        return; // Resta l'aggiornamento periodico
+    }
+    
+    const source = new EventSource('/api/events');
+    const onPlantEvent = () => {
+        if (!monitoringActive || eventRefreshTimeout) {
+            return;
+        }
+        // Raggruppa le transizioni di uno stesso ciclo in un solo aggiornamento
+        eventRefreshTimeout = setTimeout(() => {
+            eventRefreshTimeout = null;
+            updatePlants();
+        }, 1000);
+    };
+    ['plant.online', 'plant.offline', 'plant.power_zero', 'plant.error_changed'].forEach(type => {
+        source.addEventListener(type, onPlantEvent);
+    });
+}
+
 /**
  * Forza l'aggiornamento di tutti gli impianti
  */
@@ -327,14 +450,13 @@ function forceUpdate() {
             refreshBtn.innerHTML = '<i class="bi bi-arrow-clockwise"></i> Aggiorna';
             
             // Mostra un messaggio di errore
-            const plantsContainer = document.getElementById('plantsContainer');
-            plantsContainer.innerHTML = `
+            resetPlantsContainer(`
                 <div class="col-12">
                     <div class="alert alert-danger">
                         Errore durante l'aggiornamento forzato. Riprova più tardi.
                     </div>
                 </div>
-            `;
+            `);
         });
 }
 
@@ -544,4 +666,7 @@ document.addEventListener('DOMContentLoaded', function() {
     if (monitoringActive) {
         autoRefreshInterval = setInterval(updatePlants, config.updateInterval);
     }
+    
+    // Aggiorna subito la dashboard quando un impianto cambia stato
+    subscribePlantEvents();
 });
\ No newline at end of file
@@ -0,0 +1,28 @@
+from flask import Flask
+
+from services import events
+from services.plant_manager import PlantManager
+from solar_routes.api import api_bp
+
+
+def test_events_stream_uses_plant_manager_bus(tmp_path):
+    bus = events.EventBus()
+    manager = PlantManager(config_dir=str(tmp_path / "config"), data_dir=str(tmp_path / "data"), event_bus=bus)
+    app = Flask(__name__)
+    app.config['PLANT_MANAGER'] = manager
+    app.register_blueprint(api_bp)
+
+    response = app.test_client().get('/api/events', buffered=False)
+    chunks = iter(response.response)
+    try:
+        assert next(chunks).startswith(b"retry:")
+        before = {"is_online": False, "status": "offline", "power": 0.0, "error_message": None}
+        after = {"is_online": True, "status": "online", "power": 1.5, "error_message": None}
+        events.bus.publish("plant.offline", "globale", "Globale", after, before)  # Non è il bus del gestore
+        bus.publish("plant.online", "demo", "Demo", before, after)
+
+        chunk = next(chunks).decode()
+        assert "event: plant.online\n" in chunk
+        assert '"demo"' in chunk
+    finally:
+        response.close()
@@ -0,0 +1,57 @@
+import json
+import time
+
+import pytest
+from flask import Flask
+
+from models.plant import Plant
+from services.plant_manager import PlantManager
+from solar_routes.api import api_bp
+
+
+class DemoPlant(Plant):
+    __slots__ = ()
+
+    def check_connection(self):
+        return self.update_status(1.5, 2.0, True)
+
+
+@pytest.fixture
+def client(tmp_path):
+    manager = PlantManager(config_dir=str(tmp_path / "config"), data_dir=str(tmp_path / "data"))
+    manager.add_plant("demo", DemoPlant("Demo", "demo", "Demo"))
+    manager.update_all_plants()
+    app = Flask(__name__)
+    app.config['PLANT_MANAGER'] = manager
+    app.register_blueprint(api_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("params", [
+    {"to": "inf"},
+    {"from": "nan"},
+    {"from": "-inf", "to": "1"},
+    {"to": "1e20"},
+    {"from": -1},
+    {"to": 1e20},
+])
+def test_history_rejects_out_of_range_times(client, params):
+    response = client.post('/api/history', json=params)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    assert client.get(f'/api/history?{query}').status_code == 400
+
+
+@pytest.mark.parametrize("body", [[], "x", 5, {"resolution": []}, {"from": []}, {"to": {"a": 1}}, {"from": True}])
+def test_history_rejects_malformed_bodies(client, body):
+    assert client.post('/api/history', json=body).status_code == 400
+
+
+def test_history_streams_readings(client):
+    # La fine dell'intervallo è esclusa: la lettura appena salvata richiede un "to" futuro
+    response = client.post('/api/history', json={"plants": ["demo"], "from": 0, "to": time.time() + 60})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(row["plant"], row["power"]) for row in rows] == [("demo", 1.5)]
@@ -0,0 +1,70 @@
+from models.plant import Plant
+from services.fleet import FleetSnapshot, PlantRecord
+
+
+def make_record(plant_id, power=1.0, online=True, group=None):
+    plant = Plant(f"Impianto {plant_id}", plant_id, "Demo", group=group)
+    plant.update_status(power, 0.0, online, None if online else "non raggiungibile")
+    return PlantRecord(plant)
+
+
+def make_snapshot(count=20):
+    records = {f"p{i}": make_record(f"p{i}", group="nord" if i % 2 else "sud") for i in range(count)}
+    return FleetSnapshot(1, records)
+
+
+def assert_same_state(snapshot, expected):
+    assert {field: dict(index) for field, index in snapshot.indexes.items()} == \
+        {field: dict(index) for field, index in expected.indexes.items()}
+    assert dict(snapshot.status_counts) == dict(expected.status_counts)
+    assert snapshot.total_power == expected.total_power
+    assert snapshot.stale_count == expected.stale_count
+
+
+def test_single_change_shares_untouched_buckets():
+    previous = make_snapshot()
+    changed = make_record("p3", power=0.0, online=False, group="nord")
+    snapshot = previous.updated({"p3": changed})
+
+    # Lo stato è cambiato: solo i gruppi di stato coinvolti sono ricostruiti
+    assert snapshot.indexes["status"] is not previous.indexes["status"]
+    # Gli indici dei campi non cambiati sono condivisi interi
+    for field in ("type", "provider", "group", "account"):
+        assert snapshot.indexes[field] is previous.indexes[field]
+    assert snapshot.records["p4"] is previous.records["p4"]
+    assert "p3" not in snapshot.indexes["status"]["online"]
+    assert snapshot.indexes["status"][changed.index_values[0]] == {"p3"}
+
+
+def test_power_only_change_shares_every_bucket():
+    previous = make_snapshot()
+    snapshot = previous.updated({"p5": make_record("p5", power=7.5, group="nord")})
+
+    for field in previous.indexes:
+        assert snapshot.indexes[field] is previous.indexes[field]
+    assert snapshot.status_counts is previous.status_counts
+    assert snapshot.total_power == previous.total_power - 1.0 + 7.5
+
+
+def test_incremental_update_matches_full_rebuild():
+    previous = make_snapshot()
+    changes = {
+        "p1": make_record("p1", power=0.0, online=False, group="nord"),
+        "p2": make_record("p2", power=3.0, group="est"),
+        "p99": make_record("p99", power=2.0),
+    }
+    snapshot = previous.updated(changes)
+
+    records = dict(previous.records)
+    records.update(changes)
+    assert_same_state(snapshot, FleetSnapshot(snapshot.version, records))
+    assert snapshot.version == previous.version + 1
+    assert len(snapshot) == 21
+    assert "sud" in snapshot.indexes["group"]
+
+
+def test_emptied_bucket_is_removed():
+    previous = FleetSnapshot(1, {"a": make_record("a", group="ovest"), "b": make_record("b")})
+    snapshot = previous.updated({"a": make_record("a", group=None)})
+
+    assert "ovest" not in snapshot.indexes["group"]
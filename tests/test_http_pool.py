@@ -0,0 +1,27 @@
+import configparser
+
+import pytest
+
+from services import http_pool
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setattr(http_pool, "settings", dict(http_pool.DEFAULT_HTTP_SETTINGS))
+    return http_pool.settings
+
+
+def read_config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def test_pool_maxsize_follows_polling_workers(settings):
+    http_pool.configure_http(read_config("[POLLING]\nmax_workers = 24\n"))
+    assert http_pool.settings["pool_maxsize"] == 24
+
+
+def test_explicit_pool_maxsize_wins(settings):
+    http_pool.configure_http(read_config("[HTTP]\npool_maxsize = 8\n[POLLING]\nmax_workers = 24\n"))
+    assert http_pool.settings["pool_maxsize"] == 8
@@ -0,0 +1,36 @@
+import time
+
+from services.log_index import LogIndex
+from services.log_pipeline import LOG_FILE
+
+
+def header(level, message):
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S')},000 - ssem - {level} - {message}\n"
+
+
+def test_search_reads_records_split_across_index_passes(tmp_path):
+    log_path = tmp_path / LOG_FILE
+    index = LogIndex(str(tmp_path), plant_names=lambda: ["Casa 1"])
+
+    with open(log_path, "w") as f:
+        f.write(header("INFO", "Avvio"))
+        f.write(header("ERROR", "Errore per Casa 1"))
+        f.write("Traceback (most recent call last):\n")
+    index.refresh()
+
+    # Il resto del record arriva dopo la passata, che ha chiuso il blocco a metà record
+    with open(log_path, "a") as f:
+        f.write('  File "app.py", line 1\n')
+        f.write("ValueError: prova\n")
+        f.write(header("INFO", "Ciclo completato"))
+
+    # La ricerca non indicizza: il record successivo compare solo dopo la prossima passata
+    records = index.search(plant="Casa 1", level="ERROR")
+    assert [record["message"] for record in records] == [
+        'Errore per Casa 1\nTraceback (most recent call last):\n  File "app.py", line 1\nValueError: prova'
+    ]
+    assert [record["message"] for record in index.search()] == ["Avvio", records[0]["message"]]
+
+    index.refresh()
+    messages = [record["message"] for record in index.search()]
+    assert messages == ["Avvio", records[0]["message"], "Ciclo completato"]
@@ -0,0 +1,26 @@
+import os
+
+from services import preflight
+
+
+def test_preflight_leaves_data_dir_untouched(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    data_dir = tmp_path / "data"
+    config_dir.mkdir()
+    data_dir.mkdir()
+    (data_dir / "aurora_session.json").write_text('{"cookies": {}}')
+    (data_dir / "ssem.log").write_text("")
+
+    copied = []
+    copy_saved_state = preflight._copy_saved_state
+
+    def record_copy(source_dir, target_dir):
+        copy_saved_state(source_dir, target_dir)
+        copied.extend(os.listdir(target_dir))
+
+    monkeypatch.setattr(preflight, "_copy_saved_state", record_copy)
+    assert preflight.run_preflight_from_config(str(config_dir), str(data_dir), deadline=5) == []
+
+    # Solo i file di stato degli account sono copiati, e la directory dei dati resta invariata
+    assert copied == ["aurora_session.json"]
+    assert sorted(os.listdir(data_dir)) == ["aurora_session.json", "ssem.log"]
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from services import providers
+
+
+def test_get_provider_waits_for_plugin_loading(monkeypatch):
+    monkeypatch.setattr(providers, "_providers", {})
+    monkeypatch.setattr(providers, "_plugins_loaded", False)
+    monkeypatch.setattr(providers, "_entry_points", lambda: [])
+    loading = threading.Event()
+    register = providers.register_provider
+
+    def slow_register(provider):
+        loading.set()
+        time.sleep(0.05)
+        return register(provider)
+
+    monkeypatch.setattr(providers, "register_provider", slow_register)
+    loader = threading.Thread(target=providers.load_plugins)
+    loader.start()
+    loading.wait(5)
+
+    # Durante la registrazione get_provider attende invece di restituire un Provider base
+    provider = providers.get_provider("FusionSolar-Northbound")
+    loader.join()
+    assert isinstance(provider, providers.FusionSolarNorthboundProvider)
+
+
+class FakeNorthboundManager:
+    """Gestore Northbound che registra le chiamate e risponde per le stazioni note."""
+
+    def __init__(self, realtime, hourly):
+        self.realtime = realtime
+        self.hourly = hourly
+        self.calls = []
+
+    def get_plant_list(self):
+        return [{"plantCode": code, "plantName": code, "capacity": 100} for code in self.realtime]
+
+    def get_station(self, plant_code):
+        return {"plantCode": plant_code, "capacity": 100}
+
+    def get_plant_realtime_data(self, plant_ids):
+        self.calls.append(("realtime", list(plant_ids)))
+        return [{"stationCode": code, "dataItemMap": {"day_power": 12.5, "real_power": 4.0}}
+                for code in plant_ids if code in self.realtime]
+
+    def get_plant_hourly_data(self, plant_ids, date=None):
+        self.calls.append(("hourly", list(plant_ids)))
+        return [{"stationCode": code, "collectTime": collect_time, "dataItemMap": {"inverter_power": power}}
+                for code in plant_ids for collect_time, power in self.hourly.get(code, [])]
+
+    def get_plant_daily_data(self, plant_ids, date=None):
+        self.calls.append(("daily", list(plant_ids)))
+        return []
+
+
+def test_northbound_fetch_batch_uses_one_request_per_kind():
+    from models.fusion_pyhfs_plant import FusionSolarNorthboundPlant
+
+    manager = FakeNorthboundManager(realtime={"NE1", "NE2"}, hourly={"NE3": [(1000, 1.0), (2000, "3.5")]})
+    plants = [FusionSolarNorthboundPlant(f"Impianto {code}", code, manager) for code in ("NE1", "NE2", "NE3", "NE4")]
+    for plant in plants:
+        plant.available = True
+
+    provider = providers.FusionSolarNorthboundProvider()
+    assert provider.native_batch and provider.batch_size > 1 and provider.requests_per_minute
+    assert provider.requests_for(plants) == 1
+
+    results = provider.fetch_batch(plants, time.monotonic() + 60)
+    assert results == [True, True, True, False]
+    assert manager.calls == [
+        ("realtime", ["NE1", "NE2", "NE3", "NE4"]),
+        ("hourly", ["NE3", "NE4"]),
+        ("daily", ["NE4"]),
+    ]
+    assert plants[0].power == 4.0 and plants[0].energy_today == 12.5
+    assert plants[2].power == 3.5  # Dato orario più recente
+    assert plants[3].error_message == "Dati non disponibili"
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import requests
+
+from services.session_managers import FusionSolarClientManager
+
+
+class FakeClient:
+    def __init__(self):
+        self._session = requests.Session()
+        self._session.cookies.set("JSESSIONID", "abc", domain="eu5.fusionsolar.huawei.com")
+        self._company_id = "company"
+
+
+class RecordingStore:
+    """Archivio che verifica che il lock del gestore sia libero durante la scrittura."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.saved = []
+
+    def save(self, cookies, expires_at, account, data):
+        free = []
+
+        def check():
+            free.append(self.manager.lock.acquire(timeout=1))
+            if free[0]:
+                self.manager.lock.release()
+
+        checker = threading.Thread(target=check)
+        checker.start()
+        checker.join()
+        self.saved.append((free[0], [cookie.name for cookie in cookies], data["login_time"]))
+        return True
+
+
+def test_fusion_persist_writes_outside_lock(tmp_path):
+    manager = FusionSolarClientManager({"username": "utente", "subdomain": "eu5"},
+                                       session_file=str(tmp_path / "fusion_session.json"))
+    manager.session_store = store = RecordingStore(manager)
+    client = FakeClient()
+    login_time = time.time()
+
+    manager._persist_client(client, login_time)
+    manager._persist_client(client, login_time)  # Stato invariato: nessun nuovo salvataggio
+
+    assert store.saved == [(True, ["JSESSIONID"], login_time)]
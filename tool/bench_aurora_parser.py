@@ -0,0 +1,106 @@
+"""
+Micro-benchmark del parser delle risposte AuroraVision.
+
+Confronta il parsing precedente (json della libreria standard, scansione di tutti i
+campi e data calcolata per impianto) con models.aurora_parser, su risposte registrate
+(file .json in una directory) o, in mancanza, su risposte sintetiche con la stessa forma.
+
+    python tool/bench_aurora_parser.py --responses risposte/ --rounds 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.aurora_parser import JSON_DECODER, parse_plant_energy, today_label  # noqa: E402
+
+
+def legacy_parse(content):
+    """Parsing come in AuroraVisionPlant.check_connection prima del parser dedicato."""
+    data = json.loads(content)
+    current_power = 0.0
+    energy_today = 0.0
+    if data.get("status") == "SUCCESS":
+        today = datetime.now().strftime("%Y-%m-%d")
+        for field in data.get("fields", []):
+            if field.get("label") == "today" and field.get("field") == "GenerationEnergy":
+                energy_today = float(field.get("value", 0))
+            if field.get("type") == "instant" and field.get("field") == "GenerationPower":
+                start_label = field.get("startLabel", "")
+                if start_label and today in start_label:
+                    current_power = float(field.get("value", 0))
+                else:
+                    current_power = 0.0
+    return current_power, energy_today
+
+
+def synthetic_response(index):
+    """Risposta PlantEnergy.json sintetica con campi di contorno come quelle reali."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    fields = []
+    for label in ("today", "week", "month", "year", "lifetime"):
+        fields.append({"type": "window", "field": "GenerationEnergy", "label": label,
+                       "value": str(10.5 * (index + 1)), "units": "kilowatt-hours",
+                       "startLabel": f"{today} 00:00:00", "endLabel": f"{today} 23:59:59"})
+    for field in ("GenerationPower", "PowerMax", "Irradiance", "CO2Saved"):
+        fields.append({"type": "instant", "field": field, "label": "now",
+                       "value": str(3.2 + index), "units": "kilowatts",
+                       "startLabel": f"{today} 12:15:00"})
+    return json.dumps({"status": "SUCCESS", "fields": fields}).encode("utf-8")
+
+
+def load_responses(directory):
+    """Legge le risposte registrate (file .json) da una directory."""
+    responses = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), "rb") as f:
+                responses.append(f.read())
+    return responses
+
+
+def bench(label, func, responses, rounds):
+    """Esegue func su tutte le risposte per rounds volte e restituisce i secondi totali."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in responses:
+            func(content)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(responses)) * 1e6
+    print(f"{label:<24} {elapsed:8.3f} s  {per_call:8.2f} us/risposta")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del parser AuroraVision")
+    parser.add_argument("--responses", help="Directory con risposte PlantEnergy.json registrate")
+    parser.add_argument("--plants", type=int, default=50, help="Risposte sintetiche se non registrate")
+    parser.add_argument("--rounds", type=int, default=2000, help="Ripetizioni (cicli di monitoraggio)")
+    args = parser.parse_args(argv)
+
+    responses = load_responses(args.responses) if args.responses else [
+        synthetic_response(i) for i in range(args.plants)
+    ]
+    if not responses:
+        print("Nessuna risposta da analizzare")
+        return 1
+
+    # I due parser devono estrarre gli stessi valori
+    today = today_label()
+    for content in responses:
+        reading = parse_plant_energy(content, today)
+        assert (reading.power, reading.energy_today) == legacy_parse(content), "Valori diversi"
+
+    print(f"{len(responses)} risposte, {args.rounds} cicli, decoder: {JSON_DECODER}")
+    legacy = bench("precedente", legacy_parse, responses, args.rounds)
+    fast = bench("models.aurora_parser", parse_plant_energy, responses, args.rounds)
+    print(f"Speedup: {legacy / fast:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
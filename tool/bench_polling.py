@@ -0,0 +1,74 @@
+"""
+Benchmark del polling contro il server di prova locale.
+
+Avvia tool/mock_server.py in un thread, scrive una configurazione che punta al server
+(chiave api_url), carica gli impianti con PlantManager ed esegue alcuni cicli di
+update_all_plants, riportando durata dei cicli, impianti al secondo, controlli riusciti
+e richieste ricevute dal server per endpoint ed esito.
+
+    python tool/bench_polling.py --plants 1000 --accounts 4 --concurrency 8 --latency 0.1 --cycles 3
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tool.mock_server import MockServer, parse_args, write_config  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del polling con il server di prova")
+    parser.add_argument("--cycles", type=int, default=3, help="Cicli di monitoraggio da eseguire")
+    parser.add_argument("--accounts", type=int, default=1, help="Account AuroraVision tra cui dividere gli impianti")
+    parser.add_argument("--northbound-accounts", type=int, default=0,
+                        help="Account Northbound (uno per stazione, richiede pyhfs)")
+    parser.add_argument("--concurrency", type=int, default=4, help="max_concurrent_checks di ogni account")
+    parser.add_argument("--workers", type=int, default=8, help="Thread di polling del PlantManager")
+    parser.add_argument("--verbose", action="store_true", help="Mostra i log dell'applicazione")
+    args = parse_args(argv, parser, port=0)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # Niente log di accesso del server
+
+    # Import dopo la configurazione del logging (il PlantManager registra molto all'avvio)
+    from services.plant_manager import PlantManager
+
+    server = MockServer(args).start()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            config_dir = os.path.join(work_dir, "config")
+            write_config(config_dir, server.url, args, args.accounts, args.northbound_accounts, args.concurrency)
+
+            start = time.perf_counter()
+            manager = PlantManager(config_dir=config_dir, data_dir=os.path.join(work_dir, "data"),
+                                   max_workers=args.workers)
+            manager.load_providers()
+            print(f"Server di prova su {server.url}: {len(manager.plants)} impianti caricati "
+                  f"in {time.perf_counter() - start:.2f} s")
+            if not manager.plants:
+                return 1
+
+            for cycle in range(1, args.cycles + 1):
+                start = time.perf_counter()
+                results = manager.update_all_plants()
+                elapsed = time.perf_counter() - start
+                succeeded = sum(1 for result in results.values() if result)
+                print(f"Ciclo {cycle}: {elapsed:7.2f} s  {len(results) / elapsed:8.1f} impianti/s  "
+                      f"{succeeded}/{len(manager.plants)} riusciti")
+
+        with server.state.lock:
+            stats = sorted(server.state.stats.items())
+        print("Richieste al server:")
+        for (endpoint, result), count in stats:
+            print(f"  {endpoint:<22} {result:<16} {count}")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
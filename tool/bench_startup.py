@@ -0,0 +1,85 @@
+"""
+Benchmark dell'avvio del server headless.
+
+Esegue in un processo separato, con -X importtime, l'import di app.py e create_app()
+(senza GUI né monitoraggio), poi riporta il tempo totale, gli import più costosi e
+quali moduli di GUI e fornitori sono stati caricati.
+
+    python tool/bench_startup.py --config-dir config --top 15
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Moduli che il server headless non dovrebbe caricare se non servono
+WATCHED_MODULES = ("PyQt5", "tkinter", "fusion_solar_py", "pyhfs", "onnxruntime", "numpy")
+
+CHILD_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import app
+app.create_app({config_dir!r})
+elapsed = time.perf_counter() - start
+loaded = [name for name in {watched!r} if name in sys.modules]
+print("SSEM_BENCH", elapsed, ",".join(loaded))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_child(config_dir, data_dir):
+    """Esegue l'avvio in un processo figlio e restituisce (secondi, moduli caricati, righe importtime)."""
+    env = dict(os.environ)
+    env["APPDATA"] = data_dir
+    script = CHILD_SCRIPT.format(config_dir=config_dir, watched=WATCHED_MODULES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    marker = [line for line in result.stdout.splitlines() if line.startswith("SSEM_BENCH")]
+    if result.returncode != 0 or not marker:
+        raise RuntimeError(f"Avvio fallito:\n{result.stderr[-2000:]}")
+    _, elapsed, loaded = (marker[-1].split(" ") + [""])[:3]
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+    return float(elapsed), [name for name in loaded.split(",") if name], imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dell'avvio del server headless")
+    parser.add_argument("--config-dir", default=os.path.join(ROOT, "config"),
+                        help="Directory dei file di configurazione (copiata in una directory temporanea)")
+    parser.add_argument("--runs", type=int, default=3, help="Avvii misurati (si riporta il migliore)")
+    parser.add_argument("--top", type=int, default=15, help="Import più costosi da mostrare")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = os.path.join(tmp, "config")
+        data_dir = os.path.join(tmp, "data")
+        shutil.copytree(args.config_dir, config_dir)
+        os.makedirs(data_dir)
+
+        runs = [run_child(config_dir, data_dir) for _ in range(max(1, args.runs))]
+
+    elapsed, loaded, imports = min(runs, key=lambda run: run[0])
+    print(f"Avvio (import di app + create_app): {elapsed:.3f} s (migliore di {len(runs)})")
+    print(f"Moduli di GUI/fornitori caricati: {', '.join(loaded) or 'nessuno'}")
+    print()
+    print(f"{'cumulativo':>12} {'proprio':>10}  modulo (solo import di primo livello)")
+    top_level = sorted((item for item in imports if item[2] == 0), reverse=True)[:args.top]
+    for cumulative_us, self_us, _level, module in top_level:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+"""
+Server locale che simula le API AuroraVision e FusionSolar Northbound.
+
+Implementa il login e PlantEnergy.json di AuroraVision e, per Northbound, login, lista
+impianti (stations), dati in tempo reale (getStationRealKpi), orari (getKpiStationHour)
+e giornalieri (getKpiStationDay), su una flotta sintetica di qualsiasi dimensione.
+Latenza, errori HTTP, risposte FrequencyLimit e scadenza delle sessioni sono
+configurabili, così il polling si può provare e misurare senza le API reali.
+
+    python tool/mock_server.py --plants 500 --stations 20 --latency 0.2 --error-rate 0.01 \\
+        --write-config mock_config
+    python ssem.py serve --config-dir mock_config
+
+I file scritti con --write-config puntano al server tramite la chiave api_url.
+GET /mock/stats restituisce il numero di richieste per endpoint ed esito.
+Vedi anche tool/bench_polling.py.
+"""
+import argparse
+import collections
+import configparser
+import math
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+AURORA_ENTITY_BASE = 100000  # ID delle entità AuroraVision sintetiche: 100000, 100001, ...
+NORTHBOUND_PAGE_SIZE = 100
+NORTHBOUND_BATCH_SIZE = 100  # Stazioni per richiesta ammesse dall'API reale
+
+# failCode dell'API Northbound
+FAIL_NOT_LOGGED = 305
+FAIL_FREQUENCY_LIMIT = 407
+FAIL_LOGIN = 20400
+
+
+def parse_args(argv=None, parser=None, port=8765):
+    """Opzioni del server (condivise con tool/bench_polling.py, che usa una porta libera)."""
+    parser = parser or argparse.ArgumentParser(description="Server di prova AuroraVision e FusionSolar Northbound")
+    group = parser.add_argument_group("server di prova")
+    group.add_argument("--host", default="127.0.0.1", help="Indirizzo di ascolto")
+    group.add_argument("--port", type=int, default=port, help="Porta di ascolto (0 = scelta dal sistema)")
+    group.add_argument("--plants", type=int, default=100, help="Impianti AuroraVision della flotta sintetica")
+    group.add_argument("--stations", type=int, default=10, help="Stazioni Northbound della flotta sintetica")
+    group.add_argument("--username", default="", help="Utente accettato dal login (default qualsiasi)")
+    group.add_argument("--password", default="", help="Password accettata dal login (default qualsiasi)")
+    group.add_argument("--latency", type=float, default=0.0, help="Latenza media di ogni risposta in secondi")
+    group.add_argument("--jitter", type=float, default=0.0, help="Variazione massima della latenza in secondi")
+    group.add_argument("--error-rate", type=float, default=0.0, help="Frazione di risposte HTTP 500")
+    group.add_argument("--frequency-limit-rate", type=float, default=0.0,
+                       help="Frazione di risposte FrequencyLimit (407 Northbound, 429 AuroraVision)")
+    group.add_argument("--max-rpm", type=int, default=0,
+                       help="Richieste al minuto per sessione oltre le quali si risponde FrequencyLimit (0 = nessun limite)")
+    group.add_argument("--offline-rate", type=float, default=0.0, help="Frazione di impianti senza dati di oggi")
+    group.add_argument("--session-ttl", type=int, default=3600, help="Durata delle sessioni in secondi")
+    group.add_argument("--seed", type=int, default=1, help="Seme della flotta sintetica")
+    return parser.parse_args(argv)
+
+
+class MockFleet:
+    """Flotta sintetica: capacità e stato di ogni impianto sono fissati dal seme."""
+
+    def __init__(self, plants, stations, offline_rate=0.0, seed=1):
+        rng = random.Random(seed)
+        self.aurora = {
+            str(AURORA_ENTITY_BASE + i): {
+                "capacity": round(rng.uniform(3, 200), 1),
+                "offline": rng.random() < offline_rate
+            }
+            for i in range(plants)
+        }
+        self.stations = {
+            f"NE={33000000 + i}": {
+                "plantCode": f"NE={33000000 + i}",
+                "plantName": f"Stazione {i + 1}",
+                "capacity": round(rng.uniform(50, 2000), 1),
+                "latitude": round(rng.uniform(36.5, 46.5), 4),
+                "longitude": round(rng.uniform(7.0, 18.0), 4),
+                "plantAddress": f"Via del Sole {i + 1}",
+                "offline": rng.random() < offline_rate
+            }
+            for i in range(stations)
+        }
+
+    @staticmethod
+    def sun_factor(moment=None):
+        """Frazione della capacità prodotta in un istante (curva tra le 6 e le 20)."""
+        moment = moment or datetime.now()
+        hour = moment.hour + moment.minute / 60
+        if not 6 <= hour <= 20:
+            return 0.0
+        return math.sin(math.pi * (hour - 6) / 14)
+
+    def power(self, capacity, moment=None):
+        """Potenza istantanea in kW, con una piccola variazione casuale."""
+        return round(capacity * self.sun_factor(moment) * random.uniform(0.7, 0.9), 3)
+
+    def energy_today(self, capacity, moment=None):
+        """Energia prodotta dalla mezzanotte fino a un istante in kWh (integrale della curva)."""
+        moment = moment or datetime.now()
+        hours = moment.hour + moment.minute / 60
+        elapsed = max(0.0, min(hours, 20) - 6)
+        return round(capacity * 0.8 * 14 / math.pi * (1 - math.cos(math.pi * elapsed / 14)), 3)
+
+
+class MockState:
+    """Sessioni, limiti di frequenza e contatori del server."""
+
+    def __init__(self, options):
+        self.options = options
+        self.fleet = MockFleet(options.plants, options.stations, options.offline_rate, options.seed)
+        self.sessions = {}  # token -> scadenza
+        self.windows = collections.defaultdict(collections.deque)  # token -> istanti delle richieste
+        self.stats = collections.Counter()
+        self.lock = threading.Lock()
+
+    def count(self, endpoint, result):
+        with self.lock:
+            self.stats[(endpoint, result)] += 1
+
+    def new_session(self):
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = time.time() + self.options.session_ttl
+        return token
+
+    def session_valid(self, token):
+        with self.lock:
+            expiry = self.sessions.get(token)
+            if expiry is None:
+                return False
+            if expiry <= time.time():
+                del self.sessions[token]
+                return False
+            return True
+
+    def rate_limited(self, token):
+        """True se la richiesta supera --max-rpm per la sessione o cade nella frazione --frequency-limit-rate."""
+        if random.random() < self.options.frequency_limit_rate:
+            return True
+        if not self.options.max_rpm:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows[token]
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.options.max_rpm:
+                return True
+            window.append(now)
+            return False
+
+    def credentials_valid(self, username, password):
+        options = self.options
+        return ((not options.username or username == options.username) and
+                (not options.password or password == options.password))
+
+
+def create_mock_app(options):
+    """
+    Crea l'applicazione Flask del server di prova.
+
+    Args:
+        options (argparse.Namespace): Opzioni (vedi parse_args)
+
+    Returns:
+        Flask: Applicazione con lo stato in app.config['MOCK_STATE']
+    """
+    app = Flask("ssem_mock_server")
+    state = MockState(options)
+    app.config['MOCK_STATE'] = state
+
+    @app.before_request
+    def simulate_latency():
+        if request.endpoint is None or request.endpoint.startswith("mock."):
+            return None
+        delay = options.latency + random.uniform(-options.jitter, options.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < options.error_rate:
+            state.count(request.endpoint, "error")
+            return jsonify({"error": "Errore simulato"}), 500
+
+    # --- AuroraVision ---
+
+    @app.route("/ums/v1/login", endpoint="aurora.login")
+    def aurora_login():
+        auth = request.authorization
+        if auth is None or not state.credentials_valid(auth.username, auth.password):
+            state.count("aurora.login", "failure")
+            return jsonify({"error": "Credenziali non valide"}), 401
+        state.count("aurora.login", "success")
+        response = jsonify({"result": "OK"})
+        response.set_cookie("JSESSIONID", state.new_session(), max_age=options.session_ttl)
+        return response
+
+    @app.route("/easyview/services/gmi/summary/PlantEnergy.json", endpoint="aurora.energy")
+    def aurora_plant_energy():
+        token = request.cookies.get("JSESSIONID", "")
+        if not state.session_valid(token):
+            state.count("aurora.energy", "unauthorized")
+            return jsonify({"error": "Sessione non valida"}), 401
+        if state.rate_limited(token):
+            state.count("aurora.energy", "frequency_limit")
+            return jsonify({"error": "Troppe richieste"}), 429
+
+        plant = state.fleet.aurora.get(request.args.get("eids", ""))
+        if plant is None:
+            state.count("aurora.energy", "not_found")
+            return jsonify({"status": "FAILURE", "message": "Entità non trovata"})
+
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        # Un impianto offline ha l'ultimo valore istantaneo di ieri
+        instant_day = "2000-01-01" if plant["offline"] else today
+        fields = [{
+            "type": "window", "field": "GenerationEnergy", "label": label,
+            "value": str(state.fleet.energy_today(plant["capacity"]) * multiplier),
+            "units": "kilowatt-hours", "startLabel": f"{today} 00:00:00", "endLabel": f"{today} 23:59:59"
+        } for label, multiplier in (("today", 1), ("week", 5), ("month", 20), ("year", 200))]
+        fields.append({
+            "type": "instant", "field": "GenerationPower", "label": "now",
+            "value": str(state.fleet.power(plant["capacity"], now)), "units": "kilowatts",
+            "startLabel": f"{instant_day} {now:%H:%M:%S}"
+        })
+        state.count("aurora.energy", "success")
+        return jsonify({"status": "SUCCESS", "fields": fields})
+
+    # --- FusionSolar Northbound ---
+
+    def northbound_fail(endpoint, fail_code, result):
+        state.count(endpoint, result)
+        return jsonify({"success": False, "failCode": fail_code, "data": None, "message": result})
+
+    def northbound_request(endpoint):
+        """Verifica sessione e limiti; restituisce (parametri, risposta di errore o None)."""
+        token = request.headers.get("XSRF-TOKEN", "")
+        if not state.session_valid(token):
+            return None, northbound_fail(endpoint, FAIL_NOT_LOGGED, "not_logged")
+        if state.rate_limited(token):
+            return None, northbound_fail(endpoint, FAIL_FREQUENCY_LIMIT, "frequency_limit")
+        return request.get_json(silent=True) or {}, None
+
+    def requested_stations(params):
+        codes = [code for code in str(params.get("stationCodes", "")).split(",") if code]
+        return [code for code in codes[:NORTHBOUND_BATCH_SIZE] if code in state.fleet.stations]
+
+    @app.route("/thirdData/login", methods=["POST"], endpoint="northbound.login")
+    def northbound_login():
+        params = request.get_json(silent=True) or {}
+        if not state.credentials_valid(params.get("userName", ""), params.get("systemCode", "")):
+            return northbound_fail("northbound.login", FAIL_LOGIN, "failure")
+        state.count("northbound.login", "success")
+        response = jsonify({"success": True, "failCode": 0, "data": None})
+        response.set_cookie("XSRF-TOKEN", state.new_session(), max_age=options.session_ttl)
+        return response
+
+    @app.route("/thirdData/stations", methods=["POST"], endpoint="northbound.stations")
+    def northbound_stations():
+        params, error = northbound_request("northbound.stations")
+        if error is not None:
+            return error
+        page = max(1, int(params.get("pageNo", 1)))
+        size = max(1, min(int(params.get("pageSize", NORTHBOUND_PAGE_SIZE)), NORTHBOUND_PAGE_SIZE))
+        stations = list(state.fleet.stations.values())
+        items = [{key: value for key, value in station.items() if key != "offline"}
+                 for station in stations[(page - 1) * size:page * size]]
+        state.count("northbound.stations", "success")
+        return jsonify({"success": True, "failCode": 0, "data": {
+            "list": items, "pageCount": max(1, math.ceil(len(stations) / size)),
+            "pageNo": page, "pageSize": size, "total": len(stations)
+        }})
+
+    @app.route("/thirdData/getStationRealKpi", methods=["POST"], endpoint="northbound.realtime")
+    def northbound_realtime():
+        params, error = northbound_request("northbound.realtime")
+        if error is not None:
+            return error
+        data = []
+        for code in requested_stations(params):
+            station = state.fleet.stations[code]
+            if station["offline"]:
+                continue
+            day_power = state.fleet.energy_today(station["capacity"])
+            data.append({"stationCode": code, "dataItemMap": {
+                "day_power": day_power, "month_power": round(day_power * 20, 3),
+                "total_power": round(day_power * 900, 3), "day_income": round(day_power * 0.12, 2),
+                "real_health_state": 3
+            }})
+        state.count("northbound.realtime", "success")
+        return jsonify({"success": True, "failCode": 0, "data": data})
+
+    def northbound_timed(endpoint, step):
+        params, error = northbound_request(endpoint)
+        if error is not None:
+            return error
+        now = datetime.now()
+        day = datetime.fromtimestamp(int(params.get("collectTime", time.time() * 1000)) / 1000)
+        start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Come l'API reale: le ore del giorno richiesto o i giorni del mese richiesto, fino a ora
+        if step == "day":
+            start = start.replace(day=1)
+            moments = [start + timedelta(days=offset) for offset in range(31)]
+            moments = [moment for moment in moments if moment.month == start.month]
+        else:
+            moments = [start.replace(hour=hour) for hour in range(24)]
+        moments = [moment for moment in moments if moment <= now]
+        data = []
+        for code in requested_stations(params):
+            station = state.fleet.stations[code]
+            if station["offline"]:
+                continue
+            for moment in moments:
+                if step == "day":
+                    # Giornate passate complete, oggi fino all'ora corrente
+                    until = now if moment.date() == now.date() else moment.replace(hour=23, minute=59)
+                    power = state.fleet.energy_today(station["capacity"], until)
+                else:
+                    power = state.fleet.power(station["capacity"], moment)
+                data.append({"stationCode": code, "collectTime": int(moment.timestamp() * 1000),
+                             "dataItemMap": {"inverter_power": power, "radiation_intensity": None}})
+        state.count(endpoint, "success")
+        return jsonify({"success": True, "failCode": 0, "data": data})
+
+    @app.route("/thirdData/getKpiStationHour", methods=["POST"], endpoint="northbound.hourly")
+    def northbound_hourly():
+        return northbound_timed("northbound.hourly", "hour")
+
+    @app.route("/thirdData/getKpiStationDay", methods=["POST"], endpoint="northbound.daily")
+    def northbound_daily():
+        return northbound_timed("northbound.daily", "day")
+
+    # --- Controllo del server ---
+
+    @app.route("/mock/stats", endpoint="mock.stats")
+    def mock_stats():
+        with state.lock:
+            stats = {f"{endpoint} {result}": count for (endpoint, result), count in sorted(state.stats.items())}
+        return jsonify({"plants": len(state.fleet.aurora), "stations": len(state.fleet.stations),
+                        "sessions": len(state.sessions), "requests": stats})
+
+    return app
+
+
+class MockServer:
+    """Server di prova eseguito in un thread (usato dai benchmark)."""
+
+    def __init__(self, options):
+        self.app = create_mock_app(options)
+        self.state = self.app.config['MOCK_STATE']
+        self.server = make_server(options.host, options.port, self.app, threaded=True)
+        self.url = f"http://{options.host}:{self.server.server_port}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+def write_config(config_dir, url, options, accounts=1, northbound_accounts=0, concurrency=4, time_interval=300):
+    """
+    Scrive aurora_config.ini (e fusion_config.ini se ci sono account Northbound) per la flotta del server.
+
+    Args:
+        config_dir (str): Directory di destinazione
+        url (str): Indirizzo del server di prova
+        options (argparse.Namespace): Opzioni del server
+        accounts (int): Account AuroraVision tra cui dividere gli impianti
+        northbound_accounts (int): Account Northbound (uno per stazione, al massimo --stations)
+        concurrency (int): max_concurrent_checks di ogni account AuroraVision
+        time_interval (int): Intervallo di aggiornamento in secondi
+    """
+    os.makedirs(config_dir, exist_ok=True)
+    username = options.username or "utente_prova"
+    password = options.password or "password_prova"
+
+    entity_ids = list(MockFleet(options.plants, 0, seed=options.seed).aurora)
+    accounts = max(1, min(accounts, len(entity_ids) or 1))
+    aurora = configparser.ConfigParser()
+    for index in range(accounts):
+        section = "CREDENTIALS" if index == 0 else f"ACCOUNT:prova{index + 1}"
+        aurora[section] = {
+            "username": username, "password": password, "api_url": url,
+            "entity_ids": ",".join(entity_ids[index::accounts]),
+            "max_concurrent_checks": str(concurrency)
+        }
+    aurora["SETTINGS"] = {"time_interval": str(time_interval)}
+    with open(os.path.join(config_dir, "aurora_config.ini"), "w") as f:
+        aurora.write(f)
+
+    station_codes = list(MockFleet(0, options.stations, seed=options.seed).stations)[:northbound_accounts]
+    fusion_path = os.path.join(config_dir, "fusion_config.ini")
+    if not station_codes:
+        if os.path.exists(fusion_path):
+            os.remove(fusion_path)
+        return
+    fusion = configparser.ConfigParser()
+    for index, code in enumerate(station_codes):
+        northbound = {"username": username, "password": password, "plant_id": code, "api_url": url}
+        if index == 0:
+            fusion["CREDENTIALS"] = {"username": username, "password": password, "plant_name": f"Northbound {code}"}
+            fusion["NORTHBOUND"] = dict(northbound, enabled="True")
+        else:
+            fusion[f"ACCOUNT:nb{index + 1}"] = dict(northbound, northbound="True", plant_name=f"Northbound {code}")
+    fusion["SETTINGS"] = {"time_interval": str(time_interval)}
+    with open(fusion_path, "w") as f:
+        fusion.write(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server di prova AuroraVision e FusionSolar Northbound")
+    parser.add_argument("--write-config", metavar="DIR", help="Scrive in DIR i file di configurazione per SSEM")
+    parser.add_argument("--accounts", type=int, default=1, help="Account AuroraVision nei file scritti")
+    parser.add_argument("--northbound-accounts", type=int, default=0,
+                        help="Account Northbound nei file scritti (richiede pyhfs)")
+    options = parse_args(argv, parser)
+
+    server = MockServer(options)
+    if options.write_config:
+        write_config(options.write_config, server.url, options, options.accounts, options.northbound_accounts)
+        print(f"Configurazione scritta in {options.write_config}")
+    print(f"Server di prova in ascolto su {server.url} "
+          f"({options.plants} impianti AuroraVision, {options.stations} stazioni Northbound)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())